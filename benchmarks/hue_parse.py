@@ -0,0 +1,113 @@
+"""Benchmarks parsing the response of HueBridgeAPIConnection.get_lights
+
+Compares building a new TypeAdapter for every call (the old behaviour) against
+reusing a cached TypeAdapter, parsing directly from the raw response bytes and
+only parsing the fields most callers need (get_lights_projected)
+
+Usage: python benchmarks/hue_parse.py [number of lights]
+"""
+
+import json
+import sys
+import timeit
+import uuid
+
+from pydantic import TypeAdapter
+
+from homecontrol_base.hue.api.adapters import get_type_adapter, parse_response_data
+from homecontrol_base.hue.api.projection import parse_projected_data
+from homecontrol_base.hue.api.schema import LightGet
+
+
+def create_light(index: int) -> dict:
+    """Returns data for a colour light as given by a Hue bridge"""
+    return {
+        "id": str(uuid.uuid4()),
+        "id_v1": f"/lights/{index}",
+        "owner": {"rid": str(uuid.uuid4()), "rtype": "device"},
+        "type": "light",
+        "on": {"on": index % 2 == 0},
+        "mode": "normal",
+        "dimming": {"brightness": 50.2, "min_dim_level": 0.2},
+        "color_temperature": {
+            "mirek": 366,
+            "mirek_valid": True,
+            "mirek_schema": {"mirek_minimum": 153, "mirek_maximum": 500},
+        },
+        "color": {
+            "xy": {"x": 0.4573, "y": 0.41},
+            "gamut": {
+                "red": {"x": 0.6915, "y": 0.3083},
+                "green": {"x": 0.17, "y": 0.7},
+                "blue": {"x": 0.1532, "y": 0.0475},
+            },
+            "gamut_type": "C",
+        },
+        "dynamics": {
+            "status": "none",
+            "status_values": ["none", "dynamic_palette"],
+            "speed": 0,
+            "speed_valid": False,
+        },
+        "alert": {"action_values": ["breathe"]},
+        "signaling": {"status": None},
+        "effects": {
+            "status_values": ["no_effect", "candle", "fire"],
+            "status": "no_effect",
+            "effect_values": ["no_effect", "candle", "fire"],
+        },
+        "timed_effects": {
+            "status_values": ["no_effect", "sunrise"],
+            "status": "no_effect",
+            "effect_values": ["no_effect", "sunrise"],
+        },
+        "powerup": {
+            "preset": "safety",
+            "configured": True,
+            "on": {"mode": "on", "on": {"on": True}},
+            "dimming": {"mode": "dimming", "dimming": {"brightness": 100}},
+            "color": {
+                "mode": "color_temperature",
+                "color_temperature": {"mirek": 366},
+            },
+        },
+    }
+
+
+def main(light_count: int, repeats: int = 200):
+    content = json.dumps(
+        {"errors": [], "data": [create_light(i) for i in range(light_count)]}
+    ).encode()
+
+    def uncached():
+        return TypeAdapter(list[LightGet]).validate_python(json.loads(content)["data"])
+
+    def cached():
+        return get_type_adapter(list[LightGet]).validate_python(
+            json.loads(content)["data"]
+        )
+
+    def raw_json():
+        return parse_response_data(content, list[LightGet])
+
+    def projected():
+        return parse_projected_data(
+            content, LightGet, ["on", "dimming", "color_temperature", "color"]
+        )
+
+    # Ensure all produce the same result (and build the cached adapters)
+    assert uncached() == cached() == raw_json()
+
+    print(f"Parsing get_lights with {light_count} lights ({len(content)} bytes)")
+    for name, function in [
+        ("New TypeAdapter + validate_python", uncached),
+        ("Cached TypeAdapter + validate_python", cached),
+        ("Cached TypeAdapter + validate_json", raw_json),
+        ("Projected (on, dimming, colour)", projected),
+    ]:
+        time_taken = min(timeit.repeat(function, number=repeats, repeat=5)) / repeats
+        print(f"  {name:<40} {time_taken * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,75 @@
+"""Benchmarks serializing the bodies of put requests sent by
+HueBridgeAPIConnection
+
+Compares dataclasses.asdict (the old behaviour) followed by json.dumps
+against the cached TypeAdapter serializers used now
+
+Usage: python benchmarks/hue_serialize.py
+"""
+
+import json
+import timeit
+from dataclasses import asdict
+
+from homecontrol_base.hue.api.adapters import get_resource_adapter, serialize_resource
+from homecontrol_base.hue.api.schema import (
+    ColorPut,
+    ColorTemperaturePut,
+    DimmingPut,
+    GroupedLightPut,
+    LightPut,
+    OnPut,
+    Recall,
+    ScenePut,
+    XYPut,
+)
+
+
+def as_dict(resource) -> dict:
+    """Old behaviour used to convert resources into dictionaries"""
+    return asdict(
+        resource, dict_factory=lambda x: {k: v for (k, v) in x if v is not None}
+    )
+
+
+def dump_resource(resource) -> dict:
+    """Behaviour used for requests queued in the command scheduler"""
+    return get_resource_adapter(resource).dump_python(
+        resource, mode="json", exclude_none=True
+    )
+
+
+def main(repeats: int = 10000):
+    resources = {
+        "LightPut": LightPut(
+            on=OnPut(on=True),
+            dimming=DimmingPut(brightness=75.5),
+            color=ColorPut(xy=XYPut(x=0.4573, y=0.41)),
+        ),
+        "ScenePut": ScenePut(recall=Recall(action="active")),
+        "GroupedLightPut": GroupedLightPut(
+            on=OnPut(on=True),
+            dimming=DimmingPut(brightness=50),
+            color_temperature=ColorTemperaturePut(mirek=366),
+        ),
+    }
+
+    for resource_name, resource in resources.items():
+        # Ensure all produce the same result (and build the cached adapters)
+        assert as_dict(resource) == dump_resource(resource)
+        assert as_dict(resource) == json.loads(serialize_resource(resource))
+
+        print(f"Serializing {resource_name}")
+        for name, function in [
+            ("asdict + json.dumps", lambda: json.dumps(as_dict(resource)).encode()),
+            ("Cached TypeAdapter + dump_python", lambda: dump_resource(resource)),
+            ("Cached TypeAdapter + dump_json", lambda: serialize_resource(resource)),
+        ]:
+            time_taken = (
+                min(timeit.repeat(function, number=repeats, repeat=5)) / repeats
+            )
+            print(f"  {name:<40} {time_taken * 1000000:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import asyncio
+import time
+from typing import Optional
+
+from msmart.cloud import Cloud, CloudError
+from msmart.device.AC.device import AirConditioner
+from msmart.lan import AuthenticationError, Security
+
+from homecontrol_base.aircon.exceptions import ACAuthenticationError
+from homecontrol_base.config.midea import MideaAccount
+
+
+class MideaCloudSession:
+    """Keeps a logged in session to the Midea cloud so that it can be reused
+    when obtaining the authentication details of several devices"""
+
+    # Time after which the session is assumed to have expired and a new
+    # login is performed (seconds)
+    SESSION_LIFETIME = 3600
+
+    _account: MideaAccount
+    # Created on first use so it belongs to the event loop using it
+    _lock: Optional[asyncio.Lock]
+    _cloud: Optional[Cloud]
+    _login_time: float
+
+    def __init__(self, account: MideaAccount) -> None:
+        """Constructor
+
+        Args:
+            account (MideaAccount): Account to log in with
+        """
+        self._account = account
+        self._lock = None
+        self._cloud = None
+        self._login_time = 0
+
+    async def _get_cloud(self) -> Cloud:
+        """Returns a logged in cloud session, logging in if necessary
+
+        Raises:
+            CloudError: If logging in fails
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if (
+                self._cloud is None
+                or time.monotonic() - self._login_time
+                > MideaCloudSession.SESSION_LIFETIME
+            ):
+                cloud = Cloud(
+                    account=self._account.username, password=self._account.password
+                )
+                await cloud.login()
+                self._cloud = cloud
+                self._login_time = time.monotonic()
+            return self._cloud
+
+    def invalidate(self):
+        """Discards the session so the next use logs in again"""
+        self._cloud = None
+
+    async def _get_token(self, udpid: str) -> tuple[str, str]:
+        """Returns the token and key for a udpid, logging in again if the
+        session has expired"""
+        try:
+            return await (await self._get_cloud()).get_token(udpid)
+        except CloudError:
+            self.invalidate()
+            return await (await self._get_cloud()).get_token(udpid)
+
+    async def authenticate_device(self, device: AirConditioner) -> tuple[str, str]:
+        """Obtains the token and key for a device and authenticates with it
+
+        Args:
+            device (AirConditioner): Device to authenticate with
+
+        Returns:
+            tuple[str, str]: The token and key that were used
+
+        Raises:
+            ACAuthenticationError: If no valid token and key were obtained
+        """
+        last_error: Optional[Exception] = None
+        # Device ids can be encoded either way round
+        for endian in ("little", "big"):
+            udpid = Security.udpid(device.id.to_bytes(6, endian)).hex()
+            try:
+                token, key = await self._get_token(udpid)
+                await device.authenticate(token=token, key=key)
+                return token, key
+            except (CloudError, AuthenticationError) as err:
+                last_error = err
+        raise ACAuthenticationError(
+            f"Failed to obtain authentication for AC unit {device.id} from the "
+            "Midea cloud"
+        ) from last_error
@@ -1,33 +1,186 @@
 import asyncio
+import copy
+import ipaddress
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, Type, TypeVar
 
 from msmart.device.AC.device import AirConditioner
 from msmart.discover import Discover
 from msmart.lan import AuthenticationError
 
+from homecontrol_base.aircon.cloud import MideaCloudSession
 from homecontrol_base.aircon.exceptions import (
     ACAuthenticationError,
+    ACDeviceUnavailableError,
     ACInvalidStateError,
 )
+from homecontrol_base.aircon.retry import RetryPolicy, RetryStats
 from homecontrol_base.aircon.state import ACDeviceState
+from homecontrol_base.aircon.structs import ACDeviceCommandStats, ACDeviceHealth
 from homecontrol_base.config.midea import MideaAccount
 from homecontrol_base.database.homecontrol_base import models
 from homecontrol_base.exceptions import DeviceConnectionError, DeviceNotFoundError
 
+T = TypeVar("T")
+
+# Fields of an ACDeviceState that are assigned to a device by set_state and
+# reported back by get_state
+_WRITABLE_FIELDS = (
+    "power",
+    "target_temperature",
+    "operational_mode",
+    "fan_speed",
+    "swing_mode",
+    "eco_mode",
+    "turbo_mode",
+    "fahrenheit",
+    "display_on",
+)
+
+
+def _get_ip_addresses(network: str, max_addresses: int) -> list[str]:
+    """Returns every host address in a network, range or single address
+
+    Raises:
+        ValueError: If the network is invalid or contains more than
+                    max_addresses addresses
+    """
+    if "-" in network:
+        start, end = (ipaddress.ip_address(part.strip()) for part in network.split("-"))
+        if start.version != end.version or start > end:
+            raise ValueError(f"Invalid address range '{network}'")
+        size = int(end) - int(start) + 1
+    else:
+        ip_network = ipaddress.ip_network(network, strict=False)
+        size = ip_network.num_addresses
+    if size > max_addresses:
+        raise ValueError(
+            f"'{network}' contains {size} addresses which is more than the "
+            f"maximum of {max_addresses}"
+        )
+
+    if "-" in network:
+        return [
+            str(ipaddress.ip_address(value))
+            for value in range(int(start), int(end) + 1)
+        ]
+    return [str(host) for host in ip_network.hosts()]
+
+
+def _is_authentication_error(err: Optional[BaseException]) -> bool:
+    """Returns whether an error (or any error that caused it) is due to
+    failing to authenticate"""
+    while err is not None:
+        if isinstance(err, (AuthenticationError, ACAuthenticationError)):
+            return True
+        err = err.__cause__
+    return False
+
+
+@dataclass
+class _ACCommand:
+    """A state waiting to be applied to a device"""
+
+    state: ACDeviceState
+    future: "asyncio.Future[None]"
+
 
 class ACDevice:
     """Class for handling an air conditioning device"""
 
+    # Weight given to the latest latency in the moving average
+    LATENCY_SMOOTHING = 0.2
+
+    # Maximum number of addresses discover_network will search (a /20)
+    MAX_DISCOVERY_ADDRESSES = 4096
+
     _device_info: models.ACDeviceInfoInDB
     _device: AirConditioner
 
     # Whether to toggle the display the next time the state is applied
     _should_toggle_display: bool
 
-    def __init__(self, device_info: models.ACDeviceInfoInDB):
+    _state_cache_ttl: float
+    _cached_state: Optional[ACDeviceState]
+    _cached_state_time: float
+    # Incremented whenever the cached state is invalidated so that refreshes
+    # started beforehand don't store an outdated state
+    _cached_state_version: int
+    # Refresh currently in progress (shared by every caller of get_state)
+    _refresh_task: Optional["asyncio.Task[ACDeviceState]"]
+
+    _last_state: Optional[ACDeviceState]
+    _last_state_time: float
+    _last_command_time: Optional[float]
+
+    _cloud_session: Optional[MideaCloudSession]
+    # Whether the token and key in _device_info were replaced by initialise
+    _credentials_refreshed: bool
+
+    # Called with the device info whenever a new token and key are obtained
+    _on_credentials_refreshed: Optional[Callable[[models.ACDeviceInfoInDB], None]]
+
+    _circuit_breaker_threshold: int
+    _circuit_breaker_timeout: float
+    _last_success_time: Optional[float]
+    _last_failure_time: Optional[float]
+    _consecutive_failures: int
+    # Whether the last failure was due to authentication (so the device
+    # should be re-authenticated before the next operation)
+    _needs_authentication: bool
+    _latency: Optional[float]
+    _last_error: Optional[Exception]
+    # Time until which calls fail immediately (None when closed)
+    _circuit_open_until: Optional[float]
+
+    _retry_policy: RetryPolicy
+    # Statistics of the last call of each operation that is retried
+    _retry_stats: dict[str, RetryStats]
+
+    # Held while communicating with the device so that refreshes and applies
+    # don't interfere with each other's use of _device
+    _command_lock: asyncio.Lock
+    # Command waiting for the lock (later calls to set_state replace its state)
+    _pending_command: Optional[_ACCommand]
+    _command_tasks: set["asyncio.Task[None]"]
+    _commands_applied: int
+    _commands_coalesced: int
+    _commands_skipped: int
+
+    def __init__(
+        self,
+        device_info: models.ACDeviceInfoInDB,
+        state_cache_ttl: float = 0,
+        retry_policy: RetryPolicy = RetryPolicy(),
+        cloud_session: Optional[MideaCloudSession] = None,
+        on_credentials_refreshed: Optional[
+            Callable[[models.ACDeviceInfoInDB], None]
+        ] = None,
+        circuit_breaker_threshold: int = 3,
+        circuit_breaker_timeout: float = 30,
+    ):
         """Initialises and authenticates the device
 
         Args:
             device_info (models.ACDeviceInfoInDB): Device authentication info
+            state_cache_ttl (float): Time the state returned by get_state is
+                            reused for before refreshing again, and for which
+                            commands matching it are skipped (seconds, 0 to
+                            always refresh)
+            retry_policy (RetryPolicy): Policy to use when retrying
+                            operations that fail temporarily
+            cloud_session (Optional[MideaCloudSession]): Session used to
+                            obtain a new token and key if authentication
+                            fails with the existing ones
+            on_credentials_refreshed (Optional[Callable[[models.ACDeviceInfoInDB],
+                            None]]): Called with the device info whenever a
+                            new token and key are obtained (so they can be
+                            saved)
+            circuit_breaker_threshold (int): Number of consecutive failed
+                            operations after which calls fail immediately
+            circuit_breaker_timeout (float): Time calls fail immediately for
+                            before the device is tried again (seconds)
         """
 
         # Connect to the device
@@ -38,32 +191,172 @@ class ACDevice:
 
         self._should_toggle_display = False
 
+        self._state_cache_ttl = state_cache_ttl
+        self._cached_state = None
+        self._cached_state_time = 0
+        self._cached_state_version = 0
+        self._refresh_task = None
+
+        self._last_state = None
+        self._last_state_time = 0
+        self._last_command_time = None
+
+        self._cloud_session = cloud_session
+        self._credentials_refreshed = False
+        self._on_credentials_refreshed = on_credentials_refreshed
+
+        self._circuit_breaker_threshold = circuit_breaker_threshold
+        self._circuit_breaker_timeout = circuit_breaker_timeout
+        self._last_success_time = None
+        self._last_failure_time = None
+        self._consecutive_failures = 0
+        self._needs_authentication = False
+        self._latency = None
+        self._last_error = None
+        self._circuit_open_until = None
+
+        self._retry_policy = retry_policy
+        self._retry_stats = {}
+
+        self._command_lock = asyncio.Lock()
+        self._pending_command = None
+        self._command_tasks = set()
+        self._commands_applied = 0
+        self._commands_coalesced = 0
+        self._commands_skipped = 0
+
+    async def _retry(
+        self,
+        operation: str,
+        function: Callable[[], Awaitable[T]],
+        retry_on: tuple[Type[Exception], ...],
+    ) -> T:
+        """Runs a function using the retry policy, recording its statistics
+        under the name of the operation"""
+        stats = RetryStats()
+        self._retry_stats[operation] = stats
+        return await self._retry_policy.run(function, retry_on=retry_on, stats=stats)
+
     async def initialise(self):
         """Initialises and authenticates the device
 
         Should be called immediately after __init__
 
+        If authentication fails and a cloud session was given, a new token
+        and key are obtained (check credentials_refreshed to see whether they
+        need saving)
+
         Raises:
             ACAuthenticationError: If authentication fails
+            DeviceConnectionError: If the device doesn't respond
         """
 
-        # Attempt authentication up to 3 times (can often fail temporarily)
-        for retry in range(0, 3):
-            try:
-                await self._device.authenticate(
+        # Authentication can often fail temporarily
+        try:
+            await self._retry(
+                "initialise",
+                lambda: self._device.authenticate(
                     token=self._device_info.token, key=self._device_info.key
-                )
-                break
-            except AuthenticationError as err:
-                if retry == 2:
-                    raise ACAuthenticationError(
-                        f"Failed to authenticate with AC unit {self._device_info.identifier} after retrying 3 times"
-                    ) from err
-                else:
-                    await asyncio.sleep(1)
+                ),
+                retry_on=(AuthenticationError, TimeoutError),
+            )
+        except TimeoutError as err:
+            # Unreachable rather than rejected so new credentials won't help
+            raise DeviceConnectionError(
+                "Timed out while attempting to authenticate with AC unit "
+                f"{self._device_info.identifier}"
+            ) from err
+        except AuthenticationError as err:
+            if self._cloud_session is None:
+                raise ACAuthenticationError(
+                    "Failed to authenticate with AC unit "
+                    f"{self._device_info.identifier} after "
+                    f"{self._retry_stats['initialise'].attempts} attempts"
+                ) from err
+
+            # Token and key may have expired
+            token, key = await self._cloud_session.authenticate_device(self._device)
+            self._device_info.token = token
+            self._device_info.key = key
+            self._credentials_refreshed = True
+            if self._on_credentials_refreshed is not None:
+                self._on_credentials_refreshed(self._device_info)
 
         await self._device.get_capabilities()
 
+    def _check_circuit(self):
+        """Fails immediately if the device has repeatedly failed recently
+
+        Raises:
+            ACDeviceUnavailableError: If the circuit is open
+        """
+        if (
+            self._circuit_open_until is not None
+            and time.monotonic() < self._circuit_open_until
+        ):
+            raise ACDeviceUnavailableError(
+                f"AC unit {self._device_info.identifier} is unavailable after "
+                f"{self._consecutive_failures} consecutive failures"
+            ) from self._last_error
+
+    async def _reinitialise(self):
+        """Re-authenticates with the device
+
+        Raises:
+            ACAuthenticationError: If authentication fails
+            DeviceConnectionError: If anything else goes wrong
+        """
+        try:
+            await self.initialise()
+        except (ACAuthenticationError, DeviceConnectionError):
+            raise
+        except Exception as err:
+            raise DeviceConnectionError(
+                f"Failed to re-initialise AC unit {self._device_info.identifier}"
+            ) from err
+
+    async def _run_operation(self, function: Callable[[], Awaitable[T]]) -> T:
+        """Runs an operation that communicates with the device, keeping track
+        of its health
+
+        When an operation fails to authenticate the device is re-authenticated
+        before the next one (in case its session has expired)
+
+        Raises:
+            ACDeviceUnavailableError: If the circuit is open
+            ACAuthenticationError: If re-authentication fails
+        """
+        self._check_circuit()
+        start_time = time.monotonic()
+        try:
+            if self._needs_authentication:
+                await self._reinitialise()
+                self._needs_authentication = False
+            result = await function()
+        except Exception as err:
+            self._last_failure_time = time.monotonic()
+            self._consecutive_failures += 1
+            self._last_error = err
+            if _is_authentication_error(err):
+                self._needs_authentication = True
+            if self._consecutive_failures >= self._circuit_breaker_threshold:
+                self._circuit_open_until = (
+                    self._last_failure_time + self._circuit_breaker_timeout
+                )
+            raise
+
+        self._last_success_time = time.monotonic()
+        latency = self._last_success_time - start_time
+        self._latency = (
+            latency
+            if self._latency is None
+            else self._latency
+            + ACDevice.LATENCY_SMOOTHING * (latency - self._latency)
+        )
+        self._consecutive_failures = 0
+        self._circuit_open_until = None
+        return result
+
     def _get_current_state(self) -> ACDeviceState:
         """Returns the current state of the device"""
         return ACDeviceState(
@@ -118,30 +411,42 @@ class ACDevice:
                 f"'target_temperature' of {state.target_temperature} must be between 16 and 30"
             )
 
-    async def _refresh_state(self, current_retry: int = 0):
-        """Attempts to refresh the current state
+    async def _refresh_state_once(self):
+        """Refreshes the current state
 
-        Retries 3 times in the event something appears to go wrong
         Raises:
-            DeviceConnectionError: If the refresh repeatedly fails
+            DeviceConnectionError: If the refresh appears to have failed
         """
         await self._device.refresh()
 
         # Check if anything appears wrong
         if self._device.indoor_temperature is None:
-            if current_retry < 3:
-                await self._refresh_state(current_retry=current_retry + 1)
-            else:
-                raise DeviceConnectionError(
-                    f"An error occurred while attempting to refresh the state of an AC unit {self._device_info.identifier}"
-                )
+            raise DeviceConnectionError(
+                "An error occurred while attempting to refresh the state of an "
+                f"AC unit {self._device_info.identifier}"
+            )
 
-    async def get_state(self) -> ACDeviceState:
-        """Refreshes the device and returns it's current state
+    async def _refresh_state(self):
+        """Attempts to refresh the current state, retrying in the event
+        something appears to go wrong
 
-        Returns:
-            ACDeviceState: The current device state
+        Raises:
+            DeviceConnectionError: If the refresh repeatedly fails
         """
+        try:
+            await self._retry(
+                "refresh",
+                self._refresh_state_once,
+                retry_on=(DeviceConnectionError, TimeoutError),
+            )
+        except TimeoutError as err:
+            raise DeviceConnectionError(
+                "Timed out while attempting to refresh the state of an AC unit "
+                f"{self._device_info.identifier}"
+            ) from err
+
+    async def _refresh_current_state(self):
+        """Refreshes the current state, checking the readings are valid"""
         # Units sometimes return 0 when this is not actually accurate,
         # refresh twice in such cases
         await self._refresh_state()
@@ -151,41 +456,228 @@ class ACDevice:
         ):
             await self._refresh_state()
 
-        return self._get_current_state()
+    async def _fetch_state(self) -> ACDeviceState:
+        """Refreshes the device, caches and returns it's current state"""
+        async with self._command_lock:
+            version = self._cached_state_version
+
+            await self._run_operation(self._refresh_current_state)
+            state = self._get_current_state()
+        self._last_state = state
+        self._last_state_time = time.monotonic()
+        if version == self._cached_state_version:
+            self._cached_state = state
+            self._cached_state_time = time.monotonic()
+        return state
+
+    def _on_refresh_done(self, task: "asyncio.Task[ACDeviceState]"):
+        """Clears a finished refresh so the next one starts a new request"""
+        if self._refresh_task is task:
+            self._refresh_task = None
+        # Avoid warnings about unretrieved exceptions when every caller has
+        # stopped waiting
+        if not task.cancelled():
+            task.exception()
+
+    def _invalidate_state(self):
+        """Discards the cached state"""
+        self._cached_state = None
+        self._cached_state_version += 1
+        self._refresh_task = None
+
+    async def get_state(self, max_age: Optional[float] = None) -> ACDeviceState:
+        """Refreshes the device and returns it's current state
+
+        Concurrent calls share a single refresh of the device
+
+        Args:
+            max_age (Optional[float]): Maximum age of a previously obtained
+                        state that may be returned instead of refreshing
+                        (seconds, defaults to the state_cache_ttl given to the
+                        constructor)
+
+        Returns:
+            ACDeviceState: The current device state
+
+        Raises:
+            DeviceConnectionError: If the refresh repeatedly fails
+            ACDeviceUnavailableError: If the device has repeatedly failed
+                                      recently
+        """
+        if max_age is None:
+            max_age = self._state_cache_ttl
+        if (
+            self._cached_state is not None
+            and time.monotonic() - self._cached_state_time <= max_age
+        ):
+            return copy.copy(self._cached_state)
+
+        self._check_circuit()
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.ensure_future(self._fetch_state())
+            self._refresh_task.add_done_callback(self._on_refresh_done)
+
+        # Shielded so that one caller giving up doesn't cancel the refresh for
+        # everyone else
+        return copy.copy(await asyncio.shield(self._refresh_task))
+
+    async def _apply_state_once(self):
+        """Applies the currently assigned device state"""
+        await self._device.apply()
 
-    async def _apply_state(self, current_retry: int = 0):
-        """Attempts to apply the currently assigned device state
+        if self._should_toggle_display:
+            await self._device.toggle_display()
+            self._should_toggle_display = False
 
-        Retries 3 times in the event of an error
+    async def _apply_state(self):
+        """Attempts to apply the currently assigned device state, retrying in
+        the event of an error
 
         Raises:
             DeviceConnectionError: If the connection repeatedly fails
         """
         try:
-            await self._device.apply()
-
-            if self._should_toggle_display:
-                await self._device.toggle_display()
-                self._should_toggle_display = False
-        except UnboundLocalError as err:
-            if current_retry < 3:
-                self._apply_state(current_retry=current_retry + 1)
-            else:
-                raise DeviceConnectionError(
-                    f"An error occurred while attempting to apply a state to the AC unit {self._device_info.identifier}"
-                ) from err
+            await self._retry(
+                "apply",
+                self._apply_state_once,
+                retry_on=(UnboundLocalError, TimeoutError),
+            )
+        except (UnboundLocalError, TimeoutError) as err:
+            raise DeviceConnectionError(
+                "An error occurred while attempting to apply a state to the AC "
+                f"unit {self._device_info.identifier}"
+            ) from err
+
+    def _is_last_state(self, state: ACDeviceState) -> bool:
+        """Returns whether a state matches the last known state of the
+        device
+
+        States older than the state cache TTL aren't trusted as the device
+        may have been changed elsewhere (e.g. by its remote)
+        """
+        return (
+            self._last_state is not None
+            and time.monotonic() - self._last_state_time <= self._state_cache_ttl
+            and all(
+                getattr(state, field) == getattr(self._last_state, field)
+                for field in _WRITABLE_FIELDS
+            )
+        )
+
+    async def _process_command(self):
+        """Applies the pending command once no other commands are being
+        applied"""
+        async with self._command_lock:
+            command = self._pending_command
+            self._pending_command = None
+            try:
+                if self._is_last_state(command.state):
+                    self._commands_skipped += 1
+                else:
+                    self._assign_state(command.state)
+                    try:
+                        await self._run_operation(self._apply_state)
+                    finally:
+                        self._invalidate_state()
+
+                    # Readings aren't changed by applying a state
+                    state = copy.copy(command.state)
+                    if self._last_state is not None:
+                        state.indoor_temperature = self._last_state.indoor_temperature
+                        state.outdoor_temperature = (
+                            self._last_state.outdoor_temperature
+                        )
+                    self._last_state = state
+                    self._last_state_time = time.monotonic()
+                    self._commands_applied += 1
+                command.future.set_result(None)
+            except Exception as err:
+                # Device may be in an unknown state
+                self._last_state = None
+                command.future.set_exception(err)
 
     async def set_state(self, state: ACDeviceState):
         """Attempts to assign the device state
 
+        States are applied one at a time. When several are waiting to be
+        applied only the latest is sent, and nothing is sent when the state
+        matches the last known state of the device (if known within the
+        state cache TTL).
+
         Raises:
             ACInvalidStateError: If the given state is invalid
+            DeviceConnectionError: If the connection repeatedly fails
+            ACDeviceUnavailableError: If the device has repeatedly failed
+                                      recently
         """
         self._validate_state(state)
-        self._assign_state(state)
+        self._check_circuit()
+        self._invalidate_state()
+        self._last_command_time = time.monotonic()
+
+        if self._pending_command is not None:
+            # Not applied yet so replace the state
+            self._pending_command.state = state
+            self._commands_coalesced += 1
+            future = self._pending_command.future
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._pending_command = _ACCommand(state=state, future=future)
+            task = asyncio.create_task(self._process_command())
+            self._command_tasks.add(task)
+            task.add_done_callback(self._command_tasks.discard)
+
+        # Shielded so that one caller giving up doesn't cancel the command for
+        # everyone else
+        await asyncio.shield(future)
 
-        # Attempt to apply the state
-        await self._apply_state()
+    @property
+    def last_state(self) -> Optional[ACDeviceState]:
+        """Returns the state obtained by the last refresh (or assigned by the
+        last applied command) without contacting the device (None if it
+        isn't known)"""
+        return copy.copy(self._last_state) if self._last_state is not None else None
+
+    @property
+    def last_command_time(self) -> Optional[float]:
+        """Returns the time (from time.monotonic) a state was last assigned"""
+        return self._last_command_time
+
+    @property
+    def credentials_refreshed(self) -> bool:
+        """Returns whether initialise obtained a new token and key (that
+        should be saved to the database)"""
+        return self._credentials_refreshed
+
+    @property
+    def health(self) -> ACDeviceHealth:
+        """Returns information about how reliably the device has been
+        communicating"""
+        return ACDeviceHealth(
+            last_success_time=self._last_success_time,
+            last_failure_time=self._last_failure_time,
+            consecutive_failures=self._consecutive_failures,
+            latency=self._latency,
+            circuit_open=self._circuit_open_until is not None
+            and time.monotonic() < self._circuit_open_until,
+            last_error=str(self._last_error) if self._last_error is not None else None,
+        )
+
+    @property
+    def command_stats(self) -> ACDeviceCommandStats:
+        """Returns statistics about the states assigned by set_state"""
+        return ACDeviceCommandStats(
+            applied=self._commands_applied,
+            coalesced=self._commands_coalesced,
+            skipped=self._commands_skipped,
+        )
+
+    @property
+    def retry_stats(self) -> dict[str, RetryStats]:
+        """Returns the number of attempts made and time taken by the last call
+        of each operation that is retried ('initialise', 'refresh' and
+        'apply')"""
+        return dict(self._retry_stats)
 
     @property
     def info(self) -> models.ACDeviceInfoInDB:
@@ -194,7 +686,12 @@ class ACDevice:
 
     @staticmethod
     async def discover(
-        name: str, ip_address: str, account: MideaAccount
+        name: str,
+        ip_address: str,
+        account: MideaAccount,
+        retry_policy: RetryPolicy = RetryPolicy(),
+        stats: Optional[RetryStats] = None,
+        cloud_session: Optional[MideaCloudSession] = None,
     ) -> models.ACDeviceInfoInDB:
         """Attempts to make a connection with an air conditioning unit given
         it's ip address and returns the relevant details to make a connection
@@ -203,6 +700,13 @@ class ACDevice:
             name (str): Name to give the device
             ip_address (str): IP address of the device
             account (MideaAccount): Account to use for the discovery
+            retry_policy (RetryPolicy): Policy to use when retrying the
+                            discovery
+            stats (Optional[RetryStats]): Will be updated with the number of
+                            attempts made and the time taken
+            cloud_session (Optional[MideaCloudSession]): Session to obtain
+                            the token and key with (avoids logging in to the
+                            Midea cloud again when one is reused)
 
         Returns:
             models.ACDeviceInfoInDB: Information for connecting to the device
@@ -213,42 +717,162 @@ class ACDevice:
             DeviceNotFoundError: When the device isn't found
         """
 
-        found_devices = None
-        try:
-            # Try a max of 3 times
-            attempts = 0
-            while not found_devices and attempts < 3:
-                found_devices = await Discover.discover(
-                    target=ip_address,
-                    account=account.username,
-                    password=account.password,
+        async def discover_device():
+            found_devices = await ACDevice._discover(
+                ip_address, account, cloud_session
+            )
+            if not found_devices:
+                raise DeviceNotFoundError(
+                    "Unable to find the air conditioning unit with ip address "
+                    f"'{ip_address}'"
                 )
-                attempts += 1
+            return found_devices
+
+        try:
+            found_devices = await retry_policy.run(
+                discover_device, retry_on=(DeviceNotFoundError,), stats=stats
+            )
+        except (DeviceNotFoundError, ACAuthenticationError):
+            raise
+        except TimeoutError as err:
+            # Deadline of the retry policy was reached while still looking
+            raise DeviceNotFoundError(
+                "Unable to find the air conditioning unit with ip address "
+                f"'{ip_address}'"
+            ) from err
         except Exception as err:
             raise DeviceConnectionError(
                 "An error occurred while attempting to discover an air "
                 f"conditioning unit at {ip_address}"
             ) from err
 
-        if found_devices:
-            # Only looked for one anyway
-            found_device = list(found_devices)[0]
+        # Only looked for one anyway
+        return ACDevice._create_device_info(name, ip_address, list(found_devices)[0])
 
-            # Validate auth data was obtained correctly
-            if found_device.key is None or found_device.token is None:
-                raise DeviceConnectionError(
-                    "Unable to obtain authentication for air conditioning "
-                    f"unit at {ip_address}"
-                )
+    @staticmethod
+    async def _discover(
+        ip_address: str,
+        account: MideaAccount,
+        cloud_session: Optional[MideaCloudSession] = None,
+    ) -> list[AirConditioner]:
+        """Discovers the devices at an address, obtaining their token and key
+        using a cloud session if given
+
+        Raises:
+            ACAuthenticationError: If the token and key can't be obtained
+                                   using the cloud session
+        """
+        if cloud_session is None:
+            return await Discover.discover(
+                target=ip_address,
+                account=account.username,
+                password=account.password,
+            )
+
+        found_devices = await Discover.discover(target=ip_address, auto_connect=False)
+        for found_device in found_devices or []:
+            # Device keeps the token and key it authenticated with
+            await cloud_session.authenticate_device(found_device)
+        return found_devices
+
+    @staticmethod
+    def _create_device_info(
+        name: str, ip_address: str, found_device: AirConditioner
+    ) -> models.ACDeviceInfoInDB:
+        """Returns the details required to connect to a discovered device
 
-            # Return the required info
-            return models.ACDeviceInfoInDB(
-                name=name,
-                ip_address=ip_address,
-                identifier=found_device.id,
-                key=found_device.key,
-                token=found_device.token,
+        Raises:
+            DeviceConnectionError: If authentication details weren't obtained
+        """
+        # Validate auth data was obtained correctly
+        if found_device.key is None or found_device.token is None:
+            raise DeviceConnectionError(
+                "Unable to obtain authentication for air conditioning "
+                f"unit at {ip_address}"
             )
-        raise DeviceNotFoundError(
-            f"Unable to find the air conditioning unit with ip address '{ip_address}'"
+
+        # Return the required info
+        return models.ACDeviceInfoInDB(
+            name=name,
+            ip_address=ip_address,
+            identifier=found_device.id,
+            key=found_device.key,
+            token=found_device.token,
         )
+
+    @staticmethod
+    async def discover_network(
+        network: str,
+        account: MideaAccount,
+        max_concurrent: int = 32,
+        deadline: float = 30,
+        cloud_session: Optional[MideaCloudSession] = None,
+    ) -> list[models.ACDeviceInfoInDB]:
+        """Looks for air conditioning units at every address in a network
+        and returns the relevant details to make a connection to each
+
+        Addresses are probed concurrently and any that haven't responded by
+        the deadline are abandoned. Devices are named after their ip address.
+
+        Args:
+            network (str): Network to search e.g. 192.168.1.0/24 (a single
+                           address or a range given as 192.168.1.10-192.168.1.50
+                           is also accepted)
+            account (MideaAccount): Account to use for the discovery
+            max_concurrent (int): Maximum number of addresses to probe at once
+            deadline (float): Maximum total time to spend (seconds)
+            cloud_session (Optional[MideaCloudSession]): Session to obtain
+                            the token and key of each device with (avoids
+                            logging in to the Midea cloud for every device)
+
+        Returns:
+            list[models.ACDeviceInfoInDB]: Information for connecting to each
+                                           device found
+
+        Raises:
+            ValueError: If the network is invalid or larger than
+                        MAX_DISCOVERY_ADDRESSES
+        """
+
+        async def probe(ip_address: str) -> Optional[models.ACDeviceInfoInDB]:
+            try:
+                found_devices = await ACDevice._discover(
+                    ip_address, account, cloud_session
+                )
+                if found_devices:
+                    return ACDevice._create_device_info(
+                        ip_address, ip_address, list(found_devices)[0]
+                    )
+            except Exception:
+                # Most addresses won't be an air conditioning unit
+                pass
+            return None
+
+        ip_addresses = _get_ip_addresses(network, ACDevice.MAX_DISCOVERY_ADDRESSES)
+        if not ip_addresses:
+            return []
+
+        # Probed by a fixed number of workers rather than a task per address
+        ip_address_queue: "asyncio.Queue[str]" = asyncio.Queue()
+        for ip_address in ip_addresses:
+            ip_address_queue.put_nowait(ip_address)
+        found: dict[str, models.ACDeviceInfoInDB] = {}
+
+        async def worker():
+            while not ip_address_queue.empty():
+                ip_address = ip_address_queue.get_nowait()
+                device_info = await probe(ip_address)
+                if device_info is not None:
+                    found[ip_address] = device_info
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(max_concurrent, len(ip_addresses)))
+        ]
+        _, pending = await asyncio.wait(workers, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        # Keep in address order
+        return [found[ip_address] for ip_address in ip_addresses if ip_address in found]
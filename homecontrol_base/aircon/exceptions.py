@@ -1,6 +1,14 @@
+from homecontrol_base.exceptions import DeviceConnectionError
+
+
 class ACAuthenticationError(Exception):
     """Error caused by failing to authenticate with a device"""
 
 
 class ACInvalidStateError(Exception):
     """Error caused by attempting to assign an invalid ACDeviceState"""
+
+
+class ACDeviceUnavailableError(DeviceConnectionError):
+    """Error caused by attempting to communicate with a device that has
+    repeatedly failed recently (so is assumed to be unreachable)"""
@@ -1,4 +1,19 @@
+import asyncio
+import time
+from typing import Optional
+
+from homecontrol_base.aircon.cloud import MideaCloudSession
 from homecontrol_base.aircon.device import ACDevice
+from homecontrol_base.aircon.poller import ACStatePoller
+from homecontrol_base.aircon.retry import RetryPolicy
+from homecontrol_base.aircon.state import ACDeviceState
+from homecontrol_base.aircon.structs import (
+    ACDeviceHealth,
+    ACDeviceInitialiseResult,
+    ACDeviceStateResult,
+    ACHouseState,
+    ACInitialiseReport,
+)
 from homecontrol_base.config.midea import MideaConfig
 from homecontrol_base.database.homecontrol_base.database import (
     HomeControlBaseDatabaseConnection,
@@ -14,25 +29,57 @@ class ACManager:
 
     _midea_config: MideaConfig
     _devices: dict[str, ACDevice]
+    # Loads in progress indexed by device id (shared by concurrent callers)
+    _loading: dict[str, asyncio.Future[ACDevice]]
+    _poller: Optional[ACStatePoller]
+    _retry_policy: RetryPolicy
+    _cloud_session: MideaCloudSession
 
     def __init__(self, lazy_load: bool = True):
         """Constructor"""
         self._lazy_load = lazy_load
         self._midea_config = MideaConfig()
         self._devices = {}
+        self._loading = {}
+        self._poller = None
+        self._retry_policy = RetryPolicy(
+            max_attempts=self._midea_config.retry_max_attempts,
+            initial_delay=self._midea_config.retry_initial_delay,
+            max_delay=self._midea_config.retry_max_delay,
+            deadline=self._midea_config.retry_deadline,
+        )
+        self._cloud_session = MideaCloudSession(self._midea_config.account)
 
-    async def initialise_all_devices(self):
+    async def initialise_all_devices(self) -> ACInitialiseReport:
         """Initialises and authenticates all devices
 
         Should only be called if don't want to lazy_load the devices
         and instead want fast access to all of the devices at the cost
         of waiting for this function to finish.
 
+        Devices are initialised concurrently (up to
+        max_concurrent_initialisations in the config at a time) and any that
+        fail or take longer than initialise_timeout are left to be loaded
+        when they are next requested.
+
         Should be called immediately after __init__
+
+        Returns:
+            ACInitialiseReport: Which devices were initialised successfully
         """
 
         # Load all devices
-        await self._load_all()
+        report = await self._load_all()
+        if self._midea_config.state_poller:
+            self.start_poller()
+        return report
+
+    def _save_credentials(self, device_info: ACDeviceInfoInDB):
+        """Saves a device's token and key after they have been refreshed"""
+        with homecontrol_base_db.connect() as conn:
+            conn.ac_devices.update_credentials(
+                str(device_info.id), token=device_info.token, key=device_info.key
+            )
 
     async def _load_device(self, device_info: ACDeviceInfoInDB) -> ACDevice:
         """Adds a device into _devices
@@ -40,22 +87,84 @@ class ACManager:
         Raises:
             ACAuthenticationError: If authentication fails for the device
         """
-        device = ACDevice(device_info)
+        device = ACDevice(
+            device_info,
+            state_cache_ttl=self._midea_config.state_cache_ttl,
+            retry_policy=self._retry_policy,
+            cloud_session=self._cloud_session,
+            on_credentials_refreshed=self._save_credentials,
+            circuit_breaker_threshold=self._midea_config.circuit_breaker_threshold,
+            circuit_breaker_timeout=self._midea_config.circuit_breaker_timeout,
+        )
         await device.initialise()
         # Must convert to string here as device_info.id is a UUID from the database
         self._devices[str(device_info.id)] = device
         return device
 
-    async def _load_all(self):
-        """Loads all devices from the database
+    async def _get_loaded_device(self, device_info: ACDeviceInfoInDB) -> ACDevice:
+        """Returns a device, loading it first if necessary
+
+        Concurrent callers share a single load of each device, which carries
+        on even if one of them is cancelled (e.g. after timing out)
 
         Raises:
-            ACAuthenticationError: If authentication fails for any devices
+            ACAuthenticationError: If authentication fails for the device
         """
+        device_id = str(device_info.id)
+        device = self._devices.get(device_id)
+        if device:
+            return device
+        future = self._loading.get(device_id)
+        if future is None:
+            future = asyncio.ensure_future(self._load_device(device_info))
+            self._loading[device_id] = future
+            future.add_done_callback(lambda _: self._loading.pop(device_id, None))
+        return await asyncio.shield(future)
+
+    async def _initialise_device(
+        self, semaphore: asyncio.Semaphore, device_info: ACDeviceInfoInDB
+    ) -> ACDeviceInitialiseResult:
+        """Loads a device, recording whether it succeeded rather than raising"""
+        timeout = self._midea_config.initialise_timeout
+        async with semaphore:
+            start_time = time.monotonic()
+            error = None
+            try:
+                await asyncio.wait_for(self._get_loaded_device(device_info), timeout)
+            except asyncio.TimeoutError:
+                error = f"Timed out after {timeout} seconds"
+            except Exception as err:
+                error = str(err)
+            return ACDeviceInitialiseResult(
+                name=device_info.name,
+                success=error is None,
+                time_taken=time.monotonic() - start_time,
+                error=error,
+            )
+
+    async def _load_all(self) -> ACInitialiseReport:
+        """Loads all devices from the database concurrently
+
+        Returns:
+            ACInitialiseReport: Which devices were loaded successfully
+        """
+        # Don't hold onto the connection while waiting for the devices
         with homecontrol_base_db.connect() as conn:
             devices = conn.ac_devices.get_all()
-            for device_info in devices:
-                await self._load_device(device_info)
+
+        semaphore = asyncio.Semaphore(self._midea_config.max_concurrent_initialisations)
+        results = await asyncio.gather(
+            *[
+                self._initialise_device(semaphore, device_info)
+                for device_info in devices
+            ]
+        )
+        return ACInitialiseReport(
+            devices={
+                str(device_info.id): result
+                for device_info, result in zip(devices, results)
+            }
+        )
 
     async def get_device(
         self, db_conn: HomeControlBaseDatabaseConnection, device_id: str
@@ -75,9 +184,105 @@ class ACManager:
         device = self._devices.get(device_id)
         if not device:
             # Attempt to load it
-            device = await self._load_device(db_conn.ac_devices.get(device_id))
+            device = await self._get_loaded_device(db_conn.ac_devices.get(device_id))
         return device
 
+    async def _get_device_state(
+        self, device_info: ACDeviceInfoInDB
+    ) -> ACDeviceStateResult:
+        """Returns the state of a device, recording any error rather than
+        raising"""
+        timeout = self._midea_config.state_timeout
+        start_time = time.monotonic()
+        state = None
+        error = None
+        try:
+            state = await asyncio.wait_for(self._get_state(device_info), timeout)
+        except asyncio.TimeoutError:
+            error = f"Timed out after {timeout} seconds"
+        except Exception as err:
+            error = str(err)
+        return ACDeviceStateResult(
+            name=device_info.name,
+            time_taken=time.monotonic() - start_time,
+            state=state,
+            error=error,
+        )
+
+    async def _get_state(self, device_info: ACDeviceInfoInDB) -> ACDeviceState:
+        """Returns the state of a device (loading it first if necessary)"""
+        device = await self._get_loaded_device(device_info)
+        return await device.get_state()
+
+    async def get_all_states(
+        self, db_conn: HomeControlBaseDatabaseConnection
+    ) -> ACHouseState:
+        """Returns the state of every device
+
+        All devices are refreshed concurrently (loading any that haven't been
+        already) and any that fail or take longer than state_timeout in the
+        config are given with an error rather than failing the whole house
+
+        Args:
+            db_conn (HomeControlBaseDatabaseConnection): Database connection
+                    to use to look up the devices
+        """
+        devices = db_conn.ac_devices.get_all()
+        results = await asyncio.gather(
+            *[self._get_device_state(device_info) for device_info in devices]
+        )
+        return ACHouseState(
+            devices={
+                str(device_info.id): result
+                for device_info, result in zip(devices, results)
+            }
+        )
+
+    def get_health(self) -> dict[str, ACDeviceHealth]:
+        """Returns how reliably each loaded device has been communicating
+        (indexed by device id)"""
+        return {device_id: device.health for device_id, device in self._devices.items()}
+
+    def start_poller(self) -> ACStatePoller:
+        """Starts polling the state of every loaded device in the background
+        (must be called with a running event loop)
+
+        Returns:
+            ACStatePoller: The poller (use to subscribe to state changes)
+        """
+        if self._poller is None:
+            self._poller = ACStatePoller(
+                get_devices=lambda: self._devices,
+                poll_interval=self._midea_config.poll_interval,
+                fast_poll_interval=self._midea_config.fast_poll_interval,
+                fast_poll_period=self._midea_config.fast_poll_period,
+                timeout=self._midea_config.state_timeout,
+            )
+        self._poller.start()
+        return self._poller
+
+    async def stop_poller(self):
+        """Stops polling the state of devices in the background"""
+        if self._poller is not None:
+            await self._poller.stop()
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """Returns the policy used when retrying communication with devices"""
+        return self._retry_policy
+
+    @property
+    def cloud_session(self) -> MideaCloudSession:
+        """Returns the session used to obtain authentication details for
+        devices from the Midea cloud"""
+        return self._cloud_session
+
+    @property
+    def poller(self) -> Optional[ACStatePoller]:
+        """Returns the background state poller (None if it hasn't been
+        started)"""
+        return self._poller
+
     async def add_device(self, device_info: ACDeviceInfoInDB) -> ACDevice:
         """Adds an air conditioning device
 
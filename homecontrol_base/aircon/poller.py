@@ -0,0 +1,220 @@
+import asyncio
+import time
+from typing import AsyncIterator, Callable, Optional
+
+from homecontrol_base.aircon.device import ACDevice
+from homecontrol_base.aircon.state import ACDeviceState
+from homecontrol_base.aircon.structs import ACStateChangeEvent
+
+
+class ACStatePoller:
+    """Polls the state of a set of air conditioning devices in the background
+    and publishes an event whenever one changes
+
+    Devices whose state has recently changed (or been assigned) are polled
+    more often than those that are idle
+    """
+
+    # Time to wait between checking whether any devices are due to be polled
+    # (seconds)
+    TICK_INTERVAL = 1
+
+    # Maximum number of events waiting to be received by each subscriber
+    # (the oldest are dropped when a subscriber falls behind)
+    SUBSCRIBER_QUEUE_SIZE = 100
+
+    _get_devices: Callable[[], dict[str, ACDevice]]
+    _poll_interval: float
+    _fast_poll_interval: float
+    _fast_poll_period: float
+    _timeout: float
+
+    _states: dict[str, ACDeviceState]
+    _last_poll_times: dict[str, float]
+    _last_change_times: dict[str, float]
+    _in_progress: set[str]
+    _errors: dict[str, Exception]
+    _last_callback_error: Optional[Exception]
+    _events_dropped: int
+
+    _callbacks: list[Callable[[ACStateChangeEvent], None]]
+    _queues: set["asyncio.Queue[ACStateChangeEvent]"]
+    _task: Optional["asyncio.Task[None]"]
+    _poll_tasks: set["asyncio.Task[None]"]
+
+    def __init__(
+        self,
+        get_devices: Callable[[], dict[str, ACDevice]],
+        poll_interval: float,
+        fast_poll_interval: float,
+        fast_poll_period: float,
+        timeout: float,
+    ) -> None:
+        """Constructor
+
+        Args:
+            get_devices (Callable[[], dict[str, ACDevice]]): Function that
+                        returns the devices to poll indexed by their ids
+            poll_interval (float): Time between polls of an idle device
+                        (seconds)
+            fast_poll_interval (float): Time between polls of a device that
+                        has recently changed (seconds)
+            fast_poll_period (float): Time after a change for which a device
+                        is polled at fast_poll_interval (seconds)
+            timeout (float): Time after which a poll is abandoned (seconds)
+        """
+        self._get_devices = get_devices
+        self._poll_interval = poll_interval
+        self._fast_poll_interval = fast_poll_interval
+        self._fast_poll_period = fast_poll_period
+        self._timeout = timeout
+
+        self._states = {}
+        self._last_poll_times = {}
+        self._last_change_times = {}
+        self._in_progress = set()
+        self._errors = {}
+        self._last_callback_error = None
+        self._events_dropped = 0
+
+        self._callbacks = []
+        self._queues = set()
+        self._task = None
+        self._poll_tasks = set()
+
+    def _get_interval(self, device_id: str, device: ACDevice, now: float) -> float:
+        """Returns the time that should be left between polls of a device"""
+        last_change_time = max(
+            self._last_change_times.get(device_id, -float("inf")),
+            device.last_command_time or -float("inf"),
+        )
+        if now - last_change_time < self._fast_poll_period:
+            return self._fast_poll_interval
+        return self._poll_interval
+
+    def _publish(self, event: ACStateChangeEvent):
+        """Sends an event to every subscriber"""
+        for callback in list(self._callbacks):
+            try:
+                callback(event)
+            except Exception as err:
+                self._last_callback_error = err
+        for queue in self._queues:
+            if queue.full():
+                queue.get_nowait()
+                self._events_dropped += 1
+            queue.put_nowait(event)
+
+    async def _poll_device(self, device_id: str, device: ACDevice):
+        """Refreshes the state of a device, publishing an event if it changed"""
+        try:
+            state = await asyncio.wait_for(device.get_state(max_age=0), self._timeout)
+        except Exception as err:
+            self._errors[device_id] = err
+            return
+        finally:
+            self._last_poll_times[device_id] = time.monotonic()
+            self._in_progress.discard(device_id)
+
+        self._errors.pop(device_id, None)
+        previous_state = self._states.get(device_id)
+        if state != previous_state:
+            self._states[device_id] = state
+            self._last_change_times[device_id] = time.monotonic()
+            self._publish(
+                ACStateChangeEvent(
+                    device_id=device_id,
+                    name=device.info.name,
+                    state=state,
+                    previous_state=previous_state,
+                )
+            )
+
+    async def _run(self):
+        """Background task that polls devices when they are due"""
+        while True:
+            now = time.monotonic()
+            for device_id, device in self._get_devices().items():
+                if device_id in self._in_progress:
+                    continue
+                last_poll_time = self._last_poll_times.get(device_id)
+                interval = self._get_interval(device_id, device, now)
+                if last_poll_time is None or now - last_poll_time >= interval:
+                    # Polled independently so a slow device doesn't delay the
+                    # others
+                    self._in_progress.add(device_id)
+                    task = asyncio.create_task(self._poll_device(device_id, device))
+                    self._poll_tasks.add(task)
+                    task.add_done_callback(self._poll_tasks.discard)
+            await asyncio.sleep(ACStatePoller.TICK_INTERVAL)
+
+    def start(self):
+        """Starts polling (must be called with a running event loop)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stops polling (cancelling any polls in progress)"""
+        tasks = list(self._poll_tasks)
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._in_progress = set()
+
+    def add_callback(self, callback: Callable[[ACStateChangeEvent], None]):
+        """Adds a function to be called whenever the state of a device changes"""
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[ACStateChangeEvent], None]):
+        """Removes a function previously given to add_callback"""
+        self._callbacks.remove(callback)
+
+    async def subscribe(self) -> AsyncIterator[ACStateChangeEvent]:
+        """Yields an event whenever the state of a device changes
+
+        At most SUBSCRIBER_QUEUE_SIZE events are kept waiting, so a subscriber
+        that falls behind misses the oldest ones
+
+        Usage:
+            async for event in poller.subscribe():
+                ...
+        """
+        queue: asyncio.Queue[ACStateChangeEvent] = asyncio.Queue(
+            maxsize=ACStatePoller.SUBSCRIBER_QUEUE_SIZE
+        )
+        self._queues.add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._queues.discard(queue)
+
+    def get_state(self, device_id: str) -> Optional[ACDeviceState]:
+        """Returns the last polled state of a device (None if it hasn't been
+        polled successfully yet)"""
+        return self._states.get(device_id)
+
+    @property
+    def running(self) -> bool:
+        """Returns whether the poller is running"""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def errors(self) -> dict[str, Exception]:
+        """Returns the errors that occurred during the last poll of any
+        devices that failed (indexed by their ids)"""
+        return dict(self._errors)
+
+    @property
+    def events_dropped(self) -> int:
+        """Returns the number of events subscribers missed by falling
+        behind"""
+        return self._events_dropped
+
+    @property
+    def last_callback_error(self) -> Optional[Exception]:
+        """Returns the last error raised by a callback"""
+        return self._last_callback_error
@@ -0,0 +1,103 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, Type, TypeVar
+
+T = TypeVar("T")
+
+
+async def _wait_for(awaitable: Awaitable[T], timeout: float) -> T:
+    """Equivalent of asyncio.wait_for that always raises the builtin
+    TimeoutError (asyncio.TimeoutError is a separate class before Python
+    3.11)"""
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError as err:
+        if isinstance(err, TimeoutError):
+            raise
+        raise TimeoutError() from err
+
+
+@dataclass
+class RetryStats:
+    """Stores statistics about a call made using a RetryPolicy"""
+
+    attempts: int = 0
+    # Total time spent including any delays between attempts (seconds)
+    time_taken: float = 0
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Describes how to retry an operation that can fail temporarily
+
+    The delay between attempts grows exponentially (with random jitter so
+    that several devices failing together don't retry in lockstep) and no
+    further attempts are made once the deadline has passed
+    """
+
+    # Maximum number of attempts (including the first)
+    max_attempts: int = 3
+    # Delay before the first retry (seconds)
+    initial_delay: float = 0.5
+    # Maximum delay between attempts (seconds)
+    max_delay: float = 5
+    # Factor the delay is multiplied by after every retry
+    multiplier: float = 2
+    # Fraction of each delay that is randomised
+    jitter: float = 0.5
+    # Maximum total time to spend including delays (seconds, None for no
+    # limit)
+    deadline: Optional[float] = None
+
+    def get_delay(self, retry: int) -> float:
+        """Returns the time to wait before a retry (starting from 0)"""
+        delay = min(self.max_delay, self.initial_delay * self.multiplier**retry)
+        return delay * (1 - self.jitter * random.random())
+
+    async def run(
+        self,
+        function: Callable[[], Awaitable[T]],
+        retry_on: tuple[Type[Exception], ...],
+        stats: Optional[RetryStats] = None,
+    ) -> T:
+        """Calls and awaits a function, retrying when it fails
+
+        Args:
+            function (Callable[[], Awaitable[T]]): Function to call
+            retry_on (tuple[Type[Exception], ...]): Exceptions that indicate
+                        a temporary failure (any others are raised
+                        immediately)
+            stats (Optional[RetryStats]): Will be updated with the number of
+                        attempts made and the time taken
+
+        Raises:
+            Exception: The exception raised by the last attempt when there
+                       are no attempts or time left
+            TimeoutError: If an attempt is still running at the deadline
+        """
+        if stats is None:
+            stats = RetryStats()
+        start_time = time.monotonic()
+        end_time = start_time + self.deadline if self.deadline is not None else None
+
+        try:
+            for retry in range(0, self.max_attempts):
+                stats.attempts += 1
+                try:
+                    if end_time is None:
+                        return await function()
+                    return await _wait_for(
+                        function(), max(0, end_time - time.monotonic())
+                    )
+                except retry_on:
+                    delay = self.get_delay(retry)
+                    if retry == self.max_attempts - 1 or (
+                        end_time is not None and time.monotonic() + delay >= end_time
+                    ):
+                        raise
+                await asyncio.sleep(delay)
+        finally:
+            stats.time_taken = time.monotonic() - start_time
+        raise ValueError("max_attempts must be at least 1")
@@ -1,8 +1,10 @@
 from homecontrol_base.aircon.device import ACDevice
 from homecontrol_base.aircon.manager import ACManager
+from homecontrol_base.aircon.structs import ACDeviceHealth, ACHouseState
 from homecontrol_base.database.homecontrol_base.database import (
     HomeControlBaseDatabaseConnection,
 )
+from homecontrol_base.database.homecontrol_base.models import ACDeviceInfoInDB
 from homecontrol_base.service.core import BaseService
 
 
@@ -52,6 +54,18 @@ class ACService(BaseService[HomeControlBaseDatabaseConnection]):
             db_conn=self.db_conn, device_id=str(device_info.id)
         )
 
+    async def get_all_states(self) -> ACHouseState:
+        """Returns the state of every device
+
+        Devices whose state couldn't be obtained are given with an error
+        """
+        return await self._ac_manager.get_all_states(db_conn=self.db_conn)
+
+    def get_health(self) -> dict[str, ACDeviceHealth]:
+        """Returns how reliably each loaded device has been communicating
+        (indexed by device id)"""
+        return self._ac_manager.get_health()
+
     async def add_device(self, name: str, ip_address: str) -> ACDevice:
         """Adds an air conditioning device
 
@@ -71,10 +85,46 @@ class ACService(BaseService[HomeControlBaseDatabaseConnection]):
             name=name,
             ip_address=ip_address,
             account=self._ac_manager._midea_config.account,
+            retry_policy=self._ac_manager.retry_policy,
+            cloud_session=self._ac_manager.cloud_session,
         )
         device_info = self.db_conn.ac_devices.create(device_info)
         return await self._ac_manager.add_device(device_info=device_info)
 
+    async def discover_devices(self, network: str) -> list[ACDeviceInfoInDB]:
+        """Looks for air conditioning units in a network (without adding them)
+
+        Devices that have already been added are excluded
+
+        Args:
+            network (str): Network to search e.g. 192.168.1.0/24 (a single
+                           address or a range given as 192.168.1.10-192.168.1.50
+                           is also accepted)
+
+        Returns:
+            list[ACDeviceInfoInDB]: Information for connecting to each device
+                                    found (named after their ip address)
+
+        Raises:
+            ValueError: If the network is invalid or too large
+        """
+        midea_config = self._ac_manager._midea_config
+        found_devices = await ACDevice.discover_network(
+            network=network,
+            account=midea_config.account,
+            max_concurrent=midea_config.discovery_max_concurrent,
+            deadline=midea_config.discovery_deadline,
+            cloud_session=self._ac_manager.cloud_session,
+        )
+        existing_identifiers = set(
+            device_info.identifier for device_info in self.db_conn.ac_devices.get_all()
+        )
+        return [
+            device_info
+            for device_info in found_devices
+            if device_info.identifier not in existing_identifiers
+        ]
+
     def remove_device(self, device_id: str) -> None:
         """Removes an air conditioning device
 
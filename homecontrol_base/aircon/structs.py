@@ -0,0 +1,105 @@
+from typing import Optional
+
+from pydantic.dataclasses import dataclass
+
+from homecontrol_base.aircon.state import ACDeviceState
+
+
+@dataclass
+class ACDeviceInitialiseResult:
+    """Stores the outcome of initialising an air conditioning device"""
+
+    name: str
+    success: bool
+    # Time taken to initialise (or fail to initialise) the device (seconds)
+    time_taken: float
+    error: Optional[str] = None
+
+
+@dataclass
+class ACInitialiseReport:
+    """Stores the outcome of initialising every air conditioning device"""
+
+    # Indexed by device id
+    devices: dict[str, ACDeviceInitialiseResult]
+
+    @property
+    def failed(self) -> dict[str, ACDeviceInitialiseResult]:
+        """Returns the results of the devices that failed to initialise"""
+        return {
+            device_id: result
+            for device_id, result in self.devices.items()
+            if not result.success
+        }
+
+
+@dataclass
+class ACDeviceStateResult:
+    """Stores the outcome of refreshing the state of an air conditioning
+    device"""
+
+    name: str
+    # Time taken to refresh (or fail to refresh) the state (seconds)
+    time_taken: float
+    state: Optional[ACDeviceState] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class ACHouseState:
+    """Stores the state of every air conditioning device"""
+
+    # Indexed by device id
+    devices: dict[str, ACDeviceStateResult]
+
+    @property
+    def failed(self) -> dict[str, ACDeviceStateResult]:
+        """Returns the results of the devices whose state couldn't be
+        obtained"""
+        return {
+            device_id: result
+            for device_id, result in self.devices.items()
+            if result.error is not None
+        }
+
+
+@dataclass
+class ACStateChangeEvent:
+    """Published by an ACStatePoller when the state of a device changes"""
+
+    device_id: str
+    name: str
+    state: ACDeviceState
+    # Will be None the first time a device is polled
+    previous_state: Optional[ACDeviceState] = None
+
+
+@dataclass
+class ACDeviceCommandStats:
+    """Stores statistics about the states assigned to an air conditioning
+    device"""
+
+    # Number of states sent to the device
+    applied: int
+    # Number of states replaced by a later one before being sent
+    coalesced: int
+    # Number of states not sent as they matched the last known state
+    skipped: int
+
+
+@dataclass
+class ACDeviceHealth:
+    """Stores information about how reliably an air conditioning device has
+    been communicating"""
+
+    # Times are from time.monotonic
+    last_success_time: Optional[float]
+    last_failure_time: Optional[float]
+    consecutive_failures: int
+    # Exponentially weighted moving average of the time taken by successful
+    # operations (seconds)
+    latency: Optional[float]
+    # Whether calls are currently failing immediately without contacting the
+    # device
+    circuit_open: bool
+    last_error: Optional[str] = None
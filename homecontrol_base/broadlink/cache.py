@@ -0,0 +1,88 @@
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from homecontrol_base.database.homecontrol_base import models
+
+
+class BroadlinkPacketCache:
+    """Bounded in-memory cache of the packets of Broadlink actions
+
+    Packets never change once recorded, so they only need to be removed when
+    an action is deleted (or when the cache is full, in which case the least
+    recently used are removed first)
+    """
+
+    _max_size: int
+    _lock: threading.Lock
+    # Packets indexed by action id (in order of least recently used)
+    _packets: OrderedDict[str, bytes]
+    # Action ids indexed by action name
+    _ids: dict[str, str]
+    # Action names indexed by action id
+    _names: dict[str, str]
+
+    def __init__(self, max_size: int = 256) -> None:
+        """Constructor
+
+        Args:
+            max_size (int): Maximum number of packets to store
+        """
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._packets = OrderedDict()
+        self._ids = {}
+        self._names = {}
+
+    def get(self, action_id: str) -> Optional[bytes]:
+        """Returns the packet of an action given its id (None if not cached)"""
+        with self._lock:
+            packet = self._packets.get(action_id)
+            if packet is not None:
+                self._packets.move_to_end(action_id)
+            return packet
+
+    def get_by_name(self, action_name: str) -> Optional[bytes]:
+        """Returns the packet of an action given its name (None if not
+        cached)"""
+        with self._lock:
+            action_id = self._ids.get(action_name)
+        return self.get(action_id) if action_id is not None else None
+
+    def _remove(self, action_id: str):
+        """Removes an action (should hold _lock)"""
+        self._packets.pop(action_id, None)
+        name = self._names.pop(action_id, None)
+        if name is not None:
+            self._ids.pop(name, None)
+
+    def add(self, action: models.BroadlinkActionInDB):
+        """Adds the packet of an action"""
+        action_id = str(action.id)
+        with self._lock:
+            self._remove(action_id)
+            self._packets[action_id] = action.packet
+            self._ids[action.name] = action_id
+            self._names[action_id] = action.name
+            while len(self._packets) > self._max_size:
+                self._remove(next(iter(self._packets)))
+
+    def preload(self, actions: Iterable[models.BroadlinkActionInDB]):
+        """Adds the packets of several actions (e.g. all of them at startup)"""
+        for action in actions:
+            self.add(action)
+
+    def invalidate(self, action_id: str):
+        """Removes the packet of an action (e.g. after it has been deleted)"""
+        with self._lock:
+            self._remove(action_id)
+
+    def clear(self):
+        """Removes all packets"""
+        with self._lock:
+            self._packets.clear()
+            self._ids.clear()
+            self._names.clear()
+
+    def __len__(self) -> int:
+        return len(self._packets)
@@ -1,6 +1,13 @@
+import asyncio
+import ipaddress
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncGenerator, Generator, Optional
 
 import broadlink
+import ifaddr
 
 from homecontrol_base.broadlink.exceptions import IncompatibleDeviceError, RecordTimeout
 from homecontrol_base.broadlink.structs import BroadlinkDeviceDiscoverInfo
@@ -17,22 +24,53 @@ class BroadlinkDevice:
     # Minimum time between querying if anything has been learnt yet (seconds)
     LEARNING_SLEEP_TIME = 1
 
+    # Time between querying if anything has been learnt yet when recording
+    # asynchronously (seconds)
+    LEARNING_POLL_INTERVAL = 0.1
+
+    # Time to wait for a response from the device (seconds)
+    DEFAULT_TIMEOUT = 5
+
+    # Maximum number of devices probed at the same time by discover_many
+    MAX_DISCOVER_WORKERS = 32
+
     _device_info: models.BroadlinkDeviceInDB
     _device: broadlink.Device
 
-    def __init__(self, device_info: models.BroadlinkDeviceInDB):
+    # Held while recording asynchronously (only one packet can be learnt at
+    # a time) - created on first use as before Python 3.10 it binds to the
+    # event loop of the thread it is created in
+    _learning_lock: Optional[asyncio.Lock]
+
+    # Held while sending a sequence of packets so that they aren't
+    # interleaved with packets from elsewhere
+    _send_lock: threading.Lock
+
+    def __init__(
+        self, device_info: models.BroadlinkDeviceInDB, timeout: float = DEFAULT_TIMEOUT
+    ):
         """Initialises and authenticates the device
 
         Args:
             device_info (models.BroadlinkDeviceInDB): Device info
+            timeout (float): Time to wait for a response from the device
+                             (seconds)
+
+        Raises:
+            NetworkTimeoutError: If the device doesn't respond in time
         """
 
         self._device_info = device_info
 
         # Connect to the device
-        self._device = broadlink.hello(device_info.ip_address)
+        self._device = broadlink.hello(device_info.ip_address, timeout=timeout)
+        # Otherwise the device uses broadlink's default for later requests
+        self._device.timeout = timeout
         self._device.auth()
 
+        self._learning_lock = None
+        self._send_lock = threading.Lock()
+
     def record_ir_packet(self) -> bytes:
         """Puts the device into learning mode and waits until an IR packet is
         returned or a maximum timeout is reached
@@ -73,6 +111,46 @@ class BroadlinkDevice:
 
         raise RecordTimeout("Failed to record an IR packet")
 
+    async def record_ir_packet_async(self) -> bytes:
+        """Puts the device into learning mode and waits until an IR packet is
+        returned or a maximum timeout is reached without blocking the event
+        loop
+
+        The packet is returned as soon as it arrives and the wait can be
+        cancelled. Recording on the same device is performed one at a time.
+
+        Returns:
+            bytes: The IR packet
+
+        Raises:
+            IncompatibleDeviceError: If the device is incompatible
+            RecordTimeout: If the record times out
+        """
+        if not isinstance(self._device, broadlink.remote.rmmini):
+            raise IncompatibleDeviceError(
+                "Incompatible device for recording IR packets"
+            )
+
+        if self._learning_lock is None:
+            self._learning_lock = asyncio.Lock()
+        async with self._learning_lock:
+            # Start learning mode
+            await asyncio.to_thread(self._device.enter_learning)
+
+            start_time = time.monotonic()
+
+            # Keep checking for packets until we reach the timeout
+            while time.monotonic() - start_time < BroadlinkDevice.LEARNING_TIMEOUT:
+                await asyncio.sleep(BroadlinkDevice.LEARNING_POLL_INTERVAL)
+
+                # Check
+                try:
+                    return await asyncio.to_thread(self._device.check_data)
+                except broadlink.exceptions.ReadError:
+                    pass
+
+        raise RecordTimeout("Failed to record an IR packet")
+
     def send_ir_packet(self, packet: bytes):
         """Sends an IR packet to the device
 
@@ -85,7 +163,29 @@ class BroadlinkDevice:
         if not isinstance(self._device, broadlink.remote.rmmini):
             raise IncompatibleDeviceError("Incompatible device for sending IR packets")
 
-        self._device.send_data(packet)
+        with self._send_lock:
+            self._device.send_data(packet)
+
+    def send_ir_packets(self, packets: list[tuple[bytes, float]]):
+        """Sends a sequence of IR packets to the device without any others
+        being sent in between
+
+        Args:
+            packets (list[tuple[bytes, float]]): Packets to send and the time
+                            to wait after each (seconds)
+
+        Raises:
+            IncompatibleDeviceError: If the device is incompatible
+        """
+        if not isinstance(self._device, broadlink.remote.rmmini):
+            raise IncompatibleDeviceError("Incompatible device for sending IR packets")
+
+        with self._send_lock:
+            for index, (packet, delay) in enumerate(packets):
+                self._device.send_data(packet)
+                # No need to wait after the last one
+                if delay > 0 and index < len(packets) - 1:
+                    time.sleep(delay)
 
     @property
     def info(self) -> models.BroadlinkDeviceInDB:
@@ -97,27 +197,145 @@ class BroadlinkDevice:
         return BroadlinkDeviceDiscoverInfo(ip_address=device.host[0])
 
     @staticmethod
-    def discover(ip_address: str) -> BroadlinkDeviceDiscoverInfo:
+    def discover(
+        ip_address: str, timeout: float = DEFAULT_TIMEOUT
+    ) -> BroadlinkDeviceDiscoverInfo:
         """Attempts to discover a a specific Broadlink device
 
         Args:
             ip_address (str): IP address of the device
+            timeout (float): Time to wait for a response (seconds)
 
         Raises:
             DeviceNotFoundError: If the device isn't found
         """
         try:
-            return BroadlinkDevice._get_discover_info(broadlink.hello(ip_address))
+            device = broadlink.hello(ip_address, timeout=timeout)
         except broadlink.e.NetworkTimeoutError as exc:
             raise DeviceNotFoundError(
                 f"Unable to find the Broadlink device with ip '{ip_address}'"
             ) from exc
+        device.timeout = timeout
+        return BroadlinkDevice._get_discover_info(device)
+
+    @staticmethod
+    def discover_many(
+        ip_addresses: list[str], timeout: float = DEFAULT_TIMEOUT
+    ) -> list[BroadlinkDeviceDiscoverInfo]:
+        """Attempts to discover several specific Broadlink devices at once
+
+        Args:
+            ip_addresses (list[str]): IP addresses to probe
+            timeout (float): Time to wait for a response from each (seconds)
+
+        Returns:
+            list[BroadlinkDeviceDiscoverInfo]: Devices that were found
+        """
+
+        def probe(ip_address: str) -> Optional[BroadlinkDeviceDiscoverInfo]:
+            try:
+                return BroadlinkDevice.discover(ip_address, timeout=timeout)
+            except DeviceNotFoundError:
+                return None
+
+        if not ip_addresses:
+            return []
+        # Probing is almost entirely waiting for responses so use plenty of
+        # threads
+        with ThreadPoolExecutor(
+            max_workers=min(len(ip_addresses), BroadlinkDevice.MAX_DISCOVER_WORKERS)
+        ) as executor:
+            results = list(executor.map(probe, ip_addresses))
+        return [result for result in results if result is not None]
+
+    @staticmethod
+    def _get_broadcast_addresses() -> list[tuple[Optional[str], str]]:
+        """Returns the local IPv4 address and broadcast address of every
+        network interface (excluding loopback)
+
+        Falls back to the default broadcast address if none are found
+        """
+        addresses = []
+        for adapter in ifaddr.get_adapters():
+            for ip in adapter.ips:
+                # IPv6 addresses are given as tuples
+                if not isinstance(ip.ip, str):
+                    continue
+                interface = ipaddress.IPv4Interface(f"{ip.ip}/{ip.network_prefix}")
+                if interface.is_loopback:
+                    continue
+                addresses.append(
+                    (str(interface.ip), str(interface.network.broadcast_address))
+                )
+        return addresses or [(None, "255.255.255.255")]
 
     @staticmethod
-    def discover_all() -> list[BroadlinkDeviceDiscoverInfo]:
+    def discover_iter(
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> Generator[BroadlinkDeviceDiscoverInfo, None, None]:
+        """Discovers Broadlink devices on every local network at once, yielding
+        each as soon as it responds
+
+        Args:
+            timeout (float): Time to wait for responses (seconds)
+        """
+        responses: queue.Queue = queue.Queue()
+
+        def scan(local_ip_address: Optional[str], broadcast_address: str):
+            try:
+                for device in broadlink.xdiscover(
+                    timeout=timeout,
+                    local_ip_address=local_ip_address,
+                    discover_ip_address=broadcast_address,
+                ):
+                    responses.put(BroadlinkDevice._get_discover_info(device))
+            except OSError:
+                # Interface unusable (e.g. it has gone down)
+                pass
+            finally:
+                responses.put(None)
+
+        addresses = BroadlinkDevice._get_broadcast_addresses()
+        for local_ip_address, broadcast_address in addresses:
+            threading.Thread(
+                target=scan, args=(local_ip_address, broadcast_address), daemon=True
+            ).start()
+
+        # Devices may respond on more than one interface
+        discovered = set()
+        remaining = len(addresses)
+        while remaining > 0:
+            discover_info = responses.get()
+            if discover_info is None:
+                remaining -= 1
+            elif discover_info.ip_address not in discovered:
+                discovered.add(discover_info.ip_address)
+                yield discover_info
+
+    @staticmethod
+    async def discover_iter_async(
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> AsyncGenerator[BroadlinkDeviceDiscoverInfo, None]:
+        """Asynchronous equivalent of discover_iter
+
+        Args:
+            timeout (float): Time to wait for responses (seconds)
+        """
+        discoveries = BroadlinkDevice.discover_iter(timeout=timeout)
+        while True:
+            discover_info = await asyncio.to_thread(next, discoveries, None)
+            if discover_info is None:
+                return
+            yield discover_info
+
+    @staticmethod
+    def discover_all(
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> list[BroadlinkDeviceDiscoverInfo]:
         """Attempts ot discover all Broadlink devices available on the current
-        network"""
-        devices = broadlink.discover()
+        network
 
-        # Parse and return
-        return [BroadlinkDevice._get_discover_info(device) for device in devices]
+        Args:
+            timeout (float): Time to wait for responses (seconds)
+        """
+        return list(BroadlinkDevice.discover_iter(timeout=timeout))
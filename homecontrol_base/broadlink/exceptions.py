@@ -2,6 +2,10 @@ class ActionNotFoundError(Exception):
     """Raised when attempting to get an action that doesn't exist"""
 
 
+class MacroNotFoundError(Exception):
+    """Raised when attempting to get a macro that doesn't exist"""
+
+
 class RecordTimeout(Exception):
     """Raised after failing to record an action due to a timeout"""
 
@@ -1,4 +1,12 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from homecontrol_base.broadlink.cache import BroadlinkPacketCache
 from homecontrol_base.broadlink.device import BroadlinkDevice
+from homecontrol_base.broadlink.structs import (
+    BroadlinkDeviceInitialiseResult,
+    BroadlinkInitialiseReport,
+)
 from homecontrol_base.database.homecontrol_base import models
 from homecontrol_base.database.homecontrol_base.database import (
     HomeControlBaseDatabaseConnection,
@@ -11,24 +19,107 @@ from homecontrol_base.database.homecontrol_base.database import (
 class BroadlinkManager:
     """Manages a set of Broadlink devices"""
 
+    # Maximum number of devices initialised at the same time
+    MAX_CONCURRENT_INITIALISATIONS = 8
+
+    # Time to wait for a response from each device when initialising it
+    # (seconds)
+    INITIALISE_TIMEOUT = 3
+
+    # Maximum number of action packets kept in memory
+    PACKET_CACHE_SIZE = 256
+
     _devices: dict[str, BroadlinkDevice]
+    _packet_cache: BroadlinkPacketCache
 
-    def __init__(self):
+    def __init__(self, lazy_load: bool = True):
+        """Constructor
+
+        Args:
+            lazy_load (bool): Whether to wait until each device is requested
+                              before connecting to it and each action is
+                              played before caching its packet (otherwise all
+                              are loaded now)
+        """
         self._devices = {}
+        self._packet_cache = BroadlinkPacketCache(BroadlinkManager.PACKET_CACHE_SIZE)
 
-        self._load_all()
+        if not lazy_load:
+            self.initialise_all_devices()
+            self.preload_packet_cache()
+
+    def preload_packet_cache(self):
+        """Loads the packets of all actions into the packet cache (up to its
+        maximum size)"""
+        with homecontrol_base_db.connect() as conn:
+            self._packet_cache.preload(conn.broadlink_actions.get_all())
+
+    @property
+    def packet_cache(self) -> BroadlinkPacketCache:
+        """Returns the cache of action packets"""
+        return self._packet_cache
+
+    def initialise_all_devices(self) -> BroadlinkInitialiseReport:
+        """Initialises and authenticates all devices
+
+        Devices are initialised concurrently so this takes as long as the
+        slowest device (at most INITIALISE_TIMEOUT for each request made to
+        it). Any that fail are left to be loaded when they are next requested.
+
+        Returns:
+            BroadlinkInitialiseReport: Which devices were initialised
+                                       successfully
+        """
+        return self._load_all()
 
     def _load_device(self, device_info: models.BroadlinkDeviceInDB) -> BroadlinkDevice:
         """Adds a device into _devices"""
-        device = BroadlinkDevice(device_info)
-        self._devices[device_info.id] = device
+        device = BroadlinkDevice(
+            device_info, timeout=BroadlinkManager.INITIALISE_TIMEOUT
+        )
+        # Must convert to string here as device_info.id is a UUID from the database
+        self._devices[str(device_info.id)] = device
         return device
 
-    def _load_all(self):
+    def _initialise_device(
+        self, device_info: models.BroadlinkDeviceInDB
+    ) -> BroadlinkDeviceInitialiseResult:
+        """Loads a device, recording whether it succeeded rather than raising"""
+        start_time = time.monotonic()
+        error = None
+        try:
+            self._load_device(device_info)
+        except Exception as err:
+            error = str(err) or type(err).__name__
+        return BroadlinkDeviceInitialiseResult(
+            name=device_info.name,
+            success=error is None,
+            time_taken=time.monotonic() - start_time,
+            error=error,
+        )
+
+    def _load_all(self) -> BroadlinkInitialiseReport:
+        """Loads all devices from the database concurrently
+
+        Returns:
+            BroadlinkInitialiseReport: Which devices were loaded successfully
+        """
         with homecontrol_base_db.connect() as conn:
             devices = conn.broadlink_devices.get_all()
-            for device_info in devices:
-                self._load_device(device_info)
+            if not devices:
+                return BroadlinkInitialiseReport(devices={})
+            with ThreadPoolExecutor(
+                max_workers=min(
+                    len(devices), BroadlinkManager.MAX_CONCURRENT_INITIALISATIONS
+                )
+            ) as executor:
+                results = list(executor.map(self._initialise_device, devices))
+            return BroadlinkInitialiseReport(
+                devices={
+                    str(device_info.id): result
+                    for device_info, result in zip(devices, results)
+                }
+            )
 
     def get_device(
         self, db_conn: HomeControlBaseDatabaseConnection, device_id: str
@@ -0,0 +1,243 @@
+import zlib
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Optional
+
+# First byte of a packet containing IR pulses
+IR_PACKET_TYPE = 0x26
+
+# Length of a single unit of a pulse (microseconds)
+PULSE_TICK = 269 / 8.192
+
+# Largest pulse length that can be encoded (ticks)
+MAX_PULSE_TICKS = 0xFFFF
+
+# Gap that ends every IR signal (ticks) - recorded as 0x00 0x0d 0x05 but
+# sometimes written without the leading 0x00 (giving pulses of 0x0d, 0x05)
+IR_SIGNAL_TRAILER = 0x0D05
+_SHORT_IR_SIGNAL_TRAILER = [0x0D, 0x05]
+
+# Largest amount of pulse data sent in a single packet (bytes) - the devices
+# have a limited buffer so this is kept well below what the header allows
+MAX_PULSE_DATA_LENGTH = 2048
+
+
+class PacketStorageFormat(IntEnum):
+    """Format a packet is stored in within the database"""
+
+    # Packet exactly as recorded
+    RAW = 0
+    # Packet compressed using zlib
+    ZLIB = 1
+
+
+# Format newly stored packets are written in
+DEFAULT_PACKET_STORAGE_FORMAT = PacketStorageFormat.ZLIB
+
+
+@dataclass
+class IRPacket:
+    """Stores the decoded contents of a Broadlink IR packet"""
+
+    # Number of additional times the device repeats the pulses
+    repeat: int
+    # Alternating on and off pulse lengths starting with on (ticks)
+    pulses: list[int]
+
+
+def decode_ir_packet(packet: bytes) -> IRPacket:
+    """Decodes a packet recorded by or sent to a Broadlink device
+
+    Raises:
+        ValueError: If the packet isn't a valid IR packet
+    """
+    if len(packet) < 4 or packet[0] != IR_PACKET_TYPE:
+        raise ValueError("Not an IR packet")
+
+    end = min(4 + int.from_bytes(packet[2:4], "little"), len(packet))
+    pulses = []
+    index = 4
+    while index < end:
+        pulse = packet[index]
+        index += 1
+        # Long pulses are given by 0 followed by two bytes
+        if pulse == 0:
+            if index + 2 > len(packet):
+                raise ValueError("Malformed IR packet")
+            pulse = int.from_bytes(packet[index : index + 2], "big")
+            index += 2
+        pulses.append(pulse)
+    return IRPacket(repeat=packet[1], pulses=pulses)
+
+
+def _encode_pulses(pulses: list[int]) -> bytes:
+    """Encodes pulse lengths (ticks) as they appear in a packet"""
+    data = bytearray()
+    for pulse in pulses:
+        if pulse > 0xFF:
+            data.append(0)
+            data.extend(pulse.to_bytes(2, "big"))
+        else:
+            data.append(pulse)
+    return bytes(data)
+
+
+def encode_ir_packet(ir_packet: IRPacket) -> bytes:
+    """Encodes an IR packet to be sent to a Broadlink device
+
+    Raises:
+        ValueError: If any of the pulses are too long
+    """
+    if any(pulse > MAX_PULSE_TICKS for pulse in ir_packet.pulses):
+        raise ValueError("Pulse too long to encode")
+    data = _encode_pulses(ir_packet.pulses)
+    return (
+        bytes([IR_PACKET_TYPE, ir_packet.repeat])
+        + len(data).to_bytes(2, "little")
+        + data
+    )
+
+
+def _get_pulses(packet: bytes) -> Optional[list[int]]:
+    """Returns the pulses of a packet if it can be concatenated with others
+    (None otherwise)"""
+    try:
+        ir_packet = decode_ir_packet(packet)
+    except ValueError:
+        return None
+    # Repeats apply to the whole packet so would also repeat anything added
+    if ir_packet.repeat != 0 or not ir_packet.pulses:
+        return None
+    # Zero length pulses come from padding included in the length (and can't
+    # be encoded again as 0 marks the start of a long pulse)
+    if 0 in ir_packet.pulses:
+        return None
+
+    # Trailer is added back after the last packet (and as part of the gap
+    # between each of them)
+    pulses = ir_packet.pulses
+    if pulses[-1] == IR_SIGNAL_TRAILER:
+        pulses = pulses[:-1]
+    elif pulses[-2:] == _SHORT_IR_SIGNAL_TRAILER:
+        pulses = pulses[:-2]
+    return pulses or None
+
+
+def _extend_gap(pulses: list[int], delay: float) -> Optional[list[int]]:
+    """Returns pulses ending a signal followed by a delay (seconds), i.e.
+    with the trailer and delay added to the final gap (None if the gap would
+    be too long to encode)
+
+    Always ends in a gap so that the next pulse added is an on pulse
+    """
+    pulses = list(pulses)
+    gap_ticks = IR_SIGNAL_TRAILER + round(delay * 1000000 / PULSE_TICK)
+    if len(pulses) % 2 == 0:
+        # Already ends in a gap
+        pulses[-1] += gap_ticks
+    else:
+        pulses.append(gap_ticks)
+    if pulses[-1] > MAX_PULSE_TICKS:
+        return None
+    return pulses
+
+
+def batch_ir_packets(packets: list[tuple[bytes, float]]) -> list[tuple[bytes, float]]:
+    """Concatenates a sequence of packets to be sent where possible so fewer
+    need to be sent to the device
+
+    Packets are only combined when they are both IR packets without any
+    repeats, the delay between them fits within a single gap and the result
+    isn't too long for the device. Each packet's trailer is kept as part of
+    the gap that follows it.
+
+    Args:
+        packets (list[tuple[bytes, float]]): Packets to send and the delay
+                        to leave after each (seconds)
+
+    Returns:
+        list[tuple[bytes, float]]: Packets to send and the delay to leave
+                                   after each (seconds)
+    """
+    batches: list[tuple[bytes, float]] = []
+
+    # Packet currently being built (the original is kept so it can be sent
+    # unchanged if nothing is added to it)
+    current_packet: Optional[bytes] = None
+    current_pulses: Optional[list[int]] = None
+    current_delay = 0.0
+
+    def finish_current():
+        if current_pulses is None:
+            return
+        if current_packet is not None:
+            batches.append((current_packet, current_delay))
+        else:
+            # Always fits as checked when combining
+            pulses = _extend_gap(current_pulses, 0)
+            packet = encode_ir_packet(IRPacket(repeat=0, pulses=pulses))
+            batches.append((packet, current_delay))
+
+    for packet, delay in packets:
+        pulses = _get_pulses(packet)
+        if pulses is None:
+            finish_current()
+            current_pulses = None
+            batches.append((packet, delay))
+            continue
+
+        if current_pulses is not None:
+            extended = _extend_gap(current_pulses, current_delay)
+            combined = extended + pulses if extended is not None else None
+            ended = _extend_gap(combined, 0) if combined is not None else None
+            if (
+                ended is not None
+                and len(_encode_pulses(ended)) <= MAX_PULSE_DATA_LENGTH
+            ):
+                current_packet = None
+                current_pulses = combined
+                current_delay = delay
+                continue
+            finish_current()
+
+        current_packet = packet
+        current_pulses = pulses
+        current_delay = delay
+
+    finish_current()
+    return batches
+
+
+def encode_stored_packet(
+    packet: bytes, storage_format: PacketStorageFormat = DEFAULT_PACKET_STORAGE_FORMAT
+) -> tuple[bytes, PacketStorageFormat]:
+    """Encodes a packet to be stored in the database
+
+    Recorded packets contain many repeated pulse lengths so compress well,
+    but if compressing doesn't make a packet any smaller it is stored raw
+
+    Returns:
+        tuple[bytes, PacketStorageFormat]: Encoded packet and the format it
+                                           was encoded in
+    """
+    if storage_format == PacketStorageFormat.ZLIB:
+        data = zlib.compress(packet, zlib.Z_BEST_COMPRESSION)
+        if len(data) < len(packet):
+            return data, PacketStorageFormat.ZLIB
+    return packet, PacketStorageFormat.RAW
+
+
+def decode_stored_packet(data: bytes, storage_format: int) -> bytes:
+    """Decodes a packet stored in the database
+
+    Raises:
+        ValueError: If the format is unknown or the data can't be decoded
+    """
+    if storage_format == PacketStorageFormat.RAW:
+        return data
+    if storage_format == PacketStorageFormat.ZLIB:
+        try:
+            return zlib.decompress(data)
+        except zlib.error as err:
+            raise ValueError("Malformed stored packet") from err
+    raise ValueError(f"Unknown packet storage format '{storage_format}'")
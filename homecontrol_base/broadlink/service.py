@@ -1,5 +1,14 @@
+import time
+from uuid import UUID
+
 from homecontrol_base.broadlink.device import BroadlinkDevice
+from homecontrol_base.broadlink.exceptions import ActionNotFoundError
 from homecontrol_base.broadlink.manager import BroadlinkManager
+from homecontrol_base.broadlink.packet import batch_ir_packets
+from homecontrol_base.broadlink.structs import (
+    BroadlinkMacroPlayback,
+    BroadlinkMacroStep,
+)
 from homecontrol_base.database.homecontrol_base import models
 from homecontrol_base.database.homecontrol_base.database import (
     HomeControlBaseDatabaseConnection,
@@ -7,6 +16,20 @@ from homecontrol_base.database.homecontrol_base.database import (
 from homecontrol_base.service.core import BaseService
 
 
+def _normalise_action_id(action_id: str) -> str:
+    """Returns an action id in the canonical form actions are indexed by
+
+    Raises:
+        ActionNotFoundError: If the id isn't valid
+    """
+    try:
+        return str(UUID(action_id))
+    except ValueError as err:
+        raise ActionNotFoundError(
+            f"Broadlink action with id '{action_id}' was not found"
+        ) from err
+
+
 class BroadlinkService(BaseService[HomeControlBaseDatabaseConnection]):
     """Service for handling Broadlink devices"""
 
@@ -100,8 +123,73 @@ class BroadlinkService(BaseService[HomeControlBaseDatabaseConnection]):
         # Save to database
         action = models.BroadlinkActionInDB(name=name, packet=packet)
         action = self.db_conn.broadlink_actions.create(action)
+        self._broadlink_manager.packet_cache.add(action)
         return action
 
+    async def record_action_async(
+        self, device_id: str, name: str
+    ) -> models.BroadlinkActionInDB:
+        """Records an action from a Broadlink device without blocking the
+        event loop and saves it to the database
+
+        Args:
+            device_id (str): ID of the device to record the action on
+            name (str): Name to label the action
+
+        Raises:
+            DeviceNotFoundError: If the device isn't found
+            IncompatibleDeviceError: If the device is incompatible
+            RecordTimeout: If the record times out
+        """
+        # Obtain from device
+        packet = await self.get_device(device_id).record_ir_packet_async()
+
+        # Save to database
+        action = models.BroadlinkActionInDB(name=name, packet=packet)
+        action = self.db_conn.broadlink_actions.create(action)
+        self._broadlink_manager.packet_cache.add(action)
+        return action
+
+    def _get_packet(self, action_id: str) -> bytes:
+        """Returns the packet of an action, looking it up in the database if
+        it isn't cached
+
+        Raises:
+            ActionNotFoundError: If the action isn't found
+        """
+        action_id = _normalise_action_id(action_id)
+        packet_cache = self._broadlink_manager.packet_cache
+        packet = packet_cache.get(action_id)
+        if packet is None:
+            action = self.db_conn.broadlink_actions.get(action_id)
+            packet_cache.add(action)
+            packet = action.packet
+        return packet
+
+    def _get_packets(self, action_ids: list[str]) -> dict[str, bytes]:
+        """Returns the packets of several actions indexed by their ids,
+        looking up any that aren't cached in a single query
+
+        Raises:
+            ActionNotFoundError: If any of the actions aren't found
+        """
+        packet_cache = self._broadlink_manager.packet_cache
+        packets = {}
+        missing_ids = []
+        for action_id in action_ids:
+            packet = packet_cache.get(action_id)
+            if packet is None:
+                missing_ids.append(action_id)
+            else:
+                packets[action_id] = packet
+        if missing_ids:
+            for action_id, action in self.db_conn.broadlink_actions.get_many(
+                missing_ids
+            ).items():
+                packet_cache.add(action)
+                packets[action_id] = action.packet
+        return packets
+
     def play_action(self, device_id: str, action_id: str):
         """Plays an action on a Broadlink device
 
@@ -114,7 +202,117 @@ class BroadlinkService(BaseService[HomeControlBaseDatabaseConnection]):
             IncompatibleDeviceError: If the device is incompatible
             ActionNotFoundError: If the action isn't found
         """
-        # Obtain the action
-        action = self.db_conn.broadlink_actions.get(action_id)
+        # Obtain the action's packet
+        packet = self._get_packet(action_id)
+        # Playback
+        self.get_device(device_id).send_ir_packet(packet)
+
+    def play_action_by_name(self, device_id: str, action_name: str):
+        """Plays an action on a Broadlink device given the action's name
+
+        Args:
+            device_id (str): ID of the device to playback the action on
+            action_name (str): Name of the action to playback
+
+        Raises:
+            DeviceNotFoundError: If the device isn't found
+            IncompatibleDeviceError: If the device is incompatible
+            ActionNotFoundError: If the action isn't found
+        """
+        packet_cache = self._broadlink_manager.packet_cache
+        # Obtain the action's packet
+        packet = packet_cache.get_by_name(action_name)
+        if packet is None:
+            action = self.db_conn.broadlink_actions.get_by_name(action_name)
+            packet_cache.add(action)
+            packet = action.packet
         # Playback
-        self.get_device(device_id).send_ir_packet(action.packet)
+        self.get_device(device_id).send_ir_packet(packet)
+
+    def delete_action(self, action_id: str) -> None:
+        """Deletes an action
+
+        Args:
+            action_id (str): ID of the action to delete
+
+        Raises:
+            ActionNotFoundError: If the action isn't found
+        """
+        self.db_conn.broadlink_actions.delete(action_id)
+        self._broadlink_manager.packet_cache.invalidate(action_id)
+
+    def create_macro(
+        self, name: str, steps: list[BroadlinkMacroStep]
+    ) -> models.BroadlinkMacroInDB:
+        """Saves a macro (sequence of actions) to the database
+
+        Args:
+            name (str): Name to label the macro
+            steps (list[BroadlinkMacroStep]): Actions to play in order and
+                            the time to wait after each
+
+        Raises:
+            ActionNotFoundError: If any of the actions aren't found
+        """
+        # Ensure all of the actions exist
+        action_ids = [_normalise_action_id(step.action_id) for step in steps]
+        self.db_conn.broadlink_actions.get_many(action_ids)
+
+        macro = models.BroadlinkMacroInDB(
+            name=name,
+            steps=[
+                {"action_id": action_id, "delay": step.delay}
+                for action_id, step in zip(action_ids, steps)
+            ],
+        )
+        return self.db_conn.broadlink_macros.create(macro)
+
+    def delete_macro(self, macro_id: str) -> None:
+        """Deletes a macro
+
+        Args:
+            macro_id (str): ID of the macro to delete
+
+        Raises:
+            MacroNotFoundError: If the macro isn't found
+        """
+        self.db_conn.broadlink_macros.delete(macro_id)
+
+    def play_macro(self, device_id: str, macro_id: str) -> BroadlinkMacroPlayback:
+        """Plays every action in a macro on a Broadlink device
+
+        Any actions that aren't cached are looked up at once and IR packets are
+        concatenated where possible so fewer need to be sent
+
+        Args:
+            device_id (str): ID of the device to playback the macro on
+            macro_id (str): ID of the macro to playback
+
+        Raises:
+            DeviceNotFoundError: If the device isn't found
+            IncompatibleDeviceError: If the device is incompatible
+            MacroNotFoundError: If the macro isn't found
+            ActionNotFoundError: If any of the actions aren't found
+        """
+        start_time = time.perf_counter()
+
+        # Obtain the actions
+        macro = self.db_conn.broadlink_macros.get(macro_id)
+        steps = [BroadlinkMacroStep(**step) for step in macro.steps]
+        action_ids = [_normalise_action_id(step.action_id) for step in steps]
+        action_packets = self._get_packets(action_ids)
+
+        # Playback
+        packets = batch_ir_packets(
+            [
+                (action_packets[action_id], step.delay)
+                for action_id, step in zip(action_ids, steps)
+            ]
+        )
+        self.get_device(device_id).send_ir_packets(packets)
+
+        return BroadlinkMacroPlayback(
+            steps=len(steps),
+            packets_sent=len(packets),
+            time_taken=time.perf_counter() - start_time,
+        )
@@ -1,6 +1,59 @@
+from typing import Optional
+
 from pydantic.dataclasses import dataclass
 
 
 @dataclass
 class BroadlinkDeviceDiscoverInfo:
     ip_address: str
+
+
+@dataclass
+class BroadlinkDeviceInitialiseResult:
+    """Stores the outcome of initialising a Broadlink device"""
+
+    name: str
+    success: bool
+    # Time taken to initialise (or fail to initialise) the device (seconds)
+    time_taken: float
+    error: Optional[str] = None
+
+
+@dataclass
+class BroadlinkInitialiseReport:
+    """Stores the outcome of initialising every Broadlink device"""
+
+    # Indexed by device id
+    devices: dict[str, BroadlinkDeviceInitialiseResult]
+
+    @property
+    def failed(self) -> dict[str, BroadlinkDeviceInitialiseResult]:
+        """Returns the results of the devices that failed to initialise"""
+        return {
+            device_id: result
+            for device_id, result in self.devices.items()
+            if not result.success
+        }
+
+
+@dataclass
+class BroadlinkMacroStep:
+    """A step of a macro"""
+
+    action_id: str
+    # Time to wait after playing the action before the next step (seconds)
+    delay: float = 0
+
+
+@dataclass
+class BroadlinkMacroPlayback:
+    """Stores the outcome of playing a macro"""
+
+    # Number of steps in the macro
+    steps: int
+    # Number of packets sent to the device (fewer than steps when packets
+    # were concatenated)
+    packets_sent: int
+    # Time taken from looking up the macro until the last packet was sent
+    # (seconds)
+    time_taken: float
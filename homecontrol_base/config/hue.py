@@ -11,6 +11,21 @@ class HueConfigData:
 
     ca_cert: Path
     mDNS_discovery: bool  # Doesn't work on WSL for some reason (probably firewall related)
+    # Whether to keep an in-memory copy of each bridge's resources up to date
+    # using its event stream
+    resource_cache: bool = False
+    # Maximum number of connections kept open to each bridge
+    session_pool_size: int = 10
+    # Time after which an idle session to a bridge is replaced (seconds)
+    session_keep_alive: float = 60
+    # Maximum number of asynchronous requests in flight to each bridge
+    max_concurrent_requests: int = 10
+    # Whether to queue put requests to each bridge so they are sent at a rate
+    # the bridge can handle (only applies to synchronous connections)
+    command_scheduler: bool = False
+    # Maximum time a put request waits in the command scheduler's queue
+    # before it is abandoned (seconds)
+    command_timeout: float = 5
 
 
 class HueConfig(BaseConfig[HueConfigData]):
@@ -26,3 +41,27 @@ class HueConfig(BaseConfig[HueConfigData]):
     @property
     def mDNS_discovery(self) -> bool:
         return self._data.mDNS_discovery
+
+    @property
+    def resource_cache(self) -> bool:
+        return self._data.resource_cache
+
+    @property
+    def session_pool_size(self) -> int:
+        return self._data.session_pool_size
+
+    @property
+    def session_keep_alive(self) -> float:
+        return self._data.session_keep_alive
+
+    @property
+    def max_concurrent_requests(self) -> int:
+        return self._data.max_concurrent_requests
+
+    @property
+    def command_scheduler(self) -> bool:
+        return self._data.command_scheduler
+
+    @property
+    def command_timeout(self) -> float:
+        return self._data.command_timeout
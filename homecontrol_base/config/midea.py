@@ -1,3 +1,5 @@
+from typing import Optional
+
 from homecontrol_base.config.base import BaseConfig
 
 from pydantic.dataclasses import dataclass
@@ -16,6 +18,48 @@ class MideaConfigData:
     """Midea account info for discovery"""
 
     account: MideaAccount
+    # Maximum number of devices initialised at the same time
+    max_concurrent_initialisations: int = 4
+    # Time after which initialising a device is abandoned (seconds)
+    initialise_timeout: float = 20
+    # Time after which refreshing the state of a device is abandoned when
+    # getting the state of every device (seconds)
+    state_timeout: float = 10
+    # Time a device's state is reused for before it is refreshed again, and
+    # for which commands matching it are skipped rather than sent (seconds,
+    # 0 to always refresh and send every command)
+    state_cache_ttl: float = 2
+    # Whether to poll the state of every loaded device in the background
+    state_poller: bool = False
+    # Time between polls of a device whose state hasn't changed recently
+    # (seconds)
+    poll_interval: float = 60
+    # Time between polls of a device whose state has recently changed or
+    # been assigned (seconds)
+    fast_poll_interval: float = 5
+    # Time after a change for which a device is polled at fast_poll_interval
+    # (seconds)
+    fast_poll_period: float = 60
+    # Maximum number of attempts made to communicate with a device before
+    # giving up
+    retry_max_attempts: int = 3
+    # Delay before retrying after the first failed attempt, doubling after
+    # every further failure (seconds)
+    retry_initial_delay: float = 0.5
+    # Maximum delay between attempts (seconds)
+    retry_max_delay: float = 5
+    # Maximum total time to spend on all attempts (seconds)
+    retry_deadline: Optional[float] = 15
+    # Maximum number of addresses probed at once when searching a network
+    discovery_max_concurrent: int = 32
+    # Maximum total time to spend searching a network (seconds)
+    discovery_deadline: float = 30
+    # Number of consecutive failed operations after which calls to a device
+    # fail immediately
+    circuit_breaker_threshold: int = 3
+    # Time calls to a device fail immediately for before it is tried again
+    # (seconds)
+    circuit_breaker_timeout: float = 30
 
 
 class MideaConfig(BaseConfig[MideaConfigData]):
@@ -27,3 +71,67 @@ class MideaConfig(BaseConfig[MideaConfigData]):
     @property
     def account(self) -> MideaAccount:
         return self._data.account
+
+    @property
+    def max_concurrent_initialisations(self) -> int:
+        return self._data.max_concurrent_initialisations
+
+    @property
+    def initialise_timeout(self) -> float:
+        return self._data.initialise_timeout
+
+    @property
+    def state_timeout(self) -> float:
+        return self._data.state_timeout
+
+    @property
+    def state_cache_ttl(self) -> float:
+        return self._data.state_cache_ttl
+
+    @property
+    def state_poller(self) -> bool:
+        return self._data.state_poller
+
+    @property
+    def poll_interval(self) -> float:
+        return self._data.poll_interval
+
+    @property
+    def fast_poll_interval(self) -> float:
+        return self._data.fast_poll_interval
+
+    @property
+    def fast_poll_period(self) -> float:
+        return self._data.fast_poll_period
+
+    @property
+    def retry_max_attempts(self) -> int:
+        return self._data.retry_max_attempts
+
+    @property
+    def retry_initial_delay(self) -> float:
+        return self._data.retry_initial_delay
+
+    @property
+    def retry_max_delay(self) -> float:
+        return self._data.retry_max_delay
+
+    @property
+    def retry_deadline(self) -> Optional[float]:
+        return self._data.retry_deadline
+
+    @property
+    def discovery_max_concurrent(self) -> int:
+        return self._data.discovery_max_concurrent
+
+    @property
+    def discovery_deadline(self) -> float:
+        return self._data.discovery_deadline
+
+    @property
+    def circuit_breaker_threshold(self) -> int:
+        return self._data.circuit_breaker_threshold
+
+    @property
+    def circuit_breaker_timeout(self) -> float:
+        return self._data.circuit_breaker_timeout
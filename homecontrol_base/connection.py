@@ -1,8 +1,10 @@
 from typing import Generic, TypeVar
 
+import httpx
 from requests import Session
 
 TSession = TypeVar("TSession", bound=Session)
+TAsyncSession = TypeVar("TAsyncSession", bound=httpx.AsyncClient)
 
 
 class BaseConnection(Generic[TSession]):
@@ -12,3 +14,12 @@ class BaseConnection(Generic[TSession]):
 
     def __init__(self, session: Session) -> None:
         self._session = session
+
+
+class AsyncBaseConnection(Generic[TAsyncSession]):
+    """Handles an asynchronous session object"""
+
+    _session: TAsyncSession
+
+    def __init__(self, session: httpx.AsyncClient) -> None:
+        self._session = session
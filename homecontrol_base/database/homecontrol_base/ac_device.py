@@ -71,6 +71,31 @@ class ACDevicesDBConnection(DatabaseConnection):
         """Returns a list of information about all air conditioning devices"""
         return self._session.query(ACDeviceInfoInDB).all()
 
+    def update_credentials(self, device_id: str, token: str, key: str):
+        """Assigns the token and key of an ACDeviceInfoInDB given the air
+        conditioning unit's device id
+
+        Args:
+            device_id (str): The ID of the air conditioning unit
+            token (str): New token
+            key (str): New key
+
+        Raises:
+            DeviceNotFoundError: If the device isn't found
+        """
+        rows_updated = (
+            self._session.query(ACDeviceInfoInDB)
+            .filter(ACDeviceInfoInDB.id == UUID(device_id))
+            .update({ACDeviceInfoInDB.token: token, ACDeviceInfoInDB.key: key})
+        )
+
+        if rows_updated == 0:
+            raise DeviceNotFoundError(
+                f"Air conditioning unit with id '{device_id}' was not found"
+            )
+
+        self._session.commit()
+
     def delete(self, device_id: str):
         """Deletes an ACDeviceInfoInDB given the air conditioning unit's device id
 
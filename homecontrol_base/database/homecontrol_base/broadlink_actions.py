@@ -67,6 +67,34 @@ class BroadlinkActionsDBConnection(DatabaseConnection):
             )
         return device_info
 
+    def get_many(self, action_ids: list[str]) -> dict[str, BroadlinkActionInDB]:
+        """Returns several BroadlinkActionInDB's given their ids using a single
+        query
+
+        Args:
+            action_ids (list[str]): The IDs of the actions
+
+        Returns:
+            dict[str, BroadlinkActionInDB]: Info about each action indexed by
+                                            its id (in canonical form)
+
+        Raises:
+            ActionNotFoundError: If any of the actions aren't found
+        """
+        ids = set(UUID(action_id) for action_id in action_ids)
+        actions = {
+            str(action.id): action
+            for action in self._session.query(BroadlinkActionInDB)
+            .filter(BroadlinkActionInDB.id.in_(ids))
+            .all()
+        }
+        for action_id in action_ids:
+            if str(UUID(action_id)) not in actions:
+                raise ActionNotFoundError(
+                    f"Broadlink action with id '{action_id}' was not found"
+                )
+        return actions
+
     def get_all(self) -> list[BroadlinkActionInDB]:
         """Returns a list of information about all Broadlink actions"""
         return self._session.query(BroadlinkActionInDB).all()
@@ -0,0 +1,94 @@
+from uuid import UUID
+
+from homecontrol_base import session
+from homecontrol_base.broadlink.exceptions import MacroNotFoundError
+from homecontrol_base.database.core import DatabaseConnection
+from homecontrol_base.database.homecontrol_base.models import BroadlinkMacroInDB
+
+
+class BroadlinkMacrosDBConnection(DatabaseConnection):
+    """Handles BroadlinkMacroInDB's in the database"""
+
+    def __init__(self, session: session):
+        super().__init__(session)
+
+    def create(self, macro: BroadlinkMacroInDB) -> BroadlinkMacroInDB:
+        """Adds a BroadlinkMacroInDB to the database"""
+        self._session.add(macro)
+        self._session.commit()
+        self._session.refresh(macro)
+        return macro
+
+    def get(self, macro_id: str) -> BroadlinkMacroInDB:
+        """Returns BroadlinkMacroInDB given a macro's id
+
+        Args:
+            macro_id (str): The ID of the macro
+
+        Returns:
+            BroadlinkMacroInDB: Info about the macro
+
+        Raises:
+            MacroNotFoundError: If the macro isn't found
+        """
+
+        macro = (
+            self._session.query(BroadlinkMacroInDB)
+            .filter(BroadlinkMacroInDB.id == UUID(macro_id))
+            .first()
+        )
+        if not macro:
+            raise MacroNotFoundError(
+                f"Broadlink macro with id '{macro_id}' was not found"
+            )
+        return macro
+
+    def get_by_name(self, macro_name: str) -> BroadlinkMacroInDB:
+        """Returns BroadlinkMacroInDB given the macro's name
+
+        Args:
+            macro_name (str): The name of the macro
+
+        Returns:
+            BroadlinkMacroInDB: Info about the macro
+
+        Raises:
+            MacroNotFoundError: If the macro isn't found
+        """
+
+        macro = (
+            self._session.query(BroadlinkMacroInDB)
+            .filter(BroadlinkMacroInDB.name == macro_name)
+            .first()
+        )
+        if not macro:
+            raise MacroNotFoundError(
+                f"Broadlink macro with name '{macro_name}' was not found"
+            )
+        return macro
+
+    def get_all(self) -> list[BroadlinkMacroInDB]:
+        """Returns a list of information about all Broadlink macros"""
+        return self._session.query(BroadlinkMacroInDB).all()
+
+    def delete(self, macro_id: str):
+        """Deletes a BroadlinkMacroInDB given the macro's id
+
+        Args:
+            macro_id (str): The ID of the Broadlink macro
+
+        Raises:
+            MacroNotFoundError: If the macro isn't found
+        """
+        rows_deleted = (
+            self._session.query(BroadlinkMacroInDB)
+            .filter(BroadlinkMacroInDB.id == UUID(macro_id))
+            .delete()
+        )
+
+        if rows_deleted == 0:
+            raise MacroNotFoundError(
+                f"Broadlink macro with id '{macro_id}' was not found"
+            )
+
+        self._session.commit()
@@ -11,6 +11,9 @@ from homecontrol_base.database.homecontrol_base.broadlink_actions import (
 from homecontrol_base.database.homecontrol_base.broadlink_devices import (
     BroadlinkDevicesDBConnection,
 )
+from homecontrol_base.database.homecontrol_base.broadlink_macros import (
+    BroadlinkMacrosDBConnection,
+)
 from homecontrol_base.database.homecontrol_base.hue_bridges import (
     HueBridgesDBConnection,
 )
@@ -24,6 +27,7 @@ class HomeControlBaseDatabaseConnection(DatabaseConnection):
     _hue_bridges: Optional[HueBridgesDBConnection] = None
     _broadlink_devices: Optional[BroadlinkDevicesDBConnection] = None
     _broadlink_actions: Optional[BroadlinkActionsDBConnection] = None
+    _broadlink_macros: Optional[BroadlinkMacrosDBConnection] = None
 
     def __init__(self, session: Session):
         super().__init__(session)
@@ -52,6 +56,12 @@ class HomeControlBaseDatabaseConnection(DatabaseConnection):
             self._broadlink_actions = BroadlinkActionsDBConnection(self._session)
         return self._broadlink_actions
 
+    @property
+    def broadlink_macros(self) -> BroadlinkMacrosDBConnection:
+        if not self._broadlink_macros:
+            self._broadlink_macros = BroadlinkMacrosDBConnection(self._session)
+        return self._broadlink_macros
+
 
 class HomeControlBaseDatabase(Database[HomeControlBaseDatabaseConnection]):
     """Database for storing information handled by homecontrol-base"""
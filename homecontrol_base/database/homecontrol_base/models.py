@@ -1,8 +1,15 @@
 import uuid
+from typing import Optional
 
-from sqlalchemy import BigInteger, Column, Integer, LargeBinary, String, Uuid
+from sqlalchemy import JSON, BigInteger, Column, Integer, LargeBinary, String, Uuid
 from sqlalchemy.orm import declarative_base
 
+from homecontrol_base.broadlink.packet import (
+    PacketStorageFormat,
+    decode_stored_packet,
+    encode_stored_packet,
+)
+
 Base = declarative_base()
 
 
@@ -42,4 +49,38 @@ class BroadlinkActionInDB(Base):
 
     id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, unique=True, index=True)
-    packet = Column(LargeBinary)
+    # Packet as stored (see PacketStorageFormat) - use packet to access it
+    stored_packet = Column("packet", LargeBinary)
+    packet_format = Column(
+        Integer, nullable=False, default=PacketStorageFormat.RAW, server_default="0"
+    )
+
+    @property
+    def packet(self) -> Optional[bytes]:
+        """Returns the (decoded) packet"""
+        if self.stored_packet is None:
+            return None
+        return decode_stored_packet(
+            self.stored_packet,
+            self.packet_format
+            if self.packet_format is not None
+            else PacketStorageFormat.RAW,
+        )
+
+    @packet.setter
+    def packet(self, packet: Optional[bytes]):
+        """Assigns the packet (encoded to be stored)"""
+        if packet is None:
+            self.stored_packet = None
+            self.packet_format = PacketStorageFormat.RAW
+        else:
+            self.stored_packet, self.packet_format = encode_stored_packet(packet)
+
+
+class BroadlinkMacroInDB(Base):
+    __tablename__ = "broadlink_macros"
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String, unique=True, index=True)
+    # List of steps each of the form {"action_id": str, "delay": float}
+    steps = Column(JSON)
@@ -0,0 +1,61 @@
+from dataclasses import is_dataclass
+from functools import lru_cache
+from typing import Any, Generic, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+T = TypeVar("T")
+
+# Headers for requests whose body has already been serialized to JSON
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class HueResponse(BaseModel, Generic[T]):
+    """Body of a response from the Hue API (errors are checked separately)"""
+
+    data: T
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(resource_type: Any) -> TypeAdapter:
+    """Returns a TypeAdapter for a type
+
+    Building the validator for the larger schema types is expensive, so each
+    adapter is only built once and then reused
+    """
+    return TypeAdapter(resource_type)
+
+
+def parse_response_data(content: bytes, resource_type: Type[T]) -> T:
+    """Parses the data of a response from the Hue API directly from its raw
+    content (avoids constructing python objects for the JSON first)
+
+    Args:
+        content (bytes): Raw content of the response
+        resource_type (Type[T]): Type to parse the data to using pydantic
+    """
+    return get_type_adapter(HueResponse[resource_type]).validate_json(content).data
+
+
+def get_resource_adapter(resource: Any) -> TypeAdapter:
+    """Returns the TypeAdapter for a resource (dataclass) being sent to the
+    Hue API
+
+    Raises:
+        TypeError: If the resource type is invalid
+    """
+    if not is_dataclass(resource) or isinstance(resource, type):
+        raise TypeError("Invalid resource type, should be a dataclass")
+    return get_type_adapter(type(resource))
+
+
+def serialize_resource(resource: Any) -> bytes:
+    """Converts a resource (dataclass) directly into the JSON body of a
+    request using its cached serializer
+
+    All values of None will be ignored
+
+    Raises:
+        TypeError: If the resource type is invalid
+    """
+    return get_resource_adapter(resource).dump_json(resource, exclude_none=True)
@@ -0,0 +1,231 @@
+from typing import Type, TypeVar
+
+import httpx
+
+from homecontrol_base.connection import AsyncBaseConnection
+from homecontrol_base.hue.api.adapters import (
+    JSON_HEADERS,
+    get_type_adapter,
+    parse_response_data,
+    serialize_resource,
+)
+from homecontrol_base.hue.api.exceptions import check_async_response_for_error
+from homecontrol_base.hue.api.schema import (
+    DeviceGet,
+    GroupedLightGet,
+    GroupedLightPut,
+    LightGet,
+    LightPut,
+    ResourceIdentifierDelete,
+    ResourceIdentifierPost,
+    ResourceIdentifierPut,
+    RoomGet,
+    RoomPost,
+    RoomPut,
+    SceneGet,
+    ScenePost,
+    ScenePut,
+)
+from homecontrol_base.hue.session import AsyncHueBridgeSession
+
+T = TypeVar("T")
+
+
+class AsyncHueBridgeAPIConnection(AsyncBaseConnection[AsyncHueBridgeSession]):
+    """Asynchronous equivalent of HueBridgeAPIConnection"""
+
+    _parse_raw_json: bool
+
+    def __init__(
+        self, session: AsyncHueBridgeSession, parse_raw_json: bool = True
+    ) -> None:
+        """Constructor
+
+        Args:
+            session (AsyncHueBridgeSession): Session to use
+            parse_raw_json (bool): Whether to parse responses directly from
+                            their raw content (faster) rather than via
+                            response.json()
+        """
+        super().__init__(session)
+
+        self._parse_raw_json = parse_raw_json
+
+    def _parse_response_data(
+        self, response: httpx.Response, resource_type: Type[T]
+    ) -> T:
+        """Returns the parsed data of a response
+
+        Args:
+            response (httpx.Response): Response to parse
+            resource_type (Type[T]): Type to parse to using pydantic
+        """
+        if self._parse_raw_json:
+            return parse_response_data(response.content, resource_type)
+        return get_type_adapter(resource_type).validate_python(response.json()["data"])
+
+    async def _get_resource(self, endpoint: str, resource_type: Type[T]) -> T:
+        """Returns parsed data from a get request to an endpoint
+
+        Args:
+            endpoint (str): Endpoint to call
+            resource_type (Type[T]): Type to parse to using pydantic
+
+        Raises:
+            httpx.HTTPStatusError: When there is an error in the response
+        """
+        response = await self._session.get(url=endpoint)
+        check_async_response_for_error(response)
+        return self._parse_response_data(response, resource_type)
+
+    async def _put_resource(self, endpoint: str, resource: T) -> ResourceIdentifierPut:
+        """Put request of a resource to an endpoint
+
+        Args:
+            endpoint (str): Endpoint to call
+            resource (T): Resource to put (Should be a dataclass that will be
+                          converted)
+
+        Raises:
+            TypeError: If the resource type is invalid
+            httpx.HTTPStatusError: When there is an error in the response
+        """
+        response = await self._session.put(
+            url=endpoint, content=serialize_resource(resource), headers=JSON_HEADERS
+        )
+        check_async_response_for_error(response)
+        return self._parse_response_data(response, list[ResourceIdentifierPut])[0]
+
+    async def _post_resource(
+        self, endpoint: str, resource: T
+    ) -> ResourceIdentifierPost:
+        """Post request of a resource to an endpoint
+
+        Args:
+            endpoint (str): Endpoint to call
+            resource (T): Resource to put (Should be a dataclass that will be
+                          converted)
+
+        Raises:
+            TypeError: If the resource type is invalid
+            httpx.HTTPStatusError: When there is an error in the response
+        """
+        response = await self._session.post(
+            url=endpoint, content=serialize_resource(resource), headers=JSON_HEADERS
+        )
+        check_async_response_for_error(response)
+        return self._parse_response_data(response, list[ResourceIdentifierPost])[0]
+
+    async def _delete_resource(self, endpoint: str) -> ResourceIdentifierDelete:
+        """Delete request of a resource to an endpoint
+
+        Args:
+            endpoint (str): Endpoint to call
+
+        Raises:
+            httpx.HTTPStatusError: When there is an error in the response
+        """
+        response = await self._session.delete(url=endpoint)
+        check_async_response_for_error(response)
+        return self._parse_response_data(response, list[ResourceIdentifierDelete])[0]
+
+    # -------------------------------- Resources --------------------------------
+
+    async def get_resources(self) -> list[dict]:
+        """Returns the data of every resource on the bridge in a single request
+
+        Left unparsed as this includes many resource types that are not
+        described in the schema (use HueBridgeSnapshot to parse)
+
+        Raises:
+            httpx.HTTPStatusError: When there is an error in the response
+        """
+        response = await self._session.get(url="/clip/v2/resource")
+        check_async_response_for_error(response)
+        return response.json()["data"]
+
+    # -------------------------------- Lights --------------------------------
+
+    async def get_lights(self) -> list[LightGet]:
+        return await self._get_resource("/clip/v2/resource/light", list[LightGet])
+
+    async def get_light(self, light_id: str) -> LightGet:
+        return (
+            await self._get_resource(
+                f"/clip/v2/resource/light/{light_id}", list[LightGet]
+            )
+        )[0]
+
+    async def put_light(self, light_id: str, data: LightPut) -> ResourceIdentifierPut:
+        return await self._put_resource(f"/clip/v2/resource/light/{light_id}", data)
+
+    # -------------------------------- Scenes --------------------------------
+
+    async def get_scenes(self) -> list[SceneGet]:
+        return await self._get_resource("/clip/v2/resource/scene", list[SceneGet])
+
+    async def get_scene(self, scene_id: str) -> SceneGet:
+        return (
+            await self._get_resource(
+                f"/clip/v2/resource/scene/{scene_id}", list[SceneGet]
+            )
+        )[0]
+
+    async def put_scene(self, scene_id: str, data: ScenePut) -> ResourceIdentifierPut:
+        return await self._put_resource(f"/clip/v2/resource/scene/{scene_id}", data)
+
+    async def post_scene(self, data: ScenePost) -> ResourceIdentifierPost:
+        return await self._post_resource("/clip/v2/resource/scene", data)
+
+    async def delete_scene(self, scene_id: str) -> ResourceIdentifierDelete:
+        return await self._delete_resource(f"/clip/v2/resource/scene/{scene_id}")
+
+    # -------------------------------- Rooms --------------------------------
+    async def get_rooms(self) -> list[RoomGet]:
+        return await self._get_resource("/clip/v2/resource/room", list[RoomGet])
+
+    async def get_room(self, room_id: str) -> RoomGet:
+        return (
+            await self._get_resource(f"/clip/v2/resource/room/{room_id}", list[RoomGet])
+        )[0]
+
+    async def put_room(self, room_id: str, data: RoomPut) -> ResourceIdentifierPut:
+        return await self._put_resource(f"/clip/v2/resource/room/{room_id}", data)
+
+    async def post_room(self, data: RoomPost) -> ResourceIdentifierPost:
+        return await self._post_resource("/clip/v2/resource/room", data)
+
+    async def delete_room(self, room_id: str) -> ResourceIdentifierDelete:
+        return await self._delete_resource(f"/clip/v2/resource/room/{room_id}")
+
+    # -------------------------------- GroupedLights --------------------------------
+    async def get_grouped_lights(self) -> list[GroupedLightGet]:
+        return await self._get_resource(
+            "/clip/v2/resource/grouped_light", list[GroupedLightGet]
+        )
+
+    async def get_grouped_light(self, grouped_light_id: str) -> GroupedLightGet:
+        return (
+            await self._get_resource(
+                f"/clip/v2/resource/grouped_light/{grouped_light_id}",
+                list[GroupedLightGet],
+            )
+        )[0]
+
+    async def put_grouped_light(
+        self, grouped_light_id: str, data: GroupedLightPut
+    ) -> ResourceIdentifierPut:
+        return await self._put_resource(
+            f"/clip/v2/resource/grouped_light/{grouped_light_id}", data
+        )
+
+    # -------------------------------- Devices --------------------------------
+    async def get_devices(self) -> list[DeviceGet]:
+        return await self._get_resource("/clip/v2/resource/device", list[DeviceGet])
+
+    async def get_device(self, device_id: str) -> DeviceGet:
+        return (
+            await self._get_resource(
+                f"/clip/v2/resource/device/{device_id}", list[DeviceGet]
+            )
+        )[0]
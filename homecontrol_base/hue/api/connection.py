@@ -1,11 +1,18 @@
-from dataclasses import asdict, is_dataclass
-from typing import Type, TypeVar
+from typing import Any, Iterable, Optional, Type, TypeVar
 
-from pydantic import TypeAdapter
+from requests import Response
 
 from homecontrol_base.connection import BaseConnection
 from homecontrol_base.database.homecontrol_base import models
+from homecontrol_base.hue.api.adapters import (
+    JSON_HEADERS,
+    get_resource_adapter,
+    get_type_adapter,
+    parse_response_data,
+    serialize_resource,
+)
 from homecontrol_base.hue.api.exceptions import check_response_for_error
+from homecontrol_base.hue.api.projection import parse_projected_data
 from homecontrol_base.hue.api.schema import (
     DeviceGet,
     GroupedLightGet,
@@ -23,15 +30,43 @@ from homecontrol_base.hue.api.schema import (
     ScenePut,
 )
 from homecontrol_base.hue.exceptions import HueBridgeButtonNotPressedError
+from homecontrol_base.hue.scheduler import HueCommandPriority, HueCommandScheduler
 from homecontrol_base.hue.session import HueBridgeSession
 
 T = TypeVar("T")
 
 
 class HueBridgeAPIConnection(BaseConnection[HueBridgeSession]):
-    def __init__(self, session: HueBridgeSession) -> None:
+    _scheduler: Optional[HueCommandScheduler]
+    _priority: HueCommandPriority
+    _parse_raw_json: bool
+
+    def __init__(
+        self,
+        session: HueBridgeSession,
+        scheduler: Optional[HueCommandScheduler] = None,
+        priority: HueCommandPriority = HueCommandPriority.INTERACTIVE,
+        parse_raw_json: bool = True,
+    ) -> None:
+        """Constructor
+
+        Args:
+            session (HueBridgeSession): Session to use
+            scheduler (Optional[HueCommandScheduler]): Scheduler to queue put
+                            requests with (if not given they are sent
+                            immediately)
+            priority (HueCommandPriority): Priority of any put requests queued
+                            with the scheduler
+            parse_raw_json (bool): Whether to parse responses directly from
+                            their raw content (faster) rather than via
+                            response.json()
+        """
         super().__init__(session)
 
+        self._scheduler = scheduler
+        self._priority = priority
+        self._parse_raw_json = parse_raw_json
+
     def authenticate(self, name: str) -> models.HueBridgeInDB:
         """Requests a new application key from a bridge
 
@@ -82,6 +117,17 @@ class HueBridgeAPIConnection(BaseConnection[HueBridgeSession]):
             f"'{discover_info.internalipaddress}', Response: {response_json}"
         )
 
+    def _parse_response_data(self, response: Response, resource_type: Type[T]) -> T:
+        """Returns the parsed data of a response
+
+        Args:
+            response (Response): Response to parse
+            resource_type (Type[T]): Type to parse to using pydantic
+        """
+        if self._parse_raw_json:
+            return parse_response_data(response.content, resource_type)
+        return get_type_adapter(resource_type).validate_python(response.json()["data"])
+
     def _get_resource(self, endpoint: str, resource_type: Type[T]) -> T:
         """Returns parsed data from a get request to an endpoint
 
@@ -94,33 +140,46 @@ class HueBridgeAPIConnection(BaseConnection[HueBridgeSession]):
         """
         response = self._session.get(url=endpoint)
         check_response_for_error(response)
-        return TypeAdapter(resource_type).validate_python(response.json()["data"])
-
-    def _convert_resource_to_dict(self, resource: T) -> dict:
-        """Converts a resource (dataclass) into a dictionary
+        return self._parse_response_data(response, resource_type)
 
-        All values of None will be ignored
+    def _get_projected_resource(
+        self, endpoint: str, resource_type: Type, fields: Iterable[str]
+    ) -> list[Any]:
+        """Returns records holding only the given fields of each resource
+        from a get request to an endpoint
 
         Args:
-            resource (T): Resource to convert
+            endpoint (str): Endpoint to call
+            resource_type (Type): Resource type the endpoint returns
+            fields (Iterable[str]): Names of the fields to include
 
-        Returns:
-            dict: Dictionary of data
+        Raises:
+            ValueError: If any of the fields don't exist in the resource type
+            HTTPError: When there is an error in the response
+        """
+        response = self._session.get(url=endpoint)
+        check_response_for_error(response)
+        return parse_projected_data(response.content, resource_type, fields)
+
+    def _put_data(self, endpoint: str, data: dict) -> ResourceIdentifierPut:
+        """Put request of data to an endpoint (sent immediately)
+
+        Args:
+            endpoint (str): Endpoint to call
+            data (dict): Data to put
 
         Raises:
-            TypeError: If the resource type is invalid
+            HTTPError: When there is an error in the response
         """
-        if is_dataclass(resource):
-            # Convert data
-            return asdict(
-                resource, dict_factory=lambda x: {k: v for (k, v) in x if v is not None}
-            )
-        else:
-            raise TypeError("Invalid resource type, should be a dataclass")
+        response = self._session.put(url=endpoint, json=data)
+        check_response_for_error(response)
+        return self._parse_response_data(response, list[ResourceIdentifierPut])[0]
 
     def _put_resource(self, endpoint: str, resource: T) -> ResourceIdentifierPut:
         """Put request of a resource to an endpoint
 
+        Will wait in the scheduler's queue first if one was given
+
         Args:
             endpoint (str): Endpoint to call
             resource (T): Resource to put (Should be a dataclass that will be
@@ -129,16 +188,20 @@ class HueBridgeAPIConnection(BaseConnection[HueBridgeSession]):
         Raises:
             TypeError: If the resource type is invalid
             HTTPError: When there is an error in the response
+            TimeoutError: If the request isn't sent by the scheduler in time
         """
-
+        if self._scheduler is not None:
+            # Scheduler merges queued requests so needs the data as a dict
+            # (without any values of None)
+            data = get_resource_adapter(resource).dump_python(
+                resource, mode="json", exclude_none=True
+            )
+            return self._scheduler.put(endpoint, data, self._priority)
         response = self._session.put(
-            url=endpoint,
-            json=self._convert_resource_to_dict(resource),
+            url=endpoint, data=serialize_resource(resource), headers=JSON_HEADERS
         )
         check_response_for_error(response)
-        return TypeAdapter(list[ResourceIdentifierPut]).validate_python(
-            response.json()["data"]
-        )[0]
+        return self._parse_response_data(response, list[ResourceIdentifierPut])[0]
 
     def _post_resource(self, endpoint: str, resource: T) -> ResourceIdentifierPost:
         """Post request of a resource to an endpoint
@@ -153,13 +216,10 @@ class HueBridgeAPIConnection(BaseConnection[HueBridgeSession]):
             HTTPError: When there is an error in the response
         """
         response = self._session.post(
-            url=endpoint,
-            json=self._convert_resource_to_dict(resource),
+            url=endpoint, data=serialize_resource(resource), headers=JSON_HEADERS
         )
         check_response_for_error(response)
-        return TypeAdapter(list[ResourceIdentifierPost]).validate_python(
-            response.json()["data"]
-        )[0]
+        return self._parse_response_data(response, list[ResourceIdentifierPost])[0]
 
     def _delete_resource(self, endpoint: str) -> ResourceIdentifierDelete:
         """Delete request of a resource to an endpoint
@@ -172,15 +232,45 @@ class HueBridgeAPIConnection(BaseConnection[HueBridgeSession]):
         """
         response = self._session.delete(url=endpoint)
         check_response_for_error(response)
-        return TypeAdapter(list[ResourceIdentifierDelete]).validate_python(
-            response.json()["data"]
-        )[0]
+        return self._parse_response_data(response, list[ResourceIdentifierDelete])[0]
+
+    # -------------------------------- Resources --------------------------------
+
+    def get_resources(self) -> list[dict]:
+        """Returns the data of every resource on the bridge in a single request
+
+        Left unparsed as this includes many resource types that are not
+        described in the schema (use HueBridgeSnapshot to parse)
+
+        Raises:
+            HTTPError: When there is an error in the response
+        """
+        response = self._session.get(url="/clip/v2/resource")
+        check_response_for_error(response)
+        return response.json()["data"]
 
     # -------------------------------- Lights --------------------------------
 
     def get_lights(self) -> list[LightGet]:
         return self._get_resource("/clip/v2/resource/light", list[LightGet])
 
+    def get_lights_projected(self, fields: Iterable[str]) -> list[Any]:
+        """Returns lightweight records of all lights holding only the given
+        fields of LightGet (and the id)
+
+        Avoids validating the other fields when only a few are needed e.g.
+        on, dimming, color_temperature and color
+
+        Args:
+            fields (Iterable[str]): Names of the LightGet fields to include
+
+        Raises:
+            ValueError: If any of the fields don't exist in LightGet
+        """
+        return self._get_projected_resource(
+            "/clip/v2/resource/light", LightGet, fields
+        )
+
     def get_light(self, light_id: str) -> LightGet:
         return self._get_resource(
             f"/clip/v2/resource/light/{light_id}", list[LightGet]
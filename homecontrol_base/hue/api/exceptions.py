@@ -1,7 +1,18 @@
+from typing import Optional
+
+import httpx
 from requests import HTTPError, Response
 from requests.exceptions import JSONDecodeError
 
 
+def _get_error_messages(json_data: dict) -> Optional[list[str]]:
+    """Returns the error messages given in the data of an error response
+    from the Hue API (if any)"""
+    if "errors" in json_data:
+        return [error["description"] for error in json_data["errors"]]
+    return None
+
+
 def check_response_for_error(response: Response):
     """Checks for an error and raises an appropriate HTTP exception if found
 
@@ -18,9 +29,7 @@ def check_response_for_error(response: Response):
         error_messages = None
 
         try:
-            json_data = response.json()
-            if "errors" in json_data:
-                error_messages = [error["description"] for error in json_data["errors"]]
+            error_messages = _get_error_messages(response.json())
         except JSONDecodeError:
             pass
 
@@ -28,7 +37,40 @@ def check_response_for_error(response: Response):
             raise HTTPError(
                 f"{response.status_code} error for url {response.url}"
                 f"Error messages:\n"
-                "\n".join(error_messages)
+                "\n".join(error_messages),
+                response=response,
+            )
+        else:
+            response.raise_for_status()
+
+
+def check_async_response_for_error(response: httpx.Response):
+    """Checks for an error and raises an appropriate HTTP exception if found
+    (for responses from an AsyncHueBridgeSession)
+
+    Attempts to add specific error information given from the Hue API
+
+    Args:
+        response (httpx.Response): Response to check for errors
+
+    Raises:
+        httpx.HTTPStatusError: When an error has occurred
+    """
+    if response.status_code >= 400:
+        # Found an error, try and get error messages
+        error_messages = None
+
+        try:
+            error_messages = _get_error_messages(response.json())
+        except ValueError:
+            pass
+
+        if error_messages:
+            raise httpx.HTTPStatusError(
+                f"{response.status_code} error for url {response.url}\n"
+                f"Error messages:\n" + "\n".join(error_messages),
+                request=response.request,
+                response=response,
             )
         else:
             response.raise_for_status()
@@ -0,0 +1,70 @@
+import dataclasses
+from functools import lru_cache
+from typing import Any, Iterable, Type, get_type_hints
+
+from homecontrol_base.hue.api.adapters import parse_response_data
+
+
+def _get_field_default(field: dataclasses.Field) -> dict:
+    """Returns the arguments to give dataclasses.field so that a field has
+    the same default as another"""
+    if field.default is not dataclasses.MISSING:
+        return {"default": field.default}
+    if field.default_factory is not dataclasses.MISSING:
+        return {"default_factory": field.default_factory}
+    return {}
+
+
+@lru_cache(maxsize=None)
+def get_record_type(resource_type: Type, fields: frozenset[str]) -> Type:
+    """Returns a lightweight dataclass holding the id and only the given
+    fields of a resource type
+
+    Args:
+        resource_type (Type): Resource type to project e.g. LightGet
+        fields (frozenset[str]): Names of the fields to include
+
+    Raises:
+        ValueError: If any of the fields don't exist in the resource type
+    """
+    type_hints = get_type_hints(resource_type)
+    invalid_fields = fields - type_hints.keys()
+    if invalid_fields:
+        raise ValueError(
+            f"Invalid fields for {resource_type.__name__}: {sorted(invalid_fields)}"
+        )
+
+    resource_fields = {field.name: field for field in dataclasses.fields(resource_type)}
+    # Fields without defaults have to come first
+    required_fields = [("id", str)]
+    optional_fields = []
+    for name in sorted(fields - {"id"}):
+        default = _get_field_default(resource_fields[name])
+        (optional_fields if default else required_fields).append(
+            (name, type_hints[name], dataclasses.field(**default))
+        )
+
+    return dataclasses.make_dataclass(
+        f"{resource_type.__name__}Record", required_fields + optional_fields
+    )
+
+
+def parse_projected_data(
+    content: bytes, resource_type: Type, fields: Iterable[str]
+) -> list[Any]:
+    """Parses the data of a response from the Hue API into records holding
+    only the given fields of each resource
+
+    Only the requested fields are validated, everything else is skipped over
+    while parsing the raw content
+
+    Args:
+        content (bytes): Raw content of the response
+        resource_type (Type): Resource type the data is for e.g. LightGet
+        fields (Iterable[str]): Names of the fields to include
+
+    Raises:
+        ValueError: If any of the fields don't exist in the resource type
+    """
+    record_type = get_record_type(resource_type, frozenset(fields))
+    return parse_response_data(content, list[record_type])
@@ -1,14 +1,28 @@
-from contextlib import contextmanager
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 
 from homecontrol_base.config.hue import HueConfig
 from homecontrol_base.database.homecontrol_base import models
+from homecontrol_base.hue.api.async_connection import AsyncHueBridgeAPIConnection
 from homecontrol_base.hue.api.connection import HueBridgeAPIConnection
+from homecontrol_base.hue.api.schema import ResourceIdentifierPut
+from homecontrol_base.hue.cache import HueResourceCache
 from homecontrol_base.hue.connection import HueBridgeConnection
 from homecontrol_base.hue.discovery import discover_hue_bridges
-from homecontrol_base.hue.session import HueBridgeSession
-from homecontrol_base.hue.structs import HueBridgeDiscoverInfo
+from homecontrol_base.hue.scheduler import (
+    HueCommandPriority,
+    HueCommandScheduler,
+    HueCommandSchedulerStats,
+)
+from homecontrol_base.hue.session import AsyncHueBridgeSession, HueBridgeSession
+from homecontrol_base.hue.snapshot import HueBridgeSnapshot
+from homecontrol_base.hue.structs import (
+    HueBridgeDiscoverInfo,
+    HueBridgeSessionMetrics,
+)
 
 
 class HueBridge:
@@ -16,6 +30,21 @@ class HueBridge:
 
     _bridge_info: models.HueBridgeInDB
     _hue_config: HueConfig
+    _resource_cache: Optional[HueResourceCache]
+    _command_scheduler: Optional[HueCommandScheduler]
+
+    # Kept alive and shared between calls to connect_api
+    _session: Optional[HueBridgeSession]
+    _session_lock: threading.Lock
+    _sessions_created: int
+    # Pool stats of sessions that have been closed
+    _closed_connections_opened: int
+    _closed_requests: int
+
+    # Kept alive between calls to connect_api_async, but can only be used by
+    # the event loop it was created in
+    _async_session: Optional[AsyncHueBridgeSession]
+    _async_session_loop: Optional[asyncio.AbstractEventLoop]
 
     def __init__(
         self, bridge_info: models.HueBridgeInDB, hue_config: HueConfig
@@ -28,18 +57,180 @@ class HueBridge:
         """
         self._bridge_info = bridge_info
         self._hue_config = hue_config
+        self._resource_cache = None
+        self._command_scheduler = (
+            HueCommandScheduler(
+                self._send_put, result_timeout=hue_config.command_timeout
+            )
+            if hue_config.command_scheduler
+            else None
+        )
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._sessions_created = 0
+        self._closed_connections_opened = 0
+        self._closed_requests = 0
+        self._async_session = None
+        self._async_session_loop = None
+
+    def _close_session(self):
+        """Closes the current session (should hold _session_lock)"""
+        connections_opened, requests = self._session.get_pool_stats()
+        self._closed_connections_opened += connections_opened
+        self._closed_requests += requests
+        self._session.close()
+        self._session = None
+
+    def _get_session(self) -> HueBridgeSession:
+        """Returns the shared session, replacing it first if it has been idle
+        for too long or its last request failed to connect"""
+        with self._session_lock:
+            if self._session is not None and (
+                not self._session.healthy
+                or self._session.idle_time > self._hue_config.session_keep_alive
+            ):
+                self._close_session()
+            if self._session is None:
+                self._session = HueBridgeSession(
+                    connection_info=self._bridge_info,
+                    ca_cert=self._hue_config.ca_cert,
+                    pool_size=self._hue_config.session_pool_size,
+                )
+                self._sessions_created += 1
+            return self._session
+
+    def _send_put(self, endpoint: str, data: dict) -> ResourceIdentifierPut:
+        """Sends a put request queued in the command scheduler"""
+        return HueBridgeAPIConnection(self._get_session())._put_data(endpoint, data)
 
     @contextmanager
-    def connect_api(self) -> Generator[HueBridgeAPIConnection, None, None]:
-        with HueBridgeSession(
-            connection_info=self._bridge_info, ca_cert=self._hue_config.ca_cert
-        ) as session:
-            yield HueBridgeAPIConnection(session)
+    def connect_api(
+        self, priority: HueCommandPriority = HueCommandPriority.INTERACTIVE
+    ) -> Generator[HueBridgeAPIConnection, None, None]:
+        """Connects to the bridge's API
+
+        The underlying session (and its pool of connections) is shared
+        between calls and threads
+
+        Args:
+            priority (HueCommandPriority): Priority of any put requests made
+                            (when the command scheduler is enabled)
+        """
+        yield HueBridgeAPIConnection(
+            self._get_session(), scheduler=self._command_scheduler, priority=priority
+        )
+
+    def close(self):
+        """Closes the session used by connect_api and stops the resource
+        cache and command scheduler (if started)"""
+        if self._command_scheduler is not None:
+            self._command_scheduler.stop()
+        with self._session_lock:
+            if self._session is not None:
+                self._close_session()
+        self.stop_resource_cache()
+
+    @property
+    def command_scheduler_stats(self) -> Optional[HueCommandSchedulerStats]:
+        """Returns statistics about the put requests queued by the command
+        scheduler (or None if disabled)"""
+        if self._command_scheduler is None:
+            return None
+        return self._command_scheduler.stats
+
+    @property
+    def session_metrics(self) -> HueBridgeSessionMetrics:
+        """Returns statistics about the sessions used by connect_api"""
+        with self._session_lock:
+            connections_opened, requests = (
+                self._session.get_pool_stats() if self._session else (0, 0)
+            )
+            return HueBridgeSessionMetrics(
+                sessions_created=self._sessions_created,
+                connections_opened=self._closed_connections_opened
+                + connections_opened,
+                requests=self._closed_requests + requests,
+            )
+
+    @asynccontextmanager
+    async def connect_api_async(
+        self,
+    ) -> AsyncGenerator[AsyncHueBridgeAPIConnection, None]:
+        """Connects to the bridge's API asynchronously
+
+        The underlying session (and its pool of connections) is reused
+        between calls made from the same event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_session is None or self._async_session_loop is not loop:
+            if self._async_session is not None:
+                # Created by a different event loop, which may have closed
+                try:
+                    await self._async_session.aclose()
+                except RuntimeError:
+                    pass
+            self._async_session = AsyncHueBridgeSession(
+                connection_info=self._bridge_info,
+                ca_cert=self._hue_config.ca_cert,
+                max_concurrent_requests=self._hue_config.max_concurrent_requests,
+            )
+            self._async_session_loop = loop
+        yield AsyncHueBridgeAPIConnection(self._async_session)
+
+    async def get_snapshot_async(self) -> HueBridgeSnapshot:
+        """Returns a snapshot of every resource on the bridge
+
+        Uses the resource cache when it is connected, otherwise obtains the
+        snapshot using a single request
+
+        Raises:
+            httpx.HTTPStatusError: When there is an error in the response
+        """
+        if self._resource_cache is not None and self._resource_cache.connected:
+            return self._resource_cache.get_snapshot()
+        async with self.connect_api_async() as api_connection:
+            return HueBridgeSnapshot.from_resource_data(
+                await api_connection.get_resources()
+            )
+
+    async def close_async(self):
+        """Closes the session used by connect_api_async (if open)"""
+        if self._async_session is not None:
+            await self._async_session.aclose()
+            self._async_session = None
+            self._async_session_loop = None
 
     @contextmanager
-    def connect(self) -> Generator[HueBridgeConnection, None, None]:
-        with self.connect_api() as api_connection:
-            yield HueBridgeConnection(api_connection)
+    def connect(
+        self, priority: HueCommandPriority = HueCommandPriority.INTERACTIVE
+    ) -> Generator[HueBridgeConnection, None, None]:
+        with self.connect_api(priority=priority) as api_connection:
+            yield HueBridgeConnection(api_connection, self._resource_cache)
+
+    def start_resource_cache(self) -> HueResourceCache:
+        """Starts keeping an in-memory copy of the bridge's resources up to
+        date using its event stream
+
+        Reads via connect() will then use the cache whenever the event stream
+        is connected
+        """
+        if self._resource_cache is None:
+            self._resource_cache = HueResourceCache(
+                connection_info=self._bridge_info, ca_cert=self._hue_config.ca_cert
+            )
+        self._resource_cache.start()
+        return self._resource_cache
+
+    def stop_resource_cache(self):
+        """Stops and removes the resource cache (if started)"""
+        if self._resource_cache is not None:
+            self._resource_cache.stop()
+            self._resource_cache = None
+
+    @property
+    def resource_cache(self) -> Optional[HueResourceCache]:
+        """Returns the resource cache if started"""
+        return self._resource_cache
 
     @property
     def info(self) -> models.HueBridgeInDB:
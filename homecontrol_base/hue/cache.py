@@ -0,0 +1,264 @@
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from requests import RequestException, Response
+
+from homecontrol_base.database.homecontrol_base import models
+from homecontrol_base.hue.api.connection import HueBridgeAPIConnection
+from homecontrol_base.hue.api.exceptions import check_response_for_error
+from homecontrol_base.hue.session import HueBridgeSession
+from homecontrol_base.hue.snapshot import HueBridgeSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+def _merge_resource_data(data: dict, update: dict):
+    """Recursively merges the (partial) data of an update event into existing
+    resource data"""
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(data.get(key), dict):
+            _merge_resource_data(data[key], value)
+        else:
+            data[key] = value
+
+
+class HueResourceCache:
+    """Keeps an in-memory copy of the resources on a Hue bridge
+
+    The resources are obtained once and then kept up to date by listening to
+    the bridge's event stream in a background thread. When the stream drops
+    a full resync is performed after reconnecting.
+    """
+
+    # Time to wait before reconnecting after the event stream drops (seconds)
+    RECONNECT_DELAY = 5
+
+    # Maximum time to wait for any data on the event stream before assuming
+    # the connection has died and resyncing (seconds)
+    STREAM_READ_TIMEOUT = 300
+
+    _connection_info: models.HueBridgeInDB
+    _ca_cert: Path
+
+    _lock: threading.Lock
+    _resources: dict[str, dict]
+    _snapshot: Optional[HueBridgeSnapshot]
+
+    _last_sync_time: Optional[float]
+    _last_event_time: Optional[float]
+    _last_error: Optional[Exception]
+    _connected: bool
+    _disconnected_time: Optional[float]
+
+    _thread: Optional[threading.Thread]
+    # Response of the event stream while connected (closed by stop so the
+    # thread doesn't have to wait for the next event)
+    _response: Optional[Response]
+    _stop_event: threading.Event
+    _synced_event: threading.Event
+
+    def __init__(self, connection_info: models.HueBridgeInDB, ca_cert: Path) -> None:
+        """Constructor
+
+        Args:
+            connection_info (models.HueBridgeInDB): Info for connecting to the
+                                                    bridge
+            ca_cert (Path): Path to the Hue bridge certificate required for a
+                            HTTPS connection
+        """
+        self._connection_info = connection_info
+        self._ca_cert = ca_cert
+
+        self._lock = threading.Lock()
+        self._resources = {}
+        self._snapshot = None
+
+        self._last_sync_time = None
+        self._last_event_time = None
+        self._last_error = None
+        self._connected = False
+        self._disconnected_time = None
+
+        self._thread = None
+        self._response = None
+        self._stop_event = threading.Event()
+        self._synced_event = threading.Event()
+
+    def start(self, timeout: Optional[float] = 0):
+        """Starts listening to the event stream in a background thread
+
+        Reads fall back to requesting from the bridge until the initial sync
+        completes, so by default this returns without waiting for it
+
+        Args:
+            timeout (Optional[float]): Maximum time to wait for the initial sync
+                            to complete (seconds, 0 to not wait and None to
+                            wait indefinitely)
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        if timeout != 0:
+            self.wait_until_synced(timeout)
+
+    def wait_until_synced(self, timeout: Optional[float] = None) -> bool:
+        """Waits for the initial sync to complete
+
+        Args:
+            timeout (Optional[float]): Maximum time to wait (seconds, None to
+                            wait indefinitely)
+
+        Returns:
+            bool: Whether the cache has been synced
+        """
+        return self._synced_event.wait(timeout)
+
+    def stop(self):
+        """Stops listening to the event stream"""
+        self._stop_event.set()
+        response = self._response
+        if response is not None:
+            # Interrupts the background thread's read
+            response.close()
+        if self._connected:
+            self._disconnected_time = time.time()
+        self._connected = False
+
+    def _sync(self, session: HueBridgeSession):
+        """Replaces all cached resources with those currently on the bridge"""
+        data = HueBridgeAPIConnection(session).get_resources()
+        with self._lock:
+            self._resources = {resource["id"]: resource for resource in data}
+            self._snapshot = None
+            self._last_sync_time = time.time()
+        self._synced_event.set()
+
+    def _handle_events(self, events: list[dict]):
+        """Applies a list of events received from the event stream"""
+        with self._lock:
+            for event in events:
+                for resource in event.get("data", []):
+                    resource_id = resource["id"]
+                    if event["type"] == "add":
+                        self._resources[resource_id] = resource
+                    elif event["type"] == "update":
+                        if resource_id in self._resources:
+                            _merge_resource_data(
+                                self._resources[resource_id], resource
+                            )
+                    elif event["type"] == "delete":
+                        self._resources.pop(resource_id, None)
+            self._snapshot = None
+            self._last_event_time = time.time()
+
+    def _listen(self):
+        """Connects to the event stream, resyncs and then applies events until
+        the stream drops or the cache is stopped"""
+        with HueBridgeSession(
+            connection_info=self._connection_info, ca_cert=self._ca_cert
+        ) as session:
+            with session.get(
+                url="/eventstream/clip/v2",
+                headers={"Accept": "text/event-stream"},
+                stream=True,
+                timeout=(10, HueResourceCache.STREAM_READ_TIMEOUT),
+            ) as response:
+                check_response_for_error(response)
+                self._response = response
+                # May have been stopped before the response was stored
+                if self._stop_event.is_set():
+                    return
+
+                # Sync only after the stream is open so no events are missed
+                self._sync(session)
+                self._connected = True
+
+                for line in response.iter_lines(decode_unicode=True):
+                    if self._stop_event.is_set():
+                        return
+                    if line and line.startswith("data:"):
+                        self._handle_events(json.loads(line[len("data:") :]))
+
+    def _run(self):
+        """Background thread that maintains the event stream connection"""
+        while not self._stop_event.is_set():
+            try:
+                self._listen()
+            except RequestException as err:
+                self._last_error = err
+            except Exception as err:
+                if self._stop_event.is_set():
+                    # Caused by stop() closing the response
+                    break
+                # Anything else (e.g. an unexpected event) shouldn't stop the
+                # cache from being kept up to date, so resync
+                logger.exception("Error in the Hue resource cache, resyncing")
+                self._last_error = err
+            finally:
+                self._response = None
+                if self._connected:
+                    self._disconnected_time = time.time()
+                self._connected = False
+            self._stop_event.wait(HueResourceCache.RECONNECT_DELAY)
+
+    def get_snapshot(self) -> HueBridgeSnapshot:
+        """Returns a snapshot of the cached resources
+
+        The snapshot is only reconstructed after the resources change
+
+        Raises:
+            RuntimeError: If the cache has never been synced
+        """
+        with self._lock:
+            if self._last_sync_time is None:
+                raise RuntimeError(
+                    "Cannot get a snapshot from the Hue resource cache as it has "
+                    "not been synced"
+                )
+            if self._snapshot is None:
+                self._snapshot = HueBridgeSnapshot.from_resource_data(
+                    list(self._resources.values())
+                )
+            return self._snapshot
+
+    @property
+    def connected(self) -> bool:
+        """Returns whether the event stream is currently connected (and
+        therefore whether the cached resources are up to date)"""
+        return self._connected
+
+    @property
+    def last_sync_time(self) -> Optional[float]:
+        """Returns the time of the last full resync (or None if never synced)"""
+        return self._last_sync_time
+
+    @property
+    def last_event_time(self) -> Optional[float]:
+        """Returns the time the last event was received (or None if no events
+        have been received)"""
+        return self._last_event_time
+
+    @property
+    def last_error(self) -> Optional[Exception]:
+        """Returns the last error that caused the event stream to drop"""
+        return self._last_error
+
+    @property
+    def staleness(self) -> Optional[float]:
+        """Returns the time since the cached resources were last known to be
+        up to date (seconds), 0 while the event stream is connected and None
+        if never synced"""
+        if self._connected:
+            return 0
+        if self._disconnected_time is not None:
+            return time.time() - self._disconnected_time
+        if self._last_sync_time is not None:
+            return time.time() - self._last_sync_time
+        return None
@@ -1,177 +1,133 @@
 from typing import Optional
 
 from homecontrol_base.connection import BaseConnection
-from homecontrol_base.hue.api.colour import HueColour
 from homecontrol_base.hue.api.connection import HueBridgeAPIConnection
-from homecontrol_base.hue.api.schema import (
-    ColorPut,
-    ColorTemperaturePut,
-    DimmingPut,
-    GroupedLightPut,
-    LightPut,
-    OnPut,
-    Recall,
-    RoomGet,
-    ScenePut,
-)
+from homecontrol_base.hue.api.schema import Recall, RoomGet, ScenePut
+from homecontrol_base.hue.cache import HueResourceCache
+from homecontrol_base.hue.planner import apply_room_write_plan, plan_room_state_update
 from homecontrol_base.hue.session import HueBridgeSession
-from homecontrol_base.hue.structs import (
-    HueRoom,
-    HueRoomGroupedLightState,
-    HueRoomLight,
-    HueRoomLightState,
-    HueRoomSceneState,
-    HueRoomState,
-    HueRoomStateUpdate,
-)
+from homecontrol_base.hue.snapshot import HueBridgeSnapshot, create_hue_room
+from homecontrol_base.hue.structs import HueRoom, HueRoomState, HueRoomStateUpdate
 
 
 class HueBridgeConnection(BaseConnection[HueBridgeSession]):
     _api_connection: HueBridgeAPIConnection
+    _resource_cache: Optional[HueResourceCache]
 
-    def __init__(self, api_connection: HueBridgeAPIConnection) -> None:
+    def __init__(
+        self,
+        api_connection: HueBridgeAPIConnection,
+        resource_cache: Optional[HueResourceCache] = None,
+    ) -> None:
         super().__init__(api_connection._session)
 
         self._api_connection = api_connection
+        self._resource_cache = resource_cache
 
     def _get_room(self, hue_room: RoomGet) -> HueRoom:
         """Constructs a HueRoom by performing the required requests to a Hue bridge"""
+        devices = {device.id: device for device in self._api_connection.get_devices()}
+        return create_hue_room(hue_room, devices)
 
-        # Attempt to find a grouped light service
-        grouped_light_id: Optional[str] = None
-        for service in hue_room.services:
-            if service.rtype == "grouped_light":
-                grouped_light_id = service.rid
-                break
-
-        # Locate all lights
-        lights: dict[str, HueRoomLight] = {}
-        for child in hue_room.children:
-            if child.rtype == "device":
-                device = self._api_connection.get_device(child.rid)
-                for service in device.services:
-                    if service.rtype == "light":
-                        lights[service.rid] = HueRoomLight(name=device.metadata.name)
-                        break
-
-        return HueRoom(
-            id=hue_room.id,
-            name=hue_room.metadata.name,
-            grouped_light_id=grouped_light_id,
-            lights=lights,
-        )
+    def get_snapshot(self, use_cache: bool = True) -> HueBridgeSnapshot:
+        """Returns a snapshot of every resource on the bridge
+
+        Args:
+            use_cache (bool): Whether to use the resource cache when it is
+                              connected, otherwise obtains the snapshot using
+                              a single request
+        """
+        if (
+            use_cache
+            and self._resource_cache is not None
+            and self._resource_cache.connected
+        ):
+            return self._resource_cache.get_snapshot()
+        return HueBridgeSnapshot.from_api_connection(self._api_connection)
 
     def get_rooms(self) -> list[HueRoom]:
         """Returns a list of HueRoom's"""
-        return [self._get_room(room) for room in self._api_connection.get_rooms()]
+        devices = {device.id: device for device in self._api_connection.get_devices()}
+        return [
+            create_hue_room(room, devices) for room in self._api_connection.get_rooms()
+        ]
 
     def get_room(self, room_id: str) -> HueRoom:
         """Returns a HueRoom with a given id"""
         return self._get_room(self._api_connection.get_room(room_id))
 
-    def get_room_state(self, room_id: str) -> HueRoomState:
-        """Returns the state of a HueRoom"""
-
-        # Obtain the room itself
-        hue_room = self._api_connection.get_room(room_id)
-        room = self._get_room(hue_room)
-
-        # Obtain the grouped light state
-        grouped_light_state = self._api_connection.get_grouped_light(
-            room.grouped_light_id
-        )
-
-        # Obtain the states of each light
-        light_states: dict[str, HueRoomLightState] = {}
-
-        for light_id, light in room.lights.items():
-            light_state = self._api_connection.get_light(light_id=light_id)
-
-            light_states[light_id] = HueRoomLightState(
-                name=light.name,
-                on=light_state.on.on,
-                brightness=light_state.dimming.brightness
-                if light_state.dimming is not None
-                else None,
-                colour_temperature=light_state.color_temperature.mirek
-                if light_state.color_temperature is not None
-                else None,
-                colour=HueColour.from_xy(light_state.color.xy)
-                if light_state.color is not None
-                else None,
-            )
+    def get_room_state(
+        self, room_id: str, snapshot: Optional[HueBridgeSnapshot] = None
+    ) -> HueRoomState:
+        """Returns the state of a HueRoom
+
+        Args:
+            room_id (str): ID of the HueRoom
+            snapshot (Optional[HueBridgeSnapshot]): Snapshot to obtain the
+                            state from. A new one will be obtained if not given.
+
+        Raises:
+            HueRoomNotFoundError: If the room isn't found
+        """
+        if snapshot is None:
+            snapshot = self.get_snapshot()
+        return snapshot.get_room_state(room_id)
+
+    def get_room_states(
+        self, snapshot: Optional[HueBridgeSnapshot] = None
+    ) -> dict[str, HueRoomState]:
+        """Returns the state of every HueRoom on the bridge indexed by their ids
 
-        # Locate all scenes
-        scenes: dict[str, HueRoomSceneState] = {}
-        for scene in self._api_connection.get_scenes():
-            if scene.group.rid == hue_room.id:
-                scenes[scene.id] = HueRoomSceneState(
-                    name=scene.metadata.name, status=scene.status.active
-                )
-
-        return HueRoomState(
-            grouped_light=HueRoomGroupedLightState(
-                on=grouped_light_state.on.on
-                if grouped_light_state.on is not None
-                else None,
-                brightness=grouped_light_state.dimming.brightness
-                if grouped_light_state.dimming is not None
-                else None
-                if grouped_light_state.dimming
-                else None,
-            ),
-            lights=light_states,
-            scenes=scenes,
-        )
+        Requires a constant number of requests regardless of the number of
+        rooms and lights
+
+        Args:
+            snapshot (Optional[HueBridgeSnapshot]): Snapshot to obtain the
+                            states from. A new one will be obtained if not given.
+        """
+        if snapshot is None:
+            snapshot = self.get_snapshot()
+        return snapshot.get_room_states()
 
     def set_room_state(
         self, room_id: str, update_data: HueRoomStateUpdate
     ) -> HueRoomState:
         """Updates the state of a HueRoom
 
+        Only values that differ from the current state are sent, and identical
+        updates to every light are sent as a single grouped light update
+
         Args:
             room_id (str): ID of the HueRoom to update
             update_data (HueRoomStateUpdate): Update data to assign
+
+        Returns:
+            HueRoomState: The state of the room after the update
+
+        Raises:
+            HueRoomNotFoundError: If the room isn't found
         """
 
-        # Obtain the room itself
-        room = self._get_room(self._api_connection.get_room(room_id))
-
-        # Check what needs updating and update them
-        if update_data.grouped_light is not None:
-            grouped_light_put = GroupedLightPut(
-                on=OnPut(on=update_data.grouped_light.on)
-                if update_data.grouped_light.on is not None
-                else None,
-                dimming=DimmingPut(brightness=update_data.grouped_light.brightness)
-                if update_data.grouped_light.brightness is not None
-                else None,
-            )
+        # Plan the requests required using the current state
+        snapshot = self.get_snapshot()
+        room = snapshot.get_room(room_id)
+        room_state = snapshot.get_room_state(room_id)
+        plan = plan_room_state_update(room, room_state, update_data)
+
+        grouped_light_put = plan.grouped_light_put
+        if grouped_light_put is not None:
             self._api_connection.put_grouped_light(
-                room.grouped_light_id, grouped_light_put
+                plan.grouped_light_id, grouped_light_put
             )
-        if update_data.lights is not None:
-            for light_id, light_update_data in update_data.lights.items():
-                light_put = LightPut(
-                    on=OnPut(on=light_update_data.on)
-                    if light_update_data.on is not None
-                    else None,
-                    dimming=DimmingPut(brightness=light_update_data.brightness)
-                    if light_update_data.brightness is not None
-                    else None,
-                    color_temperature=ColorTemperaturePut(
-                        mirek=light_update_data.colour_temperature
-                    )
-                    if light_update_data.colour_temperature is not None
-                    else None,
-                    color=ColorPut(xy=light_update_data.colour.to_xy())
-                    if light_update_data.colour is not None
-                    else None,
-                )
-                self._api_connection.put_light(light_id, light_put)
-        if update_data.scene is not None:
+        for light_id, light_put in plan.light_puts.items():
+            self._api_connection.put_light(light_id, light_put)
+        if plan.scene is not None:
             self._api_connection.put_scene(
-                update_data.scene, ScenePut(recall=Recall(action="active"))
+                plan.scene, ScenePut(recall=Recall(action="active"))
             )
 
-        return self.get_room_state(room_id)
+            # Effect of a scene isn't known so must be read back (the cache
+            # may not have received the events for it yet)
+            return self.get_room_state(room_id, self.get_snapshot(use_cache=False))
+
+        return apply_room_write_plan(room_state, plan)
@@ -1,10 +1,10 @@
 import asyncio
 
 import requests
-from pydantic import TypeAdapter
 from zeroconf import ServiceStateChange, Zeroconf
 from zeroconf.asyncio import AsyncServiceBrowser, AsyncServiceInfo, AsyncZeroconf
 
+from homecontrol_base.hue.api.adapters import get_type_adapter
 from homecontrol_base.hue.exceptions import HueBridgesDiscoveryError
 from homecontrol_base.hue.structs import HueBridgeDiscoverInfo
 
@@ -88,7 +88,7 @@ async def discover_hue_bridges(mDNS_discovery: bool) -> list[HueBridgeDiscoverIn
         if response.status_code == 429:
             raise HueBridgesDiscoveryError(response.reason)
         response.raise_for_status()
-        bridges = TypeAdapter(list[HueBridgeDiscoverInfo]).validate_python(
+        bridges = get_type_adapter(list[HueBridgeDiscoverInfo]).validate_python(
             response.json()
         )
         return bridges
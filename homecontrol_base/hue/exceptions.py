@@ -5,3 +5,7 @@ class HueBridgeButtonNotPressedError(Exception):
 
 class HueBridgesDiscoveryError(Exception):
     """Raised when the discovery of Hue bridges fails"""
+
+
+class HueRoomNotFoundError(Exception):
+    """Raised when a room isn't found on a Hue bridge"""
@@ -1,3 +1,5 @@
+import asyncio
+
 from homecontrol_base.config.hue import HueConfig
 from homecontrol_base.database.homecontrol_base import models
 from homecontrol_base.database.homecontrol_base.database import (
@@ -7,6 +9,7 @@ from homecontrol_base.database.homecontrol_base.database import (
     database as homecontrol_base_db,
 )
 from homecontrol_base.hue.bridge import HueBridge
+from homecontrol_base.hue.structs import HueBridgeState, HueHouseState
 
 
 class HueManager:
@@ -24,7 +27,9 @@ class HueManager:
     def _load_bridge(self, bridge_info: models.HueBridgeInDB) -> HueBridge:
         """Adds a bridge into _bridges"""
         bridge = HueBridge(bridge_info, self._hue_config)
-        self._bridges[bridge_info.id] = bridge
+        if self._hue_config.resource_cache:
+            bridge.start_resource_cache()
+        self._bridges[str(bridge_info.id)] = bridge
         return bridge
 
     def _load_all(self):
@@ -55,6 +60,39 @@ class HueManager:
             bridge = self._load_bridge(db_conn.hue_bridges.get(bridge_id))
         return bridge
 
+    async def _get_bridge_state(self, bridge: HueBridge) -> HueBridgeState:
+        """Returns the state of every room on a bridge"""
+        try:
+            snapshot = await bridge.get_snapshot_async()
+        except Exception as err:
+            return HueBridgeState(
+                name=bridge.info.name, rooms={}, room_states={}, error=str(err)
+            )
+        return HueBridgeState(
+            name=bridge.info.name,
+            rooms={room.id: room for room in snapshot.get_rooms()},
+            room_states=snapshot.get_room_states(),
+        )
+
+    async def get_house_state(self) -> HueHouseState:
+        """Returns the state of every room on every loaded bridge
+
+        All bridges are queried concurrently (with the number of requests in
+        flight to each bridge limited by max_concurrent_requests in the config)
+        so this takes as long as the slowest bridge. Bridges that can't be
+        reached are given with an error rather than failing the whole house.
+        """
+        bridges = list(self._bridges.items())
+        bridge_states = await asyncio.gather(
+            *[self._get_bridge_state(bridge) for _, bridge in bridges]
+        )
+        return HueHouseState(
+            bridges={
+                str(bridge_id): bridge_state
+                for (bridge_id, _), bridge_state in zip(bridges, bridge_states)
+            }
+        )
+
     def add_bridge(self, bridge_info: models.HueBridgeInDB) -> HueBridge:
         """Adds a Hue bridge
 
@@ -81,4 +119,5 @@ class HueManager:
             conn.hue_bridges.delete(bridge_id)
         # Remove from manager if already loaded
         if bridge_id in self._bridges:
+            self._bridges[bridge_id].close()
             del self._bridges[bridge_id]
@@ -0,0 +1,328 @@
+import copy
+import math
+from dataclasses import dataclass, field
+from typing import Optional
+
+from homecontrol_base.hue.api.colour import HueColour
+from homecontrol_base.hue.api.schema import (
+    ColorPut,
+    ColorTemperaturePut,
+    DimmingPut,
+    GroupedLightPut,
+    LightPut,
+    OnPut,
+)
+from homecontrol_base.hue.structs import (
+    HueRoom,
+    HueRoomLightState,
+    HueRoomLightStateUpdate,
+    HueRoomState,
+    HueRoomStateUpdate,
+)
+
+# Differences in brightness (%) smaller than this are treated as no change
+# (the bridge only stores brightness in steps of ~0.4%)
+BRIGHTNESS_TOLERANCE = 0.5
+
+# Differences in xy colour coordinates smaller than this are treated as no
+# change
+COLOUR_TOLERANCE = 0.005
+
+
+@dataclass
+class HueRoomWritePlan:
+    """Stores the requests required to apply a HueRoomStateUpdate"""
+
+    grouped_light_id: Optional[str] = None
+    grouped_light_update: Optional[HueRoomLightStateUpdate] = None
+    light_updates: dict[str, HueRoomLightStateUpdate] = field(default_factory=dict)
+    scene: Optional[str] = None
+
+    @property
+    def grouped_light_put(self) -> Optional[GroupedLightPut]:
+        """Returns the put request for the grouped light (if required)"""
+        if self.grouped_light_update is None:
+            return None
+        update = self.grouped_light_update
+        return GroupedLightPut(
+            on=OnPut(on=update.on) if update.on is not None else None,
+            dimming=DimmingPut(brightness=update.brightness)
+            if update.brightness is not None
+            else None,
+            color_temperature=ColorTemperaturePut(mirek=update.colour_temperature)
+            if update.colour_temperature is not None
+            else None,
+            color=ColorPut(xy=update.colour.to_xy())
+            if update.colour is not None
+            else None,
+        )
+
+    @property
+    def light_puts(self) -> dict[str, LightPut]:
+        """Returns the put requests for each light indexed by their ids"""
+        return {
+            light_id: LightPut(
+                on=OnPut(on=update.on) if update.on is not None else None,
+                dimming=DimmingPut(brightness=update.brightness)
+                if update.brightness is not None
+                else None,
+                color_temperature=ColorTemperaturePut(
+                    mirek=update.colour_temperature
+                )
+                if update.colour_temperature is not None
+                else None,
+                color=ColorPut(xy=update.colour.to_xy())
+                if update.colour is not None
+                else None,
+            )
+            for light_id, update in self.light_updates.items()
+        }
+
+    @property
+    def request_count(self) -> int:
+        """Returns the number of requests required to carry out this plan"""
+        return (
+            (self.grouped_light_update is not None)
+            + len(self.light_updates)
+            + (self.scene is not None)
+        )
+
+
+def _is_empty(update: HueRoomLightStateUpdate) -> bool:
+    """Returns whether an update doesn't change anything"""
+    return (
+        update.on is None
+        and update.brightness is None
+        and update.colour_temperature is None
+        and update.colour is None
+    )
+
+
+def _merge_updates(
+    update: HueRoomLightStateUpdate, override: HueRoomLightStateUpdate
+) -> HueRoomLightStateUpdate:
+    """Returns an update with the values of override taking precedence"""
+    return HueRoomLightStateUpdate(
+        on=override.on if override.on is not None else update.on,
+        brightness=override.brightness
+        if override.brightness is not None
+        else update.brightness,
+        colour_temperature=override.colour_temperature
+        if override.colour_temperature is not None
+        else update.colour_temperature,
+        colour=override.colour if override.colour is not None else update.colour,
+    )
+
+
+def _colours_match(a: Optional[HueColour], b: Optional[HueColour]) -> bool:
+    """Returns whether two colours are (approximately) the same"""
+    if a is None or b is None:
+        return a is b
+    a_xy = a.to_xy()
+    b_xy = b.to_xy()
+    return math.isclose(a_xy.x, b_xy.x, abs_tol=COLOUR_TOLERANCE) and math.isclose(
+        a_xy.y, b_xy.y, abs_tol=COLOUR_TOLERANCE
+    )
+
+
+def _is_colour_mode(state: HueRoomLightState) -> bool:
+    """Returns whether a light is showing its colour (rather than a colour
+    temperature)
+
+    The bridge reports an xy colour in either mode but only reports a colour
+    temperature when in colour temperature mode
+    """
+    return state.colour is not None and state.colour_temperature is None
+
+
+def _diff_light(
+    state: HueRoomLightState, update: HueRoomLightStateUpdate
+) -> HueRoomLightStateUpdate:
+    """Returns an update containing only the values that differ from a
+    light's current state
+
+    A colour is only treated as unchanged when the light is already in colour
+    mode, as otherwise assigning it switches the light out of colour
+    temperature mode
+    """
+    return HueRoomLightStateUpdate(
+        on=update.on if update.on is not None and update.on != state.on else None,
+        brightness=update.brightness
+        if update.brightness is not None
+        and (
+            state.brightness is None
+            or not math.isclose(
+                update.brightness, state.brightness, abs_tol=BRIGHTNESS_TOLERANCE
+            )
+        )
+        else None,
+        colour_temperature=update.colour_temperature
+        if update.colour_temperature is not None
+        and update.colour_temperature != state.colour_temperature
+        else None,
+        colour=update.colour
+        if update.colour is not None
+        and (
+            not _is_colour_mode(state)
+            or not _colours_match(update.colour, state.colour)
+        )
+        else None,
+    )
+
+
+def _diff_grouped_light(
+    light_states: list[HueRoomLightState], update: HueRoomLightStateUpdate
+) -> HueRoomLightStateUpdate:
+    """Returns an update for a grouped light containing only the values that
+    differ for at least one of the lights in the group"""
+    if not light_states:
+        # Nothing to compare against
+        return update
+    diffs = [_diff_light(light_state, update) for light_state in light_states]
+    return HueRoomLightStateUpdate(
+        on=update.on if any(diff.on is not None for diff in diffs) else None,
+        brightness=update.brightness
+        if any(diff.brightness is not None for diff in diffs)
+        else None,
+        colour_temperature=update.colour_temperature
+        if any(diff.colour_temperature is not None for diff in diffs)
+        else None,
+        colour=update.colour
+        if any(diff.colour is not None for diff in diffs)
+        else None,
+    )
+
+
+def plan_room_state_update(
+    room: HueRoom, state: HueRoomState, update_data: HueRoomStateUpdate
+) -> HueRoomWritePlan:
+    """Plans the requests required to apply an update to a room
+
+    Values that already match the current state are dropped, and identical
+    updates to every light in the room are collapsed into a single grouped
+    light update
+
+    Args:
+        room (HueRoom): Room to update
+        state (HueRoomState): Current state of the room
+        update_data (HueRoomStateUpdate): Update data to assign
+    """
+    plan = HueRoomWritePlan(grouped_light_id=room.grouped_light_id)
+
+    grouped_light_update: Optional[HueRoomLightStateUpdate] = None
+    if update_data.grouped_light is not None:
+        grouped_light_update = HueRoomLightStateUpdate(
+            on=update_data.grouped_light.on,
+            brightness=update_data.grouped_light.brightness,
+        )
+
+    light_updates = dict(update_data.lights) if update_data.lights else {}
+
+    # Collapse identical updates for every light into the grouped light (any
+    # light updates were previously applied after the grouped light so take
+    # precedence)
+    if (
+        room.grouped_light_id is not None
+        and room.lights
+        and set(light_updates.keys()) == set(room.lights.keys())
+    ):
+        updates = list(light_updates.values())
+        if all(update == updates[0] for update in updates[1:]):
+            grouped_light_update = (
+                _merge_updates(grouped_light_update, updates[0])
+                if grouped_light_update is not None
+                else updates[0]
+            )
+            light_updates = {}
+
+    # Drop anything that wouldn't change
+    if grouped_light_update is not None and room.grouped_light_id is not None:
+        grouped_light_update = _diff_grouped_light(
+            list(state.lights.values()), grouped_light_update
+        )
+        if not _is_empty(grouped_light_update):
+            plan.grouped_light_update = grouped_light_update
+
+    for light_id, light_update in light_updates.items():
+        light_state = state.lights.get(light_id)
+        if light_state is not None:
+            # Compare against the state after the grouped light update
+            if plan.grouped_light_update is not None:
+                light_state = _apply_light_update(
+                    light_state, plan.grouped_light_update
+                )
+            light_update = _diff_light(light_state, light_update)
+        if not _is_empty(light_update):
+            plan.light_updates[light_id] = light_update
+
+    plan.scene = update_data.scene
+    return plan
+
+
+def _apply_light_update(
+    state: HueRoomLightState, update: HueRoomLightStateUpdate
+) -> HueRoomLightState:
+    """Returns the expected state of a light after an update
+
+    Values the light doesn't support (e.g. brightness for a plug) are left
+    unchanged
+    """
+    state = copy.copy(state)
+    if update.on is not None:
+        state.on = update.on
+    if update.brightness is not None and state.brightness is not None:
+        state.brightness = update.brightness
+    if update.colour_temperature is not None and (
+        state.colour_temperature is not None or state.colour is not None
+    ):
+        state.colour_temperature = update.colour_temperature
+    if update.colour is not None and state.colour is not None:
+        state.colour = update.colour
+        # The bridge stops reporting a colour temperature when given a colour
+        state.colour_temperature = None
+    return state
+
+
+def apply_room_write_plan(
+    state: HueRoomState, plan: HueRoomWritePlan
+) -> HueRoomState:
+    """Returns the expected state of a room after a plan has been carried out
+
+    Should not be used when the plan recalls a scene as its effect isn't known
+
+    Args:
+        state (HueRoomState): State of the room before the plan was carried out
+        plan (HueRoomWritePlan): Plan that was carried out
+    """
+    state = copy.deepcopy(state)
+
+    if plan.grouped_light_update is not None:
+        for light_id, light_state in state.lights.items():
+            state.lights[light_id] = _apply_light_update(
+                light_state, plan.grouped_light_update
+            )
+        if plan.grouped_light_update.brightness is not None:
+            state.grouped_light.brightness = plan.grouped_light_update.brightness
+    for light_id, light_update in plan.light_updates.items():
+        if light_id in state.lights:
+            state.lights[light_id] = _apply_light_update(
+                state.lights[light_id], light_update
+            )
+
+    # Grouped light is on when any of its lights are and its brightness is
+    # the average of those that are on (so also changes with updates to
+    # individual lights)
+    if state.lights:
+        state.grouped_light.on = any(light.on for light in state.lights.values())
+        brightnesses = [
+            light.brightness
+            for light in state.lights.values()
+            if light.on and light.brightness is not None
+        ]
+        if brightnesses:
+            state.grouped_light.brightness = sum(brightnesses) / len(brightnesses)
+    elif plan.grouped_light_update is not None and (
+        plan.grouped_light_update.on is not None
+    ):
+        state.grouped_light.on = plan.grouped_light_update.on
+    return state
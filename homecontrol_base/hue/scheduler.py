@@ -0,0 +1,370 @@
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Optional
+
+from requests import HTTPError
+
+from homecontrol_base.hue.api.schema import ResourceIdentifierPut
+
+
+class HueCommandPriority(IntEnum):
+    """Priority of a command sent through a HueCommandScheduler (lower values
+    are sent first)"""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+# Keys of put data that can't be given together, when merging queued
+# requests the later key replaces any that conflict with it
+_CONFLICTING_KEYS = {
+    "color": ("color_temperature", "color_temperature_delta"),
+    "color_temperature": ("color", "color_temperature_delta"),
+    "color_temperature_delta": ("color", "color_temperature"),
+    "dimming": ("dimming_delta",),
+    "dimming_delta": ("dimming",),
+}
+
+
+def _merge_data(data: dict, update: dict):
+    """Merges put data into the data of a queued request (latest values
+    win, including over any conflicting keys)"""
+    for key, value in update.items():
+        for conflicting_key in _CONFLICTING_KEYS.get(key, ()):
+            data.pop(conflicting_key, None)
+        if isinstance(value, dict) and isinstance(data.get(key), dict):
+            _merge_data(data[key], value)
+        else:
+            data[key] = value
+
+
+def _set_result(future: Future, result: Any):
+    """Completes a future unless it has already been cancelled"""
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future: Future, exception: BaseException):
+    """Fails a future unless it has already been cancelled"""
+    if not future.done():
+        future.set_exception(exception)
+
+
+@dataclass
+class HueCommandSchedulerStats:
+    """Stores statistics about the commands sent by a HueCommandScheduler"""
+
+    queue_depth: int
+    commands_sent: int
+    commands_merged: int
+    commands_retried: int
+    average_wait_time: float
+    max_wait_time: float
+
+
+class _TokenBucket:
+    """Token bucket for limiting the rate commands are sent at"""
+
+    _rate: float
+    _capacity: float
+    _tokens: float
+    _last_time: float
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Constructor
+
+        Args:
+            rate (float): Number of tokens added per second
+            capacity (float): Maximum number of tokens that can be stored
+                              (i.e. the maximum burst size)
+        """
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._last_time = time.monotonic()
+
+    def _refill(self, now: float):
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._last_time) * self._rate
+        )
+        self._last_time = now
+
+    def get_wait_time(self, now: float) -> float:
+        """Returns the time until a token is available (seconds)"""
+        self._refill(now)
+        return max(0, (1 - self._tokens) / self._rate)
+
+    def consume(self, now: float):
+        """Consumes a token (should only be called when one is available)"""
+        self._refill(now)
+        self._tokens -= 1
+
+
+@dataclass
+class _QueuedCommand:
+    """A put request waiting to be sent"""
+
+    endpoint: str
+    rtype: str
+    data: dict
+    priority: HueCommandPriority
+    enqueued_time: float
+    futures: list[Future] = field(default_factory=list)
+
+
+class HueCommandScheduler:
+    """Queues put requests to a Hue bridge and sends them at a rate the bridge
+    can handle
+
+    Queued requests to the same resource are merged (with the values of the
+    latest request taking precedence) and interactive requests are sent
+    before background ones
+    """
+
+    # Rates the bridge can handle before throttling (requests per second)
+    RATES = {"light": 10, "grouped_light": 1}
+    DEFAULT_RATE = 10
+
+    # Number of times to retry a request the bridge rejects as being busy
+    MAX_RETRIES = 3
+
+    # Time to wait before retrying a request the bridge rejects as being
+    # busy (seconds)
+    RETRY_DELAY = 1
+
+    # Default maximum time to wait for a queued request to be sent (seconds)
+    DEFAULT_RESULT_TIMEOUT = 5
+
+    _send: Callable[[str, dict], ResourceIdentifierPut]
+    _result_timeout: float
+
+    _condition: threading.Condition
+    _queue: dict[str, _QueuedCommand]
+    _buckets: dict[str, _TokenBucket]
+    _thread: Optional[threading.Thread]
+    # Set to stop the current thread (each thread has its own so that one
+    # started after stop() isn't affected by the old one still exiting)
+    _stop_event: threading.Event
+
+    _commands_sent: int
+    _commands_merged: int
+    _commands_retried: int
+    _total_wait_time: float
+    _max_wait_time: float
+
+    def __init__(
+        self,
+        send: Callable[[str, dict], ResourceIdentifierPut],
+        result_timeout: float = DEFAULT_RESULT_TIMEOUT,
+    ) -> None:
+        """Constructor
+
+        Args:
+            send (Callable[[str, dict], ResourceIdentifierPut]): Function that
+                            sends a put request with the given data to an
+                            endpoint
+            result_timeout (float): Maximum time put waits for a request to
+                            be sent before abandoning it (seconds)
+        """
+        self._send = send
+        self._result_timeout = result_timeout
+
+        self._condition = threading.Condition()
+        self._queue = {}
+        self._buckets = {}
+        self._thread = None
+        self._stop_event = threading.Event()
+
+        self._commands_sent = 0
+        self._commands_merged = 0
+        self._commands_retried = 0
+        self._total_wait_time = 0
+        self._max_wait_time = 0
+
+    def _get_bucket(self, rtype: str) -> _TokenBucket:
+        """Returns the token bucket for a type of resource"""
+        if rtype not in self._buckets:
+            rate = HueCommandScheduler.RATES.get(
+                rtype, HueCommandScheduler.DEFAULT_RATE
+            )
+            self._buckets[rtype] = _TokenBucket(rate=rate, capacity=rate)
+        return self._buckets[rtype]
+
+    def submit(
+        self,
+        endpoint: str,
+        data: dict,
+        priority: HueCommandPriority = HueCommandPriority.INTERACTIVE,
+    ) -> "Future[ResourceIdentifierPut]":
+        """Queues a put request
+
+        Args:
+            endpoint (str): Endpoint to call (of the form
+                            /clip/v2/resource/{rtype}/{id})
+            data (dict): Data to put
+            priority (HueCommandPriority): Priority of the request
+
+        Returns:
+            Future[ResourceIdentifierPut]: Completed once the request has been
+                                           sent
+        """
+        future: Future[ResourceIdentifierPut] = Future()
+
+        with self._condition:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop_event = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._stop_event,), daemon=True
+                )
+                self._thread.start()
+
+            command = self._queue.get(endpoint)
+            if command is not None:
+                # Not sent yet so merge (latest values win)
+                _merge_data(command.data, data)
+                command.priority = min(command.priority, priority)
+                command.futures.append(future)
+                self._commands_merged += 1
+            else:
+                self._queue[endpoint] = _QueuedCommand(
+                    endpoint=endpoint,
+                    rtype=endpoint.split("/")[-2],
+                    data=dict(data),
+                    priority=priority,
+                    enqueued_time=time.monotonic(),
+                    futures=[future],
+                )
+            self._condition.notify_all()
+
+        return future
+
+    def _abandon(self, endpoint: str, future: Future):
+        """Removes a request that is no longer being waited for from the
+        queue (if it hasn't been sent yet)"""
+        with self._condition:
+            command = self._queue.get(endpoint)
+            if command is not None and future in command.futures:
+                command.futures.remove(future)
+                if not command.futures:
+                    del self._queue[endpoint]
+        future.cancel()
+
+    def put(
+        self,
+        endpoint: str,
+        data: dict,
+        priority: HueCommandPriority = HueCommandPriority.INTERACTIVE,
+    ) -> ResourceIdentifierPut:
+        """Queues a put request and waits for it to be sent
+
+        Args:
+            endpoint (str): Endpoint to call (of the form
+                            /clip/v2/resource/{rtype}/{id})
+            data (dict): Data to put
+            priority (HueCommandPriority): Priority of the request
+
+        Raises:
+            TimeoutError: If the request isn't sent within the result timeout
+                          (it is then abandoned)
+            HTTPError: When there is an error in the response
+        """
+        future = self.submit(endpoint, data, priority)
+        try:
+            return future.result(timeout=self._result_timeout)
+        except FutureTimeoutError as err:
+            self._abandon(endpoint, future)
+            if not future.cancelled():
+                # Was sent just as the timeout was reached
+                return future.result()
+            raise TimeoutError(
+                f"Put request to {endpoint} was not sent within "
+                f"{self._result_timeout}s"
+            ) from err
+
+    def _next_command(self, stop_event: threading.Event) -> Optional[_QueuedCommand]:
+        """Waits for and returns the next command that can be sent (should
+        hold _condition)"""
+        while not stop_event.is_set():
+            now = time.monotonic()
+            wait_time = None
+            # Dicts retain insertion order so this is oldest first
+            for command in sorted(self._queue.values(), key=lambda c: c.priority):
+                bucket = self._get_bucket(command.rtype)
+                bucket_wait_time = bucket.get_wait_time(now)
+                if bucket_wait_time == 0:
+                    bucket.consume(now)
+                    return self._queue.pop(command.endpoint)
+                if wait_time is None or bucket_wait_time < wait_time:
+                    wait_time = bucket_wait_time
+            self._condition.wait(wait_time)
+        return None
+
+    def _send_command(self, command: _QueuedCommand):
+        """Sends a command, retrying if the bridge says it is busy"""
+        for retry in range(0, HueCommandScheduler.MAX_RETRIES + 1):
+            try:
+                result = self._send(command.endpoint, command.data)
+                break
+            except HTTPError as err:
+                if (
+                    retry < HueCommandScheduler.MAX_RETRIES
+                    and err.response is not None
+                    and err.response.status_code in (429, 503)
+                ):
+                    self._commands_retried += 1
+                    time.sleep(HueCommandScheduler.RETRY_DELAY * (retry + 1))
+                else:
+                    for future in command.futures:
+                        _set_exception(future, err)
+                    return
+            except Exception as err:
+                for future in command.futures:
+                    _set_exception(future, err)
+                return
+
+        for future in command.futures:
+            _set_result(future, result)
+
+    def _run(self, stop_event: threading.Event):
+        """Background thread that sends queued commands until stop_event is
+        set"""
+        while True:
+            with self._condition:
+                command = self._next_command(stop_event)
+                if command is None:
+                    return
+                wait_time = time.monotonic() - command.enqueued_time
+                self._commands_sent += 1
+                self._total_wait_time += wait_time
+                self._max_wait_time = max(self._max_wait_time, wait_time)
+            self._send_command(command)
+
+    def stop(self):
+        """Stops sending commands (any still queued will be cancelled)"""
+        with self._condition:
+            self._stop_event.set()
+            self._thread = None
+            for command in self._queue.values():
+                for future in command.futures:
+                    future.cancel()
+            self._queue = {}
+            self._condition.notify_all()
+
+    @property
+    def stats(self) -> HueCommandSchedulerStats:
+        """Returns statistics about the commands sent"""
+        with self._condition:
+            return HueCommandSchedulerStats(
+                queue_depth=len(self._queue),
+                commands_sent=self._commands_sent,
+                commands_merged=self._commands_merged,
+                commands_retried=self._commands_retried,
+                average_wait_time=self._total_wait_time / self._commands_sent
+                if self._commands_sent > 0
+                else 0,
+                max_wait_time=self._max_wait_time,
+            )
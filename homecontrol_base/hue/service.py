@@ -6,7 +6,7 @@ from homecontrol_base.database.homecontrol_base.database import (
 from homecontrol_base.hue.bridge import HueBridge
 from homecontrol_base.hue.exceptions import HueBridgeButtonNotPressedError
 from homecontrol_base.hue.manager import HueManager
-from homecontrol_base.hue.structs import HueBridgeDiscoverInfo
+from homecontrol_base.hue.structs import HueBridgeDiscoverInfo, HueHouseState
 from homecontrol_base.service.core import BaseService
 
 
@@ -54,6 +54,11 @@ class HueService(BaseService[HomeControlBaseDatabaseConnection]):
             db_conn=self.db_conn, bridge_id=str(bridge_info.id)
         )
 
+    async def get_house_state(self) -> HueHouseState:
+        """Returns the state of every room on every loaded bridge (queried
+        concurrently)"""
+        return await self._hue_manager.get_house_state()
+
     def add_bridge(self, name: str, discover_info: HueBridgeDiscoverInfo) -> HueBridge:
         """Adds a Hue bridge
 
@@ -1,7 +1,12 @@
+import asyncio
+import ssl
+import time
 from pathlib import Path
 from typing import Union
 
-from requests.adapters import HTTPAdapter
+import httpx
+from requests import ConnectionError
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 
 from homecontrol_base.database.homecontrol_base import models
 from homecontrol_base.hue.structs import HueBridgeDiscoverInfo
@@ -28,10 +33,15 @@ class HueBridgeSession(SessionWithBaseURL):
 
     _connection_info: Union[HueBridgeDiscoverInfo, models.HueBridgeInDB]
 
+    # Time the last request was made and whether it failed to connect
+    _last_used_time: float
+    _healthy: bool
+
     def __init__(
         self,
         connection_info: Union[HueBridgeDiscoverInfo, models.HueBridgeInDB],
         ca_cert: Path,
+        pool_size: int = DEFAULT_POOLSIZE,
     ) -> None:
         """Constructor
 
@@ -40,6 +50,8 @@ class HueBridgeSession(SessionWithBaseURL):
                             Info for connecting to the bridge
             ca_cert (Path): Path to the Hue bridge certificate required for a
                             HTTPS connection
+            pool_size (int): Maximum number of connections to keep open to the
+                            bridge
         """
 
         self._connection_info = connection_info
@@ -60,9 +72,45 @@ class HueBridgeSession(SessionWithBaseURL):
         # Auth setup
         if auth:
             self.headers.update({"hue-application-key": connection_info.username})
-        self.mount("https://", HostNameIgnoringAdapter())
+        self.mount(
+            "https://",
+            HostNameIgnoringAdapter(pool_connections=1, pool_maxsize=pool_size),
+        )
         self.verify = ca_cert
 
+        self._last_used_time = time.monotonic()
+        self._healthy = True
+
+    def request(self, method, url, **kwargs):
+        self._last_used_time = time.monotonic()
+        try:
+            return super().request(method, url, **kwargs)
+        except ConnectionError:
+            self._healthy = False
+            raise
+
+    @property
+    def idle_time(self) -> float:
+        """Returns the time since the last request was made (seconds)"""
+        return time.monotonic() - self._last_used_time
+
+    @property
+    def healthy(self) -> bool:
+        """Returns False if the last request failed to connect"""
+        return self._healthy
+
+    def get_pool_stats(self) -> tuple[int, int]:
+        """Returns the number of connections that have been opened (each
+        requiring a TLS handshake) and the number of requests made over them"""
+        connections = 0
+        requests = 0
+        pools = self.get_adapter("https://").poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            connections += pool.num_connections
+            requests += pool.num_requests
+        return connections, requests
+
     def get_discover_info(self) -> HueBridgeDiscoverInfo:
         """Returns discover info (only applicable if haven't authenticated yet)
 
@@ -74,3 +122,59 @@ class HueBridgeSession(SessionWithBaseURL):
         raise RuntimeError(
             "Cannot get HueBridgeDiscoverInfo from this session as already authenticated"
         )
+
+
+class AsyncHueBridgeSession(httpx.AsyncClient):
+    """Handles an asynchronous connection to a Phillips Hue bridge
+
+    Connections are kept alive and reused between requests and the number of
+    requests in flight at any one time is limited so that large fan outs
+    don't overwhelm the bridge
+    """
+
+    # Default maximum number of requests in flight at once
+    MAX_CONCURRENT_REQUESTS = 10
+
+    # Default maximum number of idle connections to keep alive
+    MAX_KEEPALIVE_CONNECTIONS = 5
+
+    _semaphore: asyncio.Semaphore
+
+    def __init__(
+        self,
+        connection_info: models.HueBridgeInDB,
+        ca_cert: Path,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+        max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+    ) -> None:
+        """Constructor
+
+        Args:
+            connection_info (models.HueBridgeInDB): Info for connecting to the
+                            bridge
+            ca_cert (Path): Path to the Hue bridge certificate required for a
+                            HTTPS connection
+            max_concurrent_requests (int): Maximum number of requests in flight
+                            at once
+            max_keepalive_connections (int): Maximum number of idle connections
+                            to keep alive
+        """
+        # Same as HostNameIgnoringAdapter, verify the cert but not the hostname
+        ssl_context = ssl.create_default_context(cafile=str(ca_cert))
+        ssl_context.check_hostname = False
+
+        super().__init__(
+            base_url=f"https://{connection_info.ip_address}:{connection_info.port}",
+            headers={"hue-application-key": connection_info.username},
+            verify=ssl_context,
+            limits=httpx.Limits(
+                max_connections=max_concurrent_requests,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
+
+        self._semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        async with self._semaphore:
+            return await super().send(request, **kwargs)
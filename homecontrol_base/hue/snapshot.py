@@ -0,0 +1,229 @@
+from collections import defaultdict
+from typing import Optional
+
+from homecontrol_base.hue.api.adapters import get_type_adapter
+from homecontrol_base.hue.api.colour import HueColour
+from homecontrol_base.hue.api.connection import HueBridgeAPIConnection
+from homecontrol_base.hue.api.schema import (
+    DeviceGet,
+    GroupedLightGet,
+    LightGet,
+    RoomGet,
+    SceneGet,
+)
+from homecontrol_base.hue.exceptions import HueRoomNotFoundError
+from homecontrol_base.hue.structs import (
+    HueRoom,
+    HueRoomGroupedLightState,
+    HueRoomLight,
+    HueRoomLightState,
+    HueRoomSceneState,
+    HueRoomState,
+)
+
+
+def create_hue_room(hue_room: RoomGet, devices: dict[str, DeviceGet]) -> HueRoom:
+    """Constructs a HueRoom from a room and the devices on the bridge
+
+    Args:
+        hue_room (RoomGet): Room to construct
+        devices (dict[str, DeviceGet]): Devices on the bridge indexed by id
+    """
+
+    # Attempt to find a grouped light service
+    grouped_light_id: Optional[str] = None
+    for service in hue_room.services:
+        if service.rtype == "grouped_light":
+            grouped_light_id = service.rid
+            break
+
+    # Locate all lights
+    lights: dict[str, HueRoomLight] = {}
+    for child in hue_room.children:
+        if child.rtype == "device" and child.rid in devices:
+            device = devices[child.rid]
+            for service in device.services:
+                if service.rtype == "light":
+                    lights[service.rid] = HueRoomLight(name=device.metadata.name)
+                    break
+
+    return HueRoom(
+        id=hue_room.id,
+        name=hue_room.metadata.name,
+        grouped_light_id=grouped_light_id,
+        lights=lights,
+    )
+
+
+class HueBridgeSnapshot:
+    """Stores the resources of a Hue bridge at a point in time
+
+    Resources are indexed by their ids so that the state of every room can be
+    assembled without performing any further requests to the bridge
+    """
+
+    lights: dict[str, LightGet]
+    devices: dict[str, DeviceGet]
+    rooms: dict[str, RoomGet]
+    grouped_lights: dict[str, GroupedLightGet]
+    scenes: dict[str, SceneGet]
+
+    def __init__(
+        self,
+        lights: list[LightGet],
+        devices: list[DeviceGet],
+        rooms: list[RoomGet],
+        grouped_lights: list[GroupedLightGet],
+        scenes: list[SceneGet],
+    ) -> None:
+        """Constructor
+
+        Args:
+            lights (list[LightGet]): All lights on the bridge
+            devices (list[DeviceGet]): All devices on the bridge
+            rooms (list[RoomGet]): All rooms on the bridge
+            grouped_lights (list[GroupedLightGet]): All grouped lights on the
+                                                    bridge
+            scenes (list[SceneGet]): All scenes on the bridge
+        """
+        self.lights = {light.id: light for light in lights}
+        self.devices = {device.id: device for device in devices}
+        self.rooms = {room.id: room for room in rooms}
+        self.grouped_lights = {
+            grouped_light.id: grouped_light for grouped_light in grouped_lights
+        }
+
+        # Scenes are only ever looked up by room
+        self.scenes = {scene.id: scene for scene in scenes}
+        self._room_scenes: dict[str, list[SceneGet]] = defaultdict(list)
+        for scene in scenes:
+            self._room_scenes[scene.group.rid].append(scene)
+
+    @staticmethod
+    def from_resource_data(data: list[dict]) -> "HueBridgeSnapshot":
+        """Constructs a snapshot from the (unparsed) data of every resource on
+        a bridge
+
+        Args:
+            data (list[dict]): Resource data e.g. from
+                               HueBridgeAPIConnection.get_resources
+        """
+        resources: dict[str, list[dict]] = defaultdict(list)
+        for resource in data:
+            resources[resource["type"]].append(resource)
+
+        return HueBridgeSnapshot(
+            lights=get_type_adapter(list[LightGet]).validate_python(
+                resources["light"]
+            ),
+            devices=get_type_adapter(list[DeviceGet]).validate_python(
+                resources["device"]
+            ),
+            rooms=get_type_adapter(list[RoomGet]).validate_python(resources["room"]),
+            grouped_lights=get_type_adapter(list[GroupedLightGet]).validate_python(
+                resources["grouped_light"]
+            ),
+            scenes=get_type_adapter(list[SceneGet]).validate_python(
+                resources["scene"]
+            ),
+        )
+
+    @staticmethod
+    def from_api_connection(
+        api_connection: HueBridgeAPIConnection,
+    ) -> "HueBridgeSnapshot":
+        """Constructs a snapshot of a bridge using a single request
+
+        Args:
+            api_connection (HueBridgeAPIConnection): Connection to the bridge
+
+        Raises:
+            HTTPError: When there is an error in the response
+        """
+        return HueBridgeSnapshot.from_resource_data(api_connection.get_resources())
+
+    def _get_hue_room(self, room_id: str) -> RoomGet:
+        """Returns a RoomGet given its id
+
+        Raises:
+            HueRoomNotFoundError: If the room isn't found
+        """
+        hue_room = self.rooms.get(room_id)
+        if hue_room is None:
+            raise HueRoomNotFoundError(f"Hue room with id '{room_id}' was not found")
+        return hue_room
+
+    def get_rooms(self) -> list[HueRoom]:
+        """Returns a list of HueRoom's"""
+        return [create_hue_room(room, self.devices) for room in self.rooms.values()]
+
+    def get_room(self, room_id: str) -> HueRoom:
+        """Returns a HueRoom with a given id
+
+        Raises:
+            HueRoomNotFoundError: If the room isn't found
+        """
+        return create_hue_room(self._get_hue_room(room_id), self.devices)
+
+    def _get_room_state(self, room: HueRoom) -> HueRoomState:
+        """Returns the state of a HueRoom"""
+
+        # Obtain the grouped light state
+        grouped_light_state = self.grouped_lights.get(room.grouped_light_id)
+
+        # Obtain the states of each light
+        light_states: dict[str, HueRoomLightState] = {}
+
+        for light_id, light in room.lights.items():
+            light_state = self.lights.get(light_id)
+            if light_state is None:
+                continue
+
+            light_states[light_id] = HueRoomLightState(
+                name=light.name,
+                on=light_state.on.on,
+                brightness=light_state.dimming.brightness
+                if light_state.dimming is not None
+                else None,
+                colour_temperature=light_state.color_temperature.mirek
+                if light_state.color_temperature is not None
+                else None,
+                colour=HueColour.from_xy(light_state.color.xy)
+                if light_state.color is not None
+                else None,
+            )
+
+        # Locate all scenes
+        scenes: dict[str, HueRoomSceneState] = {
+            scene.id: HueRoomSceneState(
+                name=scene.metadata.name, status=scene.status.active
+            )
+            for scene in self._room_scenes.get(room.id, [])
+        }
+
+        return HueRoomState(
+            grouped_light=HueRoomGroupedLightState(
+                on=grouped_light_state.on.on
+                if grouped_light_state is not None
+                and grouped_light_state.on is not None
+                else None,
+                brightness=grouped_light_state.dimming.brightness
+                if grouped_light_state is not None
+                and grouped_light_state.dimming is not None
+                else None,
+            ),
+            lights=light_states,
+            scenes=scenes,
+        )
+
+    def get_room_state(self, room_id: str) -> HueRoomState:
+        """Returns the state of a HueRoom
+
+        Raises:
+            HueRoomNotFoundError: If the room isn't found
+        """
+        return self._get_room_state(self.get_room(room_id))
+
+    def get_room_states(self) -> dict[str, HueRoomState]:
+        """Returns the states of every HueRoom indexed by their ids"""
+        return {room.id: self._get_room_state(room) for room in self.get_rooms()}
@@ -16,6 +16,20 @@ class HueBridgeDiscoverInfo:
     port: int
 
 
+@dataclass
+class HueBridgeSessionMetrics:
+    """Stores statistics about the sessions used to connect to a Hue bridge"""
+
+    sessions_created: int
+    connections_opened: int
+    requests: int
+
+    @property
+    def handshakes_avoided(self) -> int:
+        """Number of requests that reused an already open connection"""
+        return self.requests - self.connections_opened
+
+
 @dataclass
 class HueRoomLight:
     """Stores basic info about a light found in a room"""
@@ -73,6 +87,24 @@ class HueRoomState:
     scenes: dict[str, HueRoomSceneState]
 
 
+@dataclass
+class HueBridgeState:
+    """Stores the rooms and their states found on a bridge"""
+
+    name: str
+    rooms: dict[str, HueRoom]
+    room_states: dict[str, HueRoomState]
+    # Will be given instead of the rooms if the bridge couldn't be reached
+    error: Optional[str] = None
+
+
+@dataclass
+class HueHouseState:
+    """Stores the states of every bridge indexed by their ids"""
+
+    bridges: dict[str, HueBridgeState]
+
+
 class HueRoomGroupedLightStateUpdate(BaseModel):
     on: Optional[bool] = None
     brightness: Optional[float] = None
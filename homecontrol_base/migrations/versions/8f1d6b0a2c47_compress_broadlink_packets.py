@@ -0,0 +1,76 @@
+"""Compress broadlink packets
+
+Revision ID: 8f1d6b0a2c47
+Revises: 3c9a4e2b7d51
+Create Date: 2026-10-17 14:36:05.917342
+
+"""
+
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8f1d6b0a2c47"
+down_revision: Union[str, None] = "3c9a4e2b7d51"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Values of PacketStorageFormat (duplicated so this migration doesn't change
+# if it does)
+RAW_FORMAT = 0
+ZLIB_FORMAT = 1
+
+broadlink_actions = sa.table(
+    "broadlink_actions",
+    sa.column("id", sa.Uuid()),
+    sa.column("packet", sa.LargeBinary()),
+    sa.column("packet_format", sa.Integer()),
+)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("broadlink_actions", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "packet_format", sa.Integer(), nullable=False, server_default="0"
+            )
+        )
+
+    # Compress the existing packets
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(broadlink_actions.c.id, broadlink_actions.c.packet).where(
+            broadlink_actions.c.packet.is_not(None)
+        )
+    ).all()
+    for action_id, packet in rows:
+        data = zlib.compress(packet, zlib.Z_BEST_COMPRESSION)
+        if len(data) < len(packet):
+            connection.execute(
+                broadlink_actions.update()
+                .where(broadlink_actions.c.id == action_id)
+                .values(packet=data, packet_format=ZLIB_FORMAT)
+            )
+
+
+def downgrade() -> None:
+    # Decompress any compressed packets
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(broadlink_actions.c.id, broadlink_actions.c.packet).where(
+            broadlink_actions.c.packet_format == ZLIB_FORMAT
+        )
+    ).all()
+    for action_id, data in rows:
+        connection.execute(
+            broadlink_actions.update()
+            .where(broadlink_actions.c.id == action_id)
+            .values(packet=zlib.decompress(data), packet_format=RAW_FORMAT)
+        )
+
+    with op.batch_alter_table("broadlink_actions", schema=None) as batch_op:
+        batch_op.drop_column("packet_format")
@@ -0,0 +1,129 @@
+import asyncio
+import uuid
+from typing import Callable, Optional
+
+import pytest
+from msmart.device.AC.device import AirConditioner
+
+from homecontrol_base.aircon import device as device_module
+from homecontrol_base.aircon import retry as retry_module
+from homecontrol_base.aircon.device import ACDevice
+from homecontrol_base.database.homecontrol_base import models
+
+
+class FakeClock:
+    """Replaces time.monotonic and asyncio.sleep so that time only passes
+    when a test says so (or something sleeps)"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+    async def sleep(self, delay: float):
+        self.sleeps.append(delay)
+        self.now += delay
+        # Still let other tasks run
+        await asyncio.sleep(0)
+
+
+class _FakeAsyncio:
+    """asyncio module with sleep replaced by a FakeClock"""
+
+    def __init__(self, clock: FakeClock):
+        self.sleep = clock.sleep
+
+    def __getattr__(self, name: str):
+        return getattr(asyncio, name)
+
+
+class FakeAirConditioner:
+    """Stands in for an msmart AirConditioner, recording every request and
+    raising any errors queued for it"""
+
+    def __init__(self):
+        self.power_state = True
+        self.target_temperature = 21.0
+        self.operational_mode = AirConditioner.OperationalMode.COOL
+        self.fan_speed = AirConditioner.FanSpeed.AUTO
+        self.swing_mode = AirConditioner.SwingMode.OFF
+        self.eco = False
+        self.turbo = False
+        self.fahrenheit = False
+        self.indoor_temperature = None
+        self.outdoor_temperature = None
+        self.display_on = True
+        self.beep = False
+
+        self.calls = []
+        # Errors to raise from the next requests of each name (None to
+        # succeed)
+        self.errors: dict[str, list[Optional[Exception]]] = {}
+        # Set to make requests wait until it is set
+        self.released: Optional[asyncio.Event] = None
+
+    async def _request(self, name: str):
+        self.calls.append(name)
+        if self.released is not None:
+            await self.released.wait()
+        errors = self.errors.get(name)
+        if errors:
+            error = errors.pop(0)
+            if error is not None:
+                raise error
+
+    async def authenticate(self, token: str, key: str):
+        await self._request("authenticate")
+
+    async def get_capabilities(self):
+        await self._request("get_capabilities")
+
+    async def refresh(self):
+        await self._request("refresh")
+        self.indoor_temperature = 20.0
+        self.outdoor_temperature = 15.0
+
+    async def apply(self):
+        await self._request("apply")
+
+    async def toggle_display(self):
+        await self._request("toggle_display")
+        self.display_on = not self.display_on
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(retry_module, "time", clock)
+    monkeypatch.setattr(retry_module, "asyncio", _FakeAsyncio(clock))
+    monkeypatch.setattr(device_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def create_device(clock) -> Callable[..., tuple[ACDevice, FakeAirConditioner]]:
+    """Returns a function creating an ACDevice (taking the same keyword
+    arguments) that communicates with a FakeAirConditioner"""
+
+    def create_device(**kwargs) -> tuple[ACDevice, FakeAirConditioner]:
+        device = ACDevice(
+            models.ACDeviceInfoInDB(
+                id=uuid.uuid4(),
+                name="lounge",
+                ip_address="192.168.1.20",
+                identifier=1,
+                token="token",
+                key="key",
+            ),
+            **kwargs,
+        )
+        fake = FakeAirConditioner()
+        device._device = fake
+        return device, fake
+
+    return create_device
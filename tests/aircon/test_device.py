@@ -0,0 +1,211 @@
+import asyncio
+
+import pytest
+from msmart.lan import AuthenticationError
+
+from homecontrol_base.aircon.exceptions import ACDeviceUnavailableError
+from homecontrol_base.aircon.retry import RetryPolicy
+from homecontrol_base.exceptions import DeviceConnectionError
+
+
+def fail_refreshes(fake, count: int):
+    fake.errors["refresh"] = [TimeoutError() for _ in range(count)]
+
+
+def test_circuit_opens_after_consecutive_failures(create_device):
+    device, fake = create_device(
+        retry_policy=RetryPolicy(max_attempts=1),
+        circuit_breaker_threshold=2,
+        circuit_breaker_timeout=30,
+    )
+    fail_refreshes(fake, 2)
+
+    for _ in range(2):
+        with pytest.raises(DeviceConnectionError):
+            asyncio.run(device.get_state())
+    with pytest.raises(ACDeviceUnavailableError):
+        asyncio.run(device.get_state())
+
+    # Failed immediately without contacting the device
+    assert fake.calls == ["refresh", "refresh"]
+    assert device.health.consecutive_failures == 2
+    assert device.health.circuit_open
+
+
+def test_circuit_stays_closed_below_threshold(create_device):
+    device, fake = create_device(
+        retry_policy=RetryPolicy(max_attempts=1), circuit_breaker_threshold=2
+    )
+    fail_refreshes(fake, 1)
+
+    with pytest.raises(DeviceConnectionError):
+        asyncio.run(device.get_state())
+    asyncio.run(device.get_state())
+
+    assert device.health.consecutive_failures == 0
+    assert not device.health.circuit_open
+
+
+def test_circuit_recovers_after_timeout(create_device, clock):
+    device, fake = create_device(
+        retry_policy=RetryPolicy(max_attempts=1),
+        circuit_breaker_threshold=1,
+        circuit_breaker_timeout=30,
+    )
+    fail_refreshes(fake, 1)
+
+    with pytest.raises(DeviceConnectionError):
+        asyncio.run(device.get_state())
+    clock.advance(29)
+    with pytest.raises(ACDeviceUnavailableError):
+        asyncio.run(device.get_state())
+    clock.advance(1)
+    state = asyncio.run(device.get_state())
+
+    assert state.indoor_temperature == 20.0
+    assert fake.calls == ["refresh", "refresh"]
+    assert device.health.consecutive_failures == 0
+    assert not device.health.circuit_open
+
+
+def test_circuit_reopens_when_trial_fails(create_device, clock):
+    device, fake = create_device(
+        retry_policy=RetryPolicy(max_attempts=1),
+        circuit_breaker_threshold=1,
+        circuit_breaker_timeout=30,
+    )
+    fail_refreshes(fake, 2)
+
+    with pytest.raises(DeviceConnectionError):
+        asyncio.run(device.get_state())
+    clock.advance(30)
+    with pytest.raises(DeviceConnectionError):
+        asyncio.run(device.get_state())
+
+    assert device.health.circuit_open
+    assert device.health.consecutive_failures == 2
+
+
+def test_failed_refreshes_are_retried(create_device, clock):
+    device, fake = create_device(
+        retry_policy=RetryPolicy(max_attempts=3, initial_delay=0.5, jitter=0)
+    )
+    fail_refreshes(fake, 2)
+
+    asyncio.run(device.get_state())
+
+    assert fake.calls == ["refresh"] * 3
+    assert clock.sleeps == [0.5, 1.0]
+    assert device.retry_stats["refresh"].attempts == 3
+    assert device.health.consecutive_failures == 0
+
+
+@pytest.mark.parametrize(
+    "state_cache_ttl, elapsed, refreshes",
+    [(2, 0, 1), (2, 2, 1), (2, 2.5, 2), (0, 0.1, 2)],
+)
+def test_state_reused_within_cache_ttl(
+    create_device, clock, state_cache_ttl, elapsed, refreshes
+):
+    device, fake = create_device(state_cache_ttl=state_cache_ttl)
+
+    asyncio.run(device.get_state())
+    clock.advance(elapsed)
+    asyncio.run(device.get_state())
+
+    assert fake.calls.count("refresh") == refreshes
+
+
+@pytest.mark.parametrize(
+    "state_cache_ttl, elapsed, applied",
+    [(2, 1, False), (2, 2.5, True), (0, 0.1, True)],
+)
+def test_command_matching_fresh_state_skipped(
+    create_device, clock, state_cache_ttl, elapsed, applied
+):
+    device, fake = create_device(state_cache_ttl=state_cache_ttl)
+
+    async def set_current_state():
+        state = await device.get_state()
+        clock.advance(elapsed)
+        await device.set_state(state)
+
+    asyncio.run(set_current_state())
+
+    assert ("apply" in fake.calls) == applied
+    assert device.command_stats.applied == int(applied)
+    assert device.command_stats.skipped == int(not applied)
+
+
+def test_concurrent_get_state_shares_refresh(create_device):
+    device, fake = create_device()
+
+    async def get_states():
+        fake.released = asyncio.Event()
+        tasks = [asyncio.ensure_future(device.get_state()) for _ in range(5)]
+        await asyncio.sleep(0)
+        fake.released.set()
+        return await asyncio.gather(*tasks)
+
+    states = asyncio.run(get_states())
+
+    assert fake.calls == ["refresh"]
+    assert all(state == states[0] for state in states)
+    # Each caller gets its own copy
+    assert len(set(map(id, states))) == len(states)
+
+
+def test_cached_state_expires(create_device, clock):
+    device, fake = create_device(state_cache_ttl=5)
+
+    asyncio.run(device.get_state())
+    clock.advance(5)
+    asyncio.run(device.get_state())
+    assert fake.calls.count("refresh") == 1
+
+    clock.advance(0.1)
+    asyncio.run(device.get_state())
+    assert fake.calls.count("refresh") == 2
+
+    # A max_age given by the caller overrides the TTL
+    asyncio.run(device.get_state(max_age=0.5))
+    assert fake.calls.count("refresh") == 2
+    clock.advance(1)
+    asyncio.run(device.get_state(max_age=0.5))
+    assert fake.calls.count("refresh") == 3
+
+
+def test_set_state_invalidates_cached_state(create_device):
+    device, fake = create_device(state_cache_ttl=5)
+
+    async def set_then_get_state():
+        state = await device.get_state()
+        state.target_temperature = 24
+        await device.set_state(state)
+        return await device.get_state()
+
+    asyncio.run(set_then_get_state())
+
+    assert fake.calls == ["refresh", "apply", "refresh"]
+
+
+def test_reauthenticates_only_after_authentication_error(create_device, clock):
+    device, fake = create_device(
+        retry_policy=RetryPolicy(max_attempts=1), circuit_breaker_threshold=10
+    )
+    fake.errors["refresh"] = [TimeoutError(), AuthenticationError()]
+
+    # Connection failures don't need new authentication
+    with pytest.raises(DeviceConnectionError):
+        asyncio.run(device.get_state())
+    with pytest.raises(AuthenticationError):
+        asyncio.run(device.get_state())
+    assert "authenticate" not in fake.calls
+
+    asyncio.run(device.get_state())
+    assert fake.calls[2:] == ["authenticate", "get_capabilities", "refresh"]
+
+    # Only once
+    clock.advance(1)
+    asyncio.run(device.get_state())
+    assert fake.calls[5:] == ["refresh"]
@@ -0,0 +1,108 @@
+import asyncio
+import uuid
+from contextlib import contextmanager
+
+from homecontrol_base.aircon import manager as manager_module
+from homecontrol_base.aircon.manager import ACManager
+from homecontrol_base.database.homecontrol_base import models
+
+
+class FakeDevice:
+    async def get_state(self):
+        return "state"
+
+
+def create_device_info(name: str) -> models.ACDeviceInfoInDB:
+    return models.ACDeviceInfoInDB(
+        id=uuid.uuid4(), name=name, ip_address="192.168.1.10", identifier=1
+    )
+
+
+def test_concurrent_get_state_loads_device_once(monkeypatch):
+    manager = ACManager()
+    loads = []
+
+    async def load_device(device_info):
+        loads.append(device_info)
+        await asyncio.sleep(0.01)
+        device = FakeDevice()
+        manager._devices[str(device_info.id)] = device
+        return device
+
+    monkeypatch.setattr(manager, "_load_device", load_device)
+    device_info = create_device_info("lounge")
+
+    async def get_states():
+        return await asyncio.gather(
+            *[manager._get_state(device_info) for _ in range(5)]
+        )
+
+    assert asyncio.run(get_states()) == ["state"] * 5
+    assert loads == [device_info]
+    assert manager._loading == {}
+
+
+def test_load_all_closes_connection_before_connecting(monkeypatch):
+    manager = ACManager()
+    devices = [create_device_info("lounge"), create_device_info("bedroom")]
+    connection_open = []
+
+    class FakeACDevices:
+        def get_all(self):
+            return devices
+
+    class FakeConnection:
+        ac_devices = FakeACDevices()
+
+    class FakeDatabase:
+        @contextmanager
+        def connect(self):
+            connection_open.append(True)
+            try:
+                yield FakeConnection()
+            finally:
+                connection_open[-1] = False
+
+    async def load_device(device_info):
+        assert connection_open == [False]
+        device = FakeDevice()
+        manager._devices[str(device_info.id)] = device
+        return device
+
+    monkeypatch.setattr(manager_module, "homecontrol_base_db", FakeDatabase())
+    monkeypatch.setattr(manager, "_load_device", load_device)
+
+    report = asyncio.run(manager._load_all())
+
+    assert not report.failed
+    assert set(manager._devices) == {str(device_info.id) for device_info in devices}
+
+
+def test_get_all_states_isolates_slow_devices(create_device):
+    manager = ACManager()
+    manager._midea_config._data.state_timeout = 0.05
+    (fast, fast_fake), (slow, slow_fake) = create_device(), create_device()
+    manager._devices = {str(device.info.id): device for device in (fast, slow)}
+
+    class FakeACDevices:
+        def get_all(self):
+            return [fast.info, slow.info]
+
+    class FakeConnection:
+        ac_devices = FakeACDevices()
+
+    async def get_all_states():
+        # Never responds
+        slow_fake.released = asyncio.Event()
+        return await manager.get_all_states(FakeConnection())
+
+    house_state = asyncio.run(get_all_states())
+
+    fast_result = house_state.devices[str(fast.info.id)]
+    slow_result = house_state.devices[str(slow.info.id)]
+    assert fast_result.error is None
+    assert fast_result.state.indoor_temperature == 20.0
+    assert slow_result.state is None
+    assert slow_result.error == "Timed out after 0.05 seconds"
+    assert list(house_state.failed) == [str(slow.info.id)]
+    assert fast_fake.calls == slow_fake.calls == ["refresh"]
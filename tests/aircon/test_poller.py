@@ -0,0 +1,99 @@
+import asyncio
+
+from homecontrol_base.aircon.poller import ACStatePoller
+
+
+def create_poller(devices: dict) -> ACStatePoller:
+    return ACStatePoller(
+        lambda: devices,
+        poll_interval=60,
+        fast_poll_interval=5,
+        fast_poll_period=60,
+        timeout=10,
+    )
+
+
+async def subscribe(poller: ACStatePoller):
+    """Subscribes to a poller, returning the subscription and the pending
+    first event"""
+    events = poller.subscribe()
+    receive = asyncio.ensure_future(events.__anext__())
+    # Let the subscription register itself
+    await asyncio.sleep(0)
+    return events, receive
+
+
+def test_subscriber_receives_state_changes(create_device):
+    device, _ = create_device()
+    poller = create_poller({"lounge": device})
+
+    async def receive_first_event():
+        events, receive = await subscribe(poller)
+        poller.start()
+        try:
+            return await asyncio.wait_for(receive, 1)
+        finally:
+            await poller.stop()
+            await events.aclose()
+
+    event = asyncio.run(receive_first_event())
+
+    assert event.device_id == "lounge"
+    assert event.name == "lounge"
+    assert event.state.indoor_temperature == 20.0
+    assert event.previous_state is None
+
+
+def test_unsubscribe_removes_queue():
+    poller = create_poller({})
+
+    async def subscribe_then_unsubscribe():
+        events, receive = await subscribe(poller)
+        assert len(poller._queues) == 1
+        receive.cancel()
+        await asyncio.gather(receive, return_exceptions=True)
+        await events.aclose()
+
+    asyncio.run(subscribe_then_unsubscribe())
+
+    assert poller._queues == set()
+
+
+def test_slow_subscriber_drops_oldest_events(monkeypatch):
+    monkeypatch.setattr(ACStatePoller, "SUBSCRIBER_QUEUE_SIZE", 2)
+    poller = create_poller({})
+
+    async def receive_events():
+        events, receive = await subscribe(poller)
+        for event in ("first", "second", "third"):
+            poller._publish(event)
+        received = [await receive, await events.__anext__()]
+        await events.aclose()
+        return received
+
+    assert asyncio.run(receive_events()) == ["second", "third"]
+    assert poller.events_dropped == 1
+
+
+def test_stop_cancels_polls_in_progress(create_device):
+    device, fake = create_device()
+    poller = create_poller({"lounge": device})
+
+    async def start_then_stop():
+        # Block the poll until it is cancelled
+        fake.released = asyncio.Event()
+        poller.start()
+        for _ in range(100):
+            if "refresh" in fake.calls:
+                break
+            await asyncio.sleep(0)
+        assert poller.running
+        await poller.stop()
+
+    asyncio.run(start_then_stop())
+
+    assert fake.calls == ["refresh"]
+    assert not poller.running
+    assert poller._poll_tasks == set()
+    assert poller._in_progress == set()
+    assert poller.get_state("lounge") is None
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from homecontrol_base.aircon.retry import RetryPolicy, RetryStats
+
+
+class FailingFunction:
+    """Raises the given errors in turn before returning a result"""
+
+    def __init__(self, *errors: Exception):
+        self.calls = 0
+        self._errors = list(errors)
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        if self._errors:
+            raise self._errors.pop(0)
+        return "result"
+
+
+def test_retries_until_success(clock):
+    policy = RetryPolicy(max_attempts=3, initial_delay=0.5, jitter=0)
+    function = FailingFunction(TimeoutError(), TimeoutError())
+    stats = RetryStats()
+
+    result = asyncio.run(policy.run(function, retry_on=(TimeoutError,), stats=stats))
+
+    assert result == "result"
+    assert function.calls == 3
+    assert stats.attempts == 3
+    assert clock.sleeps == [0.5, 1.0]
+    assert stats.time_taken == pytest.approx(1.5)
+
+
+def test_raises_after_max_attempts(clock):
+    policy = RetryPolicy(max_attempts=3, initial_delay=0.5, jitter=0)
+    function = FailingFunction(*[TimeoutError() for _ in range(5)])
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(policy.run(function, retry_on=(TimeoutError,)))
+
+    assert function.calls == 3
+    # No delay after the last attempt
+    assert clock.sleeps == [0.5, 1.0]
+
+
+def test_other_exceptions_are_not_retried(clock):
+    policy = RetryPolicy(max_attempts=3)
+    function = FailingFunction(ValueError())
+    stats = RetryStats()
+
+    with pytest.raises(ValueError):
+        asyncio.run(policy.run(function, retry_on=(TimeoutError,), stats=stats))
+
+    assert function.calls == 1
+    assert stats.attempts == 1
+    assert clock.sleeps == []
+
+
+def test_delay_limited_to_max_delay(clock):
+    policy = RetryPolicy(
+        max_attempts=5, initial_delay=1, max_delay=3, multiplier=2, jitter=0
+    )
+    function = FailingFunction(*[TimeoutError() for _ in range(4)])
+
+    asyncio.run(policy.run(function, retry_on=(TimeoutError,)))
+
+    assert clock.sleeps == [1, 2, 3, 3]
+
+
+def test_no_retry_past_deadline(clock):
+    policy = RetryPolicy(max_attempts=5, initial_delay=1, jitter=0, deadline=2.5)
+    function = FailingFunction(*[TimeoutError() for _ in range(5)])
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(policy.run(function, retry_on=(TimeoutError,)))
+
+    # The delay before a third attempt would pass the deadline
+    assert function.calls == 2
+    assert clock.sleeps == [1]
@@ -0,0 +1,41 @@
+import broadlink
+
+from homecontrol_base.broadlink.device import BroadlinkDevice
+from homecontrol_base.database.homecontrol_base import models
+
+
+def create_device(*args, **kwargs) -> broadlink.Device:
+    return broadlink.remote.rmmini(
+        host=("192.168.1.10", 80), mac=b"\x00" * 6, devtype=0x2737
+    )
+
+
+def test_timeout_applies_to_every_request(monkeypatch):
+    monkeypatch.setattr(broadlink, "hello", create_device)
+    auth_timeouts = []
+    monkeypatch.setattr(
+        broadlink.remote.rmmini, "auth", lambda self: auth_timeouts.append(self.timeout)
+    )
+
+    device = BroadlinkDevice(
+        models.BroadlinkDeviceInDB(name="remote", ip_address="192.168.1.10"),
+        timeout=3,
+    )
+
+    assert auth_timeouts == [3]
+    assert device._device.timeout == 3
+
+
+def test_discover_applies_timeout(monkeypatch):
+    devices = []
+
+    def hello(*args, **kwargs):
+        devices.append(create_device())
+        return devices[-1]
+
+    monkeypatch.setattr(broadlink, "hello", hello)
+
+    discover_info = BroadlinkDevice.discover("192.168.1.10", timeout=3)
+
+    assert discover_info.ip_address == "192.168.1.10"
+    assert devices[0].timeout == 3
@@ -0,0 +1,76 @@
+import pytest
+
+from homecontrol_base.broadlink.packet import (
+    IR_SIGNAL_TRAILER,
+    PULSE_TICK,
+    IRPacket,
+    batch_ir_packets,
+    decode_ir_packet,
+    encode_ir_packet,
+)
+
+
+def test_encode_decode_round_trip():
+    ir_packet = IRPacket(repeat=0, pulses=[100, 50, 300, 20])
+
+    assert decode_ir_packet(encode_ir_packet(ir_packet)) == ir_packet
+
+
+def test_batch_ir_packets_separates_packets_ending_on_pulse():
+    first = encode_ir_packet(IRPacket(repeat=0, pulses=[100, 50, 100]))
+    second = encode_ir_packet(IRPacket(repeat=0, pulses=[200, 60, 200]))
+
+    batches = batch_ir_packets([(first, 0), (second, 0)])
+
+    assert len(batches) == 1
+    assert decode_ir_packet(batches[0][0]).pulses == [
+        100,
+        50,
+        100,
+        IR_SIGNAL_TRAILER,
+        200,
+        60,
+        200,
+        IR_SIGNAL_TRAILER,
+    ]
+
+
+def test_batch_ir_packets_leaves_padded_packets_unchanged():
+    # Length includes trailing padding, which decodes as a zero length pulse
+    data = bytes([100, 50, 100, 0, 0, 0])
+    padded = bytes([0x26, 0]) + len(data).to_bytes(2, "little") + data
+    other = encode_ir_packet(IRPacket(repeat=0, pulses=[200, 60, 200]))
+
+    batches = batch_ir_packets([(padded, 0.1), (other, 0)])
+
+    assert batches == [(padded, 0.1), (other, 0)]
+
+
+@pytest.mark.parametrize(
+    "trailer",
+    [[IR_SIGNAL_TRAILER], [0x0D, 0x05]],
+    ids=["long", "short"],
+)
+def test_batch_ir_packets_keeps_single_trailer_between_packets(trailer):
+    first = encode_ir_packet(IRPacket(repeat=0, pulses=[100, 50, 100] + trailer))
+    second = encode_ir_packet(IRPacket(repeat=0, pulses=[200, 60, 200] + trailer))
+    delay_ticks = round(0.01 * 1000000 / PULSE_TICK)
+
+    batches = batch_ir_packets([(first, 0.01), (second, 0.5)])
+
+    assert len(batches) == 1
+    packet, delay = batches[0]
+    assert delay == 0.5
+    assert decode_ir_packet(packet) == IRPacket(
+        repeat=0,
+        pulses=[
+            100,
+            50,
+            100,
+            IR_SIGNAL_TRAILER + delay_ticks,
+            200,
+            60,
+            200,
+            IR_SIGNAL_TRAILER,
+        ],
+    )
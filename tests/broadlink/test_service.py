@@ -0,0 +1,89 @@
+import uuid
+
+import pytest
+
+from homecontrol_base.broadlink.exceptions import ActionNotFoundError
+from homecontrol_base.broadlink.manager import BroadlinkManager
+from homecontrol_base.broadlink.packet import (IR_SIGNAL_TRAILER, IRPacket,
+                                               decode_ir_packet,
+                                               encode_ir_packet)
+from homecontrol_base.broadlink.service import BroadlinkService
+from homecontrol_base.broadlink.structs import BroadlinkMacroStep
+from homecontrol_base.database.homecontrol_base import models
+from homecontrol_base.database.homecontrol_base.database import database
+
+PACKET = encode_ir_packet(IRPacket(repeat=0, pulses=[100, 50, 100, IR_SIGNAL_TRAILER]))
+
+
+class FakeDevice:
+    def __init__(self):
+        self.sent = []
+
+    def send_ir_packets(self, packets: list[tuple[bytes, float]]):
+        self.sent.extend(packets)
+
+
+@pytest.fixture
+def device() -> FakeDevice:
+    return FakeDevice()
+
+
+@pytest.fixture
+def service(monkeypatch, device):
+    with database.connect() as conn:
+        service = BroadlinkService(conn, BroadlinkManager())
+        monkeypatch.setattr(service, "get_device", lambda device_id: device)
+        yield service
+
+
+def create_action(service: BroadlinkService) -> models.BroadlinkActionInDB:
+    action = models.BroadlinkActionInDB(name=f"action-{uuid.uuid4()}")
+    action.packet = PACKET
+    return service.db_conn.broadlink_actions.create(action)
+
+
+def test_create_macro_normalises_action_ids(service):
+    action = create_action(service)
+
+    macro = service.create_macro(
+        f"macro-{uuid.uuid4()}",
+        [BroadlinkMacroStep(action_id=str(action.id).upper(), delay=0.1)],
+    )
+
+    assert macro.steps == [{"action_id": str(action.id), "delay": 0.1}]
+
+
+def test_create_macro_rejects_invalid_action_ids(service):
+    with pytest.raises(ActionNotFoundError):
+        service.create_macro(
+            f"macro-{uuid.uuid4()}", [BroadlinkMacroStep(action_id="not-an-id")]
+        )
+
+
+def test_play_macro_with_non_canonical_action_ids(service, device):
+    action = create_action(service)
+    # Steps saved before ids were normalised
+    macro = service.db_conn.broadlink_macros.create(
+        models.BroadlinkMacroInDB(
+            name=f"macro-{uuid.uuid4()}",
+            steps=[
+                {"action_id": str(action.id).upper(), "delay": 0},
+                {"action_id": action.id.hex, "delay": 0},
+            ],
+        )
+    )
+
+    playback = service.play_macro("device", str(macro.id))
+
+    assert playback.steps == 2
+    assert playback.packets_sent == 1
+    assert decode_ir_packet(device.sent[0][0]).pulses == [
+        100,
+        50,
+        100,
+        IR_SIGNAL_TRAILER,
+        100,
+        50,
+        100,
+        IR_SIGNAL_TRAILER,
+    ]
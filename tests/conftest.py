@@ -0,0 +1,22 @@
+import json
+import os
+import tempfile
+
+# Config is loaded on import (from the current directory) so has to be in
+# place before any tests are collected
+_config_dir = tempfile.mkdtemp(prefix="homecontrol_base_tests_")
+_config = {
+    "database.json": {
+        "driver": "sqlite",
+        "username": None,
+        "password": None,
+        "host": None,
+        "port": None,
+    },
+    "hue.json": {"ca_cert": "hue.pem", "mDNS_discovery": False},
+    "midea.json": {"account": {"username": "username", "password": "password"}},
+}
+for file_name, data in _config.items():
+    with open(os.path.join(_config_dir, file_name), "w", encoding="utf-8") as file:
+        json.dump(data, file)
+os.chdir(_config_dir)
@@ -0,0 +1,19 @@
+from homecontrol_base.database.homecontrol_base import models
+from homecontrol_base.hue.cache import HueResourceCache
+
+
+class FakeResponse:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_stop_closes_event_stream():
+    cache = HueResourceCache(models.HueBridgeInDB(), ca_cert="hue.pem")
+    response = FakeResponse()
+    cache._response = response
+
+    cache.stop()
+
+    assert response.closed
@@ -0,0 +1,49 @@
+import pytest
+
+from homecontrol_base.database.homecontrol_base import models
+from homecontrol_base.database.homecontrol_base.database import (
+    database as homecontrol_base_db,
+)
+from homecontrol_base.exceptions import DeviceNotFoundError
+from homecontrol_base.hue.bridge import HueBridge
+from homecontrol_base.hue.manager import HueManager
+
+
+def create_bridge_info(name: str) -> str:
+    with homecontrol_base_db.connect() as conn:
+        bridge_info = conn.hue_bridges.create(
+            models.HueBridgeInDB(
+                name=name,
+                ip_address=f"{name}.local",
+                port=443,
+                identifier=name,
+                username="username",
+                client_key="client_key",
+            )
+        )
+        return str(bridge_info.id)
+
+
+def test_get_bridge_reuses_loaded_bridge():
+    bridge_id = create_bridge_info("get_bridge")
+    manager = HueManager()
+
+    with homecontrol_base_db.connect() as conn:
+        bridge = manager.get_bridge(conn, bridge_id)
+        assert manager.get_bridge(conn, bridge_id) is bridge
+
+
+def test_remove_bridge_closes_bridge(monkeypatch):
+    bridge_id = create_bridge_info("remove_bridge")
+    manager = HueManager()
+    with homecontrol_base_db.connect() as conn:
+        bridge = manager.get_bridge(conn, bridge_id)
+
+    closed = []
+    monkeypatch.setattr(HueBridge, "close", lambda self: closed.append(self))
+    manager.remove_bridge(bridge_id)
+
+    assert closed == [bridge]
+    with homecontrol_base_db.connect() as conn:
+        with pytest.raises(DeviceNotFoundError):
+            manager.get_bridge(conn, bridge_id)
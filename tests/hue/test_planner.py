@@ -0,0 +1,206 @@
+from typing import Optional
+
+import pytest
+
+from homecontrol_base.hue.api.colour import HueColour
+from homecontrol_base.hue.planner import (_diff_light, apply_room_write_plan,
+                                          plan_room_state_update)
+from homecontrol_base.hue.structs import (HueRoom, HueRoomGroupedLightState,
+                                          HueRoomGroupedLightStateUpdate,
+                                          HueRoomLight, HueRoomLightState,
+                                          HueRoomLightStateUpdate,
+                                          HueRoomState, HueRoomStateUpdate)
+
+RED = HueColour(r=1, g=0, b=0)
+BLUE = HueColour(r=0, g=0, b=1)
+
+Update = HueRoomLightStateUpdate
+
+
+def create_light_state(
+    on: bool = True,
+    brightness: Optional[float] = 50,
+    colour_temperature: Optional[int] = None,
+    colour: Optional[HueColour] = RED,
+) -> HueRoomLightState:
+    return HueRoomLightState(
+        name="light",
+        on=on,
+        brightness=brightness,
+        colour_temperature=colour_temperature,
+        colour=colour,
+    )
+
+
+def create_room_state(**lights: HueRoomLightState) -> HueRoomState:
+    return HueRoomState(
+        grouped_light=HueRoomGroupedLightState(on=True, brightness=50),
+        lights=lights,
+        scenes={},
+    )
+
+
+ROOM = HueRoom(
+    id="room",
+    name="Room",
+    grouped_light_id="grouped",
+    lights={"a": HueRoomLight(name="a"), "b": HueRoomLight(name="b")},
+)
+
+
+@pytest.mark.parametrize(
+    "state, update, expected",
+    [
+        (create_light_state(), Update(on=True), Update()),
+        (create_light_state(), Update(on=False), Update(on=False)),
+        (create_light_state(), Update(brightness=50.3), Update()),
+        (create_light_state(), Update(brightness=60), Update(brightness=60)),
+        (
+            create_light_state(brightness=None),
+            Update(brightness=60),
+            Update(brightness=60),
+        ),
+        (
+            create_light_state(colour_temperature=300),
+            Update(colour_temperature=300),
+            Update(),
+        ),
+        (
+            create_light_state(colour_temperature=None),
+            Update(colour_temperature=300),
+            Update(colour_temperature=300),
+        ),
+        (create_light_state(), Update(colour=RED), Update()),
+        (create_light_state(), Update(colour=BLUE), Update(colour=BLUE)),
+        # Still reports an xy colour in colour temperature mode
+        (
+            create_light_state(colour_temperature=300),
+            Update(colour=RED),
+            Update(colour=RED),
+        ),
+    ],
+    ids=[
+        "same on",
+        "different on",
+        "brightness within tolerance",
+        "different brightness",
+        "brightness of plug",
+        "same colour temperature",
+        "colour temperature in colour mode",
+        "same colour",
+        "different colour",
+        "colour in colour temperature mode",
+    ],
+)
+def test_diff_light(state, update, expected):
+    assert _diff_light(state, update) == expected
+
+
+@pytest.mark.parametrize(
+    "update_data, expected_grouped_light_update, expected_light_updates",
+    [
+        (
+            HueRoomStateUpdate(
+                lights={"a": Update(brightness=80), "b": Update(brightness=80)}
+            ),
+            Update(brightness=80),
+            {},
+        ),
+        (
+            HueRoomStateUpdate(
+                lights={"a": Update(brightness=80), "b": Update(brightness=70)}
+            ),
+            None,
+            {"a": Update(brightness=80), "b": Update(brightness=70)},
+        ),
+        (
+            HueRoomStateUpdate(lights={"a": Update(brightness=80)}),
+            None,
+            {"a": Update(brightness=80)},
+        ),
+        (
+            HueRoomStateUpdate(
+                grouped_light=HueRoomGroupedLightStateUpdate(on=True, brightness=60),
+                lights={"a": Update(brightness=80), "b": Update(brightness=80)},
+            ),
+            Update(brightness=80),
+            {},
+        ),
+        (
+            HueRoomStateUpdate(
+                lights={"a": Update(brightness=50.2), "b": Update(brightness=50.2)}
+            ),
+            None,
+            {},
+        ),
+        (
+            HueRoomStateUpdate(
+                grouped_light=HueRoomGroupedLightStateUpdate(brightness=60),
+                lights={"a": Update(brightness=60, colour=BLUE)},
+            ),
+            Update(brightness=60),
+            {"a": Update(colour=BLUE)},
+        ),
+    ],
+    ids=[
+        "identical updates collapsed",
+        "different updates kept",
+        "some lights kept",
+        "light updates take precedence",
+        "unchanged values dropped",
+        "compared after grouped light update",
+    ],
+)
+def test_plan_room_state_update(
+    update_data, expected_grouped_light_update, expected_light_updates
+):
+    state = create_room_state(a=create_light_state(), b=create_light_state())
+
+    plan = plan_room_state_update(ROOM, state, update_data)
+
+    assert plan.grouped_light_update == expected_grouped_light_update
+    assert plan.light_updates == expected_light_updates
+
+
+@pytest.mark.parametrize(
+    "update_data, expected_brightness",
+    [
+        (
+            HueRoomStateUpdate(
+                lights={"a": Update(brightness=80), "b": Update(brightness=80)}
+            ),
+            80,
+        ),
+        (
+            HueRoomStateUpdate(
+                grouped_light=HueRoomGroupedLightStateUpdate(brightness=60),
+                lights={"a": Update(brightness=100)},
+            ),
+            80,
+        ),
+        (
+            HueRoomStateUpdate(lights={"a": Update(on=False)}),
+            50,
+        ),
+        (
+            HueRoomStateUpdate(
+                lights={"a": Update(brightness=90), "b": Update(on=False)}
+            ),
+            90,
+        ),
+    ],
+    ids=[
+        "collapsed",
+        "grouped light then light",
+        "light turned off",
+        "only lights that are on",
+    ],
+)
+def test_apply_room_write_plan_grouped_brightness(update_data, expected_brightness):
+    state = create_room_state(a=create_light_state(), b=create_light_state())
+    plan = plan_room_state_update(ROOM, state, update_data)
+
+    new_state = apply_room_write_plan(state, plan)
+
+    assert new_state.grouped_light.brightness == pytest.approx(expected_brightness)
+    assert new_state.grouped_light.on
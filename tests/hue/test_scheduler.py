@@ -0,0 +1,141 @@
+import threading
+
+import pytest
+
+from homecontrol_base.hue.scheduler import (
+    HueCommandPriority,
+    HueCommandScheduler,
+    _TokenBucket,
+)
+
+
+class RecordingSend:
+    """Records the put requests sent by a scheduler"""
+
+    def __init__(self, blocked: bool = False):
+        self.sent = []
+        self._released = threading.Event()
+        if not blocked:
+            self._released.set()
+
+    def release(self):
+        self._released.set()
+
+    def __call__(self, endpoint: str, data: dict):
+        self._released.wait()
+        self.sent.append((endpoint, data))
+        return endpoint
+
+
+@pytest.mark.parametrize(
+    "elapsed, expected_wait_time",
+    [(0, 0.5), (0.25, 0.25), (0.5, 0), (10, 0)],
+)
+def test_token_bucket_refills_over_time(elapsed, expected_wait_time):
+    bucket = _TokenBucket(rate=2, capacity=1)
+    bucket._last_time = 0
+    bucket.consume(0)
+
+    assert bucket.get_wait_time(elapsed) == pytest.approx(expected_wait_time)
+
+
+def test_token_bucket_limited_to_capacity():
+    bucket = _TokenBucket(rate=2, capacity=2)
+    bucket._last_time = 0
+
+    # Tokens aren't accumulated beyond the capacity however long it is idle
+    bucket.get_wait_time(100)
+    bucket.consume(100)
+    bucket.consume(100)
+
+    assert bucket.get_wait_time(100) == pytest.approx(0.5)
+
+
+def test_interactive_requests_sent_before_background():
+    send = RecordingSend()
+    scheduler = HueCommandScheduler(send)
+
+    # Queue both before the scheduler's thread can send either
+    with scheduler._condition:
+        background = scheduler.submit(
+            "/clip/v2/resource/light/1",
+            {"on": {"on": True}},
+            HueCommandPriority.BACKGROUND,
+        )
+        interactive = scheduler.submit(
+            "/clip/v2/resource/light/2", {"on": {"on": False}}
+        )
+    background.result(1)
+    interactive.result(1)
+    scheduler.stop()
+
+    assert [endpoint for endpoint, _ in send.sent] == [
+        "/clip/v2/resource/light/2",
+        "/clip/v2/resource/light/1",
+    ]
+
+
+@pytest.mark.parametrize(
+    "first, second, expected",
+    [
+        (
+            {"on": {"on": True}},
+            {"dimming": {"brightness": 50}},
+            {"on": {"on": True}, "dimming": {"brightness": 50}},
+        ),
+        (
+            {"dimming": {"brightness": 10}},
+            {"dimming": {"brightness": 50}},
+            {"dimming": {"brightness": 50}},
+        ),
+        (
+            {"dynamics": {"duration": 100}},
+            {"dynamics": {"speed": 0.5}},
+            {"dynamics": {"duration": 100, "speed": 0.5}},
+        ),
+        (
+            {"color_temperature": {"mirek": 300}},
+            {"color": {"xy": {"x": 0.3, "y": 0.3}}},
+            {"color": {"xy": {"x": 0.3, "y": 0.3}}},
+        ),
+        (
+            {"color": {"xy": {"x": 0.3, "y": 0.3}}},
+            {"color_temperature": {"mirek": 300}},
+            {"color_temperature": {"mirek": 300}},
+        ),
+        (
+            {"dimming": {"brightness": 10}},
+            {"dimming_delta": {"action": "up", "brightness_delta": 10}},
+            {"dimming_delta": {"action": "up", "brightness_delta": 10}},
+        ),
+    ],
+)
+def test_queued_requests_merged(first, second, expected):
+    send = RecordingSend()
+    scheduler = HueCommandScheduler(send)
+
+    with scheduler._condition:
+        futures = [
+            scheduler.submit("/clip/v2/resource/light/1", first),
+            scheduler.submit("/clip/v2/resource/light/1", second),
+        ]
+    for future in futures:
+        assert future.result(1) == "/clip/v2/resource/light/1"
+    scheduler.stop()
+
+    assert send.sent == [("/clip/v2/resource/light/1", expected)]
+    assert scheduler.stats.commands_merged == 1
+
+
+def test_put_abandons_request_after_timeout():
+    send = RecordingSend(blocked=True)
+    scheduler = HueCommandScheduler(send, result_timeout=0.1)
+
+    # First request holds up the second
+    scheduler.submit("/clip/v2/resource/light/1", {"on": {"on": True}})
+    with pytest.raises(TimeoutError):
+        scheduler.put("/clip/v2/resource/light/2", {"on": {"on": True}})
+    send.release()
+    scheduler.stop()
+
+    assert "/clip/v2/resource/light/2" not in scheduler._queue